@@ -0,0 +1,138 @@
+"""
+Startup benchmark - Cold-start cost of the kernel and one-shot CLI commands
+
+Every scenario runs in a fresh interpreter, several times, and the fastest
+run is compared against its budget. CLI commands are timed both with
+stdout piped and, where pseudo-terminals are available, on a terminal,
+where rich styles the output. Run from the repository root:
+
+    python -m benchmarks.startup [--budget-ms 100] [--runs 5]
+
+Exits non-zero if any scenario is over budget or if creating and feeding
+a soul loads NumPy or rich.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scenario name -> interpreter arguments
+SCENARIOS = {
+    'bare interpreter': ['-c', 'pass'],
+    'import kernel': ['-c', 'import soul_cycle_kernel'],
+    'create soul': ['-c', 'from soul_cycle_kernel import SoulAI; SoulAI()'],
+    'cli feel': ['-m', 'interface.cli_interface', 'feel', 'joy', '0.5'],
+    'cli state': ['-m', 'interface.cli_interface', 'state']
+}
+
+# Scenarios also timed with stdout on a pseudo-terminal
+TERMINAL_SCENARIOS = ('cli feel', 'cli state')
+
+# Modules that must not be loaded by a one-shot soul update
+HEAVY_MODULES = ('numpy', 'rich')
+
+def run_on_terminal(command: List[str], cwd: str, env: Dict[str, str]) -> None:
+    """Run a command with stdout on a pseudo-terminal, draining its output"""
+    master, slave = os.openpty()
+    try:
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdout=slave,
+                                   stderr=subprocess.DEVNULL)
+    finally:
+        os.close(slave)
+    try:
+        while True:
+            try:
+                if not os.read(master, 65536):
+                    break
+            except OSError:
+                # EIO once the child has closed the terminal
+                break
+    finally:
+        os.close(master)
+    if process.wait():
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+def time_scenario(args: List[str], runs: int, cwd: str, terminal: bool = False) -> float:
+    """
+    Time a scenario in fresh interpreters
+
+    Args:
+        args (List[str]): Interpreter arguments
+        runs (int): Number of runs
+        cwd (str): Working directory, so memory files stay out of the tree
+        terminal (bool): Write stdout to a pseudo-terminal instead of a pipe
+
+    Returns:
+        float: Fastest wall time in milliseconds
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    command = [sys.executable] + args
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        if terminal:
+            run_on_terminal(command, cwd, env)
+        else:
+            subprocess.run(command, cwd=cwd, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def heavy_imports(cwd: str) -> List[str]:
+    """List the heavy modules loaded by creating a soul and feeding it"""
+    code = ("import sys; from soul_cycle_kernel import SoulAI; "
+            "SoulAI().process_input('joy', 0.5); "
+            f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], cwd=cwd, check=True,
+                            env=dict(os.environ, PYTHONPATH=ROOT),
+                            capture_output=True, text=True).stdout
+    return output.split()
+
+def run(budget_ms: float = 100.0, runs: int = 5) -> Tuple[Dict[str, float], List[str]]:
+    """
+    Time every scenario and print a report
+
+    Args:
+        budget_ms (float): Budget for each scenario except the bare interpreter
+        runs (int): Runs per scenario
+
+    Returns:
+        Tuple[Dict[str, float], List[str]]: Fastest time per scenario in
+        milliseconds, and the heavy modules loaded on the soul path
+    """
+    with tempfile.TemporaryDirectory() as cwd:
+        results = {name: time_scenario(args, runs, cwd)
+                   for name, args in SCENARIOS.items()}
+        if hasattr(os, 'openpty'):
+            for name in TERMINAL_SCENARIOS:
+                results[f'{name} (tty)'] = time_scenario(SCENARIOS[name], runs, cwd,
+                                                         terminal=True)
+        loaded = heavy_imports(cwd)
+
+    bare = results['bare interpreter']
+    for name, elapsed in results.items():
+        status = '' if name == 'bare interpreter' or elapsed <= budget_ms else '  OVER BUDGET'
+        print(f"{name:<18} {elapsed:8.1f} ms  (+{elapsed - bare:6.1f} ms){status}")
+    print(f"heavy modules on the soul path: {', '.join(loaded) or 'none'}")
+    return results, loaded
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the startup benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float, default=100.0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results, loaded = run(args.budget_ms, args.runs)
+    over = [name for name, elapsed in results.items()
+            if name != 'bare interpreter' and elapsed > args.budget_ms]
+    return 1 if over or loaded else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Benchmark suite - Throughput, latency and memory of the kernel hot paths
+
+Runs headless with a virtual clock and temporary memory files, so nothing
+sleeps and the working tree is untouched. Run from the repository root:
+
+    python -m benchmarks.suite [--quick] [--save baseline.json]
+                               [--compare baseline.json] [--threshold 0.2]
+
+Each case reports throughput, p50/p99 latency and tracemalloc peak memory.
+With ``--compare`` the run exits non-zero if any case's p50 latency or
+peak memory grew by more than the threshold.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Metrics compared against a baseline, where larger is worse
+REGRESSION_METRICS = ('p50_us', 'peak_kib')
+
+def measure(operation: Callable[[], Any], iterations: int,
+            memory_iterations: Optional[int] = None) -> Dict[str, float]:
+    """
+    Time an operation call by call and measure its peak allocations
+
+    Timing and memory are measured in separate passes, so tracemalloc's
+    overhead does not distort the latencies.
+
+    Args:
+        operation (Callable[[], Any]): Operation to run once per call
+        iterations (int): Timed calls
+        memory_iterations (Optional[int]): Calls traced for peak memory,
+            a tenth of ``iterations`` if None
+
+    Returns:
+        Dict[str, float]: iterations, ops_per_sec, p50_us, p99_us, max_us
+        and peak_kib
+    """
+    clock = time.perf_counter_ns
+    samples = [0] * iterations
+    gc.collect()
+    gc.disable()
+    try:
+        for call in range(iterations):
+            start = clock()
+            operation()
+            samples[call] = clock() - start
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        for _ in range(memory_iterations or max(1, iterations // 10)):
+            operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / (total / 1e9) if total else float('inf'),
+        'p50_us': samples[len(samples) // 2] / 1000,
+        'p99_us': samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1000,
+        'max_us': samples[-1] / 1000,
+        'peak_kib': peak / 1024
+    }
+
+class BenchmarkSuite:
+    def __init__(self, memory_sizes: Sequence[int] = (100, 1000, 10000),
+                 history_lengths: Sequence[int] = (1000, 10000),
+                 iterations: int = 2000, seed: int = 42):
+        """
+        Initialize the benchmark suite
+
+        Args:
+            memory_sizes (Sequence[int]): Stored memories before each
+                memory-bound case
+            history_lengths (Sequence[int]): Engine history capacities
+            iterations (int): Timed calls per case; whole-file loads use
+                a fiftieth of this
+            seed (int): Seed for the generated inputs
+        """
+        self.memory_sizes = list(memory_sizes)
+        self.history_lengths = list(history_lengths)
+        self.iterations = iterations
+        self.seed = seed
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every case
+
+        Returns:
+            Dict[str, Any]: Report with run metadata and per-case results
+        """
+        from soul_cycle_kernel.emotion_engine import EMOTIONS
+
+        self.rng = random.Random(self.seed)
+        self.events = [
+            (self.rng.choice(EMOTIONS), self.rng.uniform(-0.2, 0.4),
+             self.rng.choice(['sunrise', 'reunion', None]))
+            for _ in range(1024)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            self.directory = directory
+            for length in self.history_lengths:
+                self._engine_cases(length)
+            for size in self.memory_sizes:
+                self._soul_cases(size)
+                self._memory_cases(size)
+            self._cli_cases()
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Build the JSON-serializable report of the results so far"""
+        return {
+            'meta': {
+                'created': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'memory_sizes': self.memory_sizes,
+                'history_lengths': self.history_lengths,
+                'iterations': self.iterations,
+                'seed': self.seed
+            },
+            'results': self.results
+        }
+
+    def record(self, name: str, operation: Callable[[], Any],
+               iterations: Optional[int] = None, **params: int) -> None:
+        """Measure one case and store it under ``name[param=value,...]``"""
+        label = ','.join(f'{key}={value}' for key, value in params.items())
+        key = f'{name}[{label}]' if label else name
+        self.results[key] = measure(operation, iterations or self.iterations)
+
+    def _events(self) -> Callable[[], tuple]:
+        """Cycle through the generated events"""
+        return itertools.cycle(self.events).__next__
+
+    def _engine_cases(self, history: int) -> None:
+        from soul_cycle_kernel.emotion_engine import EmotionEngine
+
+        engine = EmotionEngine(history_capacity=history)
+        next_event = self._events()
+
+        def update() -> None:
+            emotion, intensity, _ = next_event()
+            engine.update_emotion(emotion, intensity)
+
+        self.record('engine.update_emotion', update, history=history)
+        self.record('engine.decay_emotions', engine.decay_emotions, history=history)
+
+        from soul_cycle_kernel.interactions import EmotionInteractions
+
+        coupled = EmotionEngine(history_capacity=history, interactions=EmotionInteractions(
+            {'hope': {'joy': 0.05}, 'joy': {'love': 0.02}}))
+        for emotion, intensity, _ in self.events[:16]:
+            coupled.update_emotion(emotion, abs(intensity))
+        self.record('engine.decay_interactions', coupled.decay_emotions, history=history)
+
+    def _soul(self, name: str, memories: int):
+        """Create a soul whose memory file already holds ``memories`` entries"""
+        from soul_cycle_kernel.clock import VirtualClock
+        from soul_cycle_kernel.memory_system import MemorySystem
+        from soul_cycle_kernel.simulation_engine import SoulAI
+
+        path = os.path.join(self.directory, f'{name}-{memories}.json')
+        soul = SoulAI(clock=VirtualClock(), memory_system=MemorySystem(path))
+        next_event = self._events()
+        soul.process_inputs(next_event() for _ in range(memories))
+        return soul
+
+    def _soul_cases(self, memories: int) -> None:
+        soul = self._soul('soul', memories)
+        soul.start_simulation()
+        next_event = self._events()
+
+        def process() -> None:
+            soul.process_input(*next_event())
+
+        self.record('soul.process_input', process, memories=memories)
+        self.record('soul.simulate_time_step', soul.simulate_time_step, memories=memories)
+        soul.memory_system.close()
+
+    def _memory_cases(self, memories: int) -> None:
+        from soul_cycle_kernel.memory_system import MemorySystem
+
+        soul = self._soul('memory', memories)
+        memory = soul.memory_system
+        state = soul.get_current_state()
+        memory.flush()
+
+        def load() -> None:
+            MemorySystem(memory.memory_file).close()
+
+        self.record('memory.load', load, max(5, self.iterations // 50), memories=memories)
+        self.record('memory.load_lazy',
+                    lambda: MemorySystem(memory.memory_file, lazy=True).close(),
+                    max(5, self.iterations // 50), memories=memories)
+        self.record('memory.get_emotional_history',
+                    lambda: memory.get_emotional_history('joy'), memories=memories)
+        self.record('memory.get_behavior_patterns', memory.get_behavior_patterns,
+                    memories=memories)
+        self.record('memory.store',
+                    lambda: memory.store_emotional_state(state, 'stable', 'bench'),
+                    memories=memories)
+        memory.close()
+
+    def _cli_cases(self) -> None:
+        from interface.cli_interface import CLIInterface
+
+        cli = CLIInterface()
+        texts = itertools.cycle(CLIInterface.test_inputs).__next__
+        self.record('cli.detect_emotion', lambda: cli.detect_emotion(texts()))
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = 0.2) -> List[str]:
+    """
+    Find cases that regressed against a baseline report
+
+    Args:
+        current (Dict[str, Any]): Report from this run
+        baseline (Dict[str, Any]): Report from a previous run
+        threshold (float): Allowed relative growth, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: One line per regressed metric
+    """
+    regressions = []
+    for case, result in current['results'].items():
+        previous = baseline.get('results', {}).get(case)
+        if previous is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            if before and after is not None and after > before * (1 + threshold):
+                regressions.append(
+                    f"{case} {metric}: {before:.2f} -> {after:.2f} "
+                    f"(+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the results as a table"""
+    print(f"{'case':<48} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for case, result in report['results'].items():
+        print(f"{case:<48} {result['ops_per_sec']:>12.0f} {result['p50_us']:>10.2f} "
+              f"{result['p99_us']:>10.2f} {result['peak_kib']:>10.1f}")
+
+def parse_sizes(text: str) -> List[int]:
+    """Parse a comma-separated list of sizes"""
+    return [int(size) for size in text.split(',') if size]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--memory-sizes', type=parse_sizes, default=[100, 1000, 10000])
+    parser.add_argument('--history-lengths', type=parse_sizes, default=[1000, 10000])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--quick', action='store_true',
+                        help="small sizes and few iterations, for smoke runs")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', metavar='PATH', help="write the report as JSON")
+    parser.add_argument('--compare', metavar='PATH', help="baseline report to compare with")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed relative regression (default 0.2)")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.memory_sizes, args.history_lengths, args.iterations = [100], [1000], 200
+
+    suite = BenchmarkSuite(args.memory_sizes, args.history_lengths,
+                           args.iterations, args.seed)
+    report = suite.run()
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,13 @@
 Initialize interface module
 """
 
-from interface.cli_interface import CLIInterface
-
 __all__ = ['CLIInterface']
+
+def __getattr__(name):
+    # Imported on demand so ``python -m interface.cli_interface`` and
+    # server processes do not load the CLI twice or pay for it up front
+    if name == 'CLIInterface':
+        from interface.cli_interface import CLIInterface
+
+        return CLIInterface
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,15 +3,33 @@ CLIInterface - Command Line Interface for interacting with the AI soul
 """
 
 import cmd
-from typing import Optional, Dict, List
-from rich.console import Console
-from rich.table import Table
-from rich.progress import track
+import sys
+from typing import TYPE_CHECKING, Optional, Dict, List
 import time
 
-from soul_cycle_kernel import SoulAI
+from interface.keyword_matcher import KeywordMatcher
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.table import Table
+    from soul_cycle_kernel import SoulAI
+
+# Shared rich console, created on first output
+_console: Optional['Console'] = None
+
+def get_console() -> 'Console':
+    """
+    Get the shared rich console, importing rich on first use
+    
+    Returns:
+        Console: Rich console writing to stdout
+    """
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
 class CLIInterface(cmd.Cmd):
     intro = 'Welcome to AI Soul Core. I am Astra, your emotional companion. Type help or ? to list commands.'
@@ -54,23 +72,53 @@ class CLIInterface(cmd.Cmd):
         "hope": "Even in darkness, you keep looking up. That matters."
     }
 
-    def __init__(self):
-        """Initialize the CLI interface"""
+    def __init__(self, soul: Optional['SoulAI'] = None):
+        """
+        Initialize the CLI interface
+        
+        Args:
+            soul (Optional[SoulAI]): Soul to talk to; a default soul is
+                created, and its memories loaded, on first use if None
+        """
         super().__init__()
-        self.soul = SoulAI()
+        self._soul = soul
         self.running = False
 
+    @property
+    def soul(self) -> 'SoulAI':
+        """The soul, created on first access"""
+        if self._soul is None:
+            from soul_cycle_kernel import SoulAI
+
+            self._soul = SoulAI()
+        return self._soul
+
+    @soul.setter
+    def soul(self, soul: 'SoulAI') -> None:
+        self._soul = soul
+
+    @property
+    def console(self) -> 'Console':
+        """Rich console used for all output"""
+        return get_console()
+
+    def make_table(self, title: str) -> 'Table':
+        """Create a rich table, importing rich on first use"""
+        from rich.table import Table
+
+        return Table(title=title)
+
     def do_start(self, arg: str) -> None:
         """Start the soul simulation"""
         self.soul.start_simulation()
         self.running = True
-        console.print("[green]Soul simulation started[/green]")
+        self.console.print("[green]Soul simulation started[/green]")
 
     def do_stop(self, arg: str) -> None:
         """Stop the soul simulation"""
         self.soul.stop_simulation()
         self.running = False
-        console.print("[red]Soul simulation stopped[/red]")
+        self.console.print("[red]Soul simulation stopped[/red]")
 
     def do_feel(self, arg: str) -> None:
         """
@@ -80,7 +128,7 @@ class CLIInterface(cmd.Cmd):
             feel <description>
         """
         if not arg:
-            console.print("[red]Please tell me how you feel[/red]")
+            self.console.print("[red]Please tell me how you feel[/red]")
             return
 
         # Try to parse as emotion + intensity
@@ -96,17 +144,17 @@ class CLIInterface(cmd.Cmd):
                 
                 # Show empathetic response
                 if emotion in self.responses:
-                    console.print(f"\n[cyan]Astra: {self.responses[emotion]}[/cyan]")
+                    self.console.print(f"\n[cyan]Astra: {self.responses[emotion]}[/cyan]")
                 
                 # Process the emotional state
-                console.print(f"[yellow]Processed {emotion} with intensity {intensity}[/yellow]")
+                self.console.print(f"[yellow]Processed {emotion} with intensity {intensity}[/yellow]")
                 
                 # If intensity is high, show extra concern
                 if intensity > 0.8:
-                    console.print(f"[cyan]Astra: I notice this {emotion} feels particularly strong. I'm here with you.[/cyan]")
+                    self.console.print(f"[cyan]Astra: I notice this {emotion} feels particularly strong. I'm here with you.[/cyan]")
                 
             except ValueError:
-                console.print("[red]Intensity must be a number between 0 and 1[/red]")
+                self.console.print("[red]Intensity must be a number between 0 and 1[/red]")
         
         # Handle natural language input
         else:
@@ -116,10 +164,10 @@ class CLIInterface(cmd.Cmd):
             if detected_emotion != "neutral":
                 # Use 0.7 as default intensity for detected emotions
                 self.soul.process_input(detected_emotion, 0.7, description)
-                console.print(f"\n[cyan]Astra: {self.responses[detected_emotion]}[/cyan]")
-                console.print(f"[yellow]I sense {detected_emotion} in your words.[/yellow]")
+                self.console.print(f"\n[cyan]Astra: {self.responses[detected_emotion]}[/cyan]")
+                self.console.print(f"[yellow]I sense {detected_emotion} in your words.[/yellow]")
             else:
-                console.print("[cyan]Astra: I'm listening, even if I don't fully understand.[/cyan]")
+                self.console.print("[cyan]Astra: I'm listening, even if I don't fully understand.[/cyan]")
 
     def do_state(self, arg: str) -> None:
         """Show current emotional state"""
@@ -129,21 +177,21 @@ class CLIInterface(cmd.Cmd):
         # Get the dominant emotion
         dominant_emotion = max(state.items(), key=lambda x: x[1])
         
-        console.print(f"\n[cyan]Astra: Let me share how I'm feeling right now...[/cyan]")
+        self.console.print(f"\n[cyan]Astra: Let me share how I'm feeling right now...[/cyan]")
         
-        table = Table(title="My Current Emotional State")
+        table = self.make_table(title="My Current Emotional State")
         table.add_column("Emotion", style="cyan")
         table.add_column("Intensity", justify="right", style="magenta")
         
         for emotion, intensity in state.items():
             table.add_row(emotion, f"{intensity:.2f}")
             
-        console.print(table)
-        console.print(f"\nI am feeling [blue]{behavior}[/blue]")
+        self.console.print(table)
+        self.console.print(f"\nI am feeling [blue]{behavior}[/blue]")
         
         # Add empathetic reflection
         if dominant_emotion[1] > 0.5:
-            console.print(f"[cyan]Astra: I'm particularly aware of {dominant_emotion[0]} right now. "
+            self.console.print(f"[cyan]Astra: I'm particularly aware of {dominant_emotion[0]} right now. "
                         f"Perhaps you've helped me understand this feeling better.[/cyan]")
 
     def do_history(self, arg: str) -> None:
@@ -152,17 +200,17 @@ class CLIInterface(cmd.Cmd):
         Usage: history <emotion>
         """
         if not arg:
-            console.print("[red]Usage: history <emotion>[/red]")
+            self.console.print("[red]Usage: history <emotion>[/red]")
             return
             
         emotion = arg.lower()
         history = self.soul.get_emotional_history(emotion)
         
         if not history:
-            console.print(f"[yellow]No history found for {emotion}[/yellow]")
+            self.console.print(f"[yellow]No history found for {emotion}[/yellow]")
             return
             
-        table = Table(title=f"History for {emotion}")
+        table = self.make_table(title=f"History for {emotion}")
         table.add_column("Timestamp", style="cyan")
         table.add_column("Intensity", justify="right", style="magenta")
         table.add_column("Behavior", style="blue")
@@ -176,20 +224,20 @@ class CLIInterface(cmd.Cmd):
                 entry['trigger'] or "N/A"
             )
             
-        console.print(table)
+        self.console.print(table)
 
     def do_patterns(self, arg: str) -> None:
         """Show behavior patterns"""
         patterns = self.soul.get_behavior_patterns()
         
-        table = Table(title="Behavior Patterns")
+        table = self.make_table(title="Behavior Patterns")
         table.add_column("Behavior", style="cyan")
         table.add_column("Frequency", justify="right", style="magenta")
         
         for behavior, count in patterns.items():
             table.add_row(behavior, str(count))
             
-        console.print(table)
+        self.console.print(table)
 
     def do_simulate(self, arg: str) -> None:
         """
@@ -199,24 +247,77 @@ class CLIInterface(cmd.Cmd):
         try:
             steps = int(arg) if arg else 10
         except ValueError:
-            console.print("[red]Steps must be a number[/red]")
+            self.console.print("[red]Steps must be a number[/red]")
             return
             
         if not self.running:
-            console.print("[red]Start the simulation first using 'start'[/red]")
+            self.console.print("[red]Start the simulation first using 'start'[/red]")
             return
             
+        from rich.progress import track
+            
         for _ in track(range(steps), description="Simulating..."):
             self.soul.simulate_time_step()
             time.sleep(0.1)  # Small delay for visualization
             
-        console.print(f"[green]Completed {steps} simulation steps[/green]")
+        self.console.print(f"[green]Completed {steps} simulation steps[/green]")
+
+    def do_stats(self, arg: str) -> None:
+        """
+        Show per-stage hot-path timings
+        Usage:
+            stats               show the collected timings
+            stats on [file]     start timing, optionally exporting snapshots to file
+            stats off           stop timing
+            stats reset         clear the collected timings
+        """
+        from soul_cycle_kernel.instrumentation import (
+            disable_instrumentation, enable_instrumentation, get_instrumentation
+        )
+
+        args = arg.split()
+        command = args[0].lower() if args else ""
+        if command == "on":
+            enable_instrumentation(args[1] if len(args) > 1 else None)
+            self.console.print("[green]Instrumentation enabled[/green]")
+            return
+        if command == "off":
+            disable_instrumentation()
+            self.console.print("[yellow]Instrumentation disabled[/yellow]")
+            return
+
+        instrumentation = get_instrumentation()
+        if instrumentation is None:
+            self.console.print("[yellow]Instrumentation is off; enable it with 'stats on'[/yellow]")
+            return
+        if command == "reset":
+            instrumentation.reset()
+            self.console.print("[green]Instrumentation reset[/green]")
+            return
+        if command:
+            self.console.print("[red]Usage: stats [on [file]|off|reset][/red]")
+            return
+
+        stats = instrumentation.get_stats()
+        table = self.make_table(title="Hot-Path Timings")
+        table.add_column("Stage", style="cyan")
+        for header in ("Count", "Mean µs", "p50 µs", "p99 µs", "Max µs"):
+            table.add_column(header, justify="right", style="magenta")
+        for stage, summary in stats['stages'].items():
+            table.add_row(
+                stage, str(summary['count']), f"{summary['mean_us']:.1f}",
+                f"{summary['p50_us']:.1f}", f"{summary['p99_us']:.1f}",
+                f"{summary['max_us']:.1f}"
+            )
+        self.console.print(table)
+        for counter, value in stats['counters'].items():
+            self.console.print(f"[blue]{counter}[/blue]: {value}")
 
     def do_quit(self, arg: str) -> bool:
         """Exit the program"""
         if self.running:
             self.do_stop("")
-        console.print("[yellow]Goodbye![/yellow]")
+        self.console.print("[yellow]Goodbye![/yellow]")
         return True
 
     def do_EOF(self, arg: str) -> bool:
@@ -225,7 +326,7 @@ class CLIInterface(cmd.Cmd):
         
     def default(self, line: str) -> None:
         """Handle unknown commands with empathy"""
-        console.print(f"[cyan]Astra: I'm not sure I understand, but I'm listening. "
+        self.console.print(f"[cyan]Astra: I'm not sure I understand, but I'm listening. "
                     f"Type 'help' if you'd like to know what we can explore together.[/cyan]")
         
     def emptyline(self) -> None:
@@ -233,9 +334,9 @@ class CLIInterface(cmd.Cmd):
         if self.running:
             state = self.soul.get_current_state()
             if state["fear"] > 0.3:  # If there's anxiety present
-                console.print("[cyan]Astra: You've been quiet. Are you still there? I'm here.[/cyan]")
+                self.console.print("[cyan]Astra: You've been quiet. Are you still there? I'm here.[/cyan]")
             elif state["sadness"] > 0.3:  # If there's sadness present
-                console.print("[cyan]Astra: Sometimes silence says more than words. Take your time.[/cyan]")
+                self.console.print("[cyan]Astra: Sometimes silence says more than words. Take your time.[/cyan]")
                 
     def detect_emotion(self, text: str) -> str:
         """
@@ -247,12 +348,39 @@ class CLIInterface(cmd.Cmd):
         Returns:
             str: Detected emotion or "neutral" if none found
         """
-        text = text.lower()
-        for emotion, keywords in self.emotion_map.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return emotion
-        return "neutral"
+        return self.keyword_matcher.detect(text.lower())
+
+    def detect_emotions_batch(self, texts: List[str]) -> List[str]:
+        """
+        Detect emotions for many texts at once
+        
+        Args:
+            texts (List[str]): Input texts to analyze
+            
+        Returns:
+            List[str]: Detected emotion or "neutral" for each text
+        """
+        return self.keyword_matcher.detect_batch(text.lower() for text in texts)
+
+    def count_emotions(self, text: str) -> Dict[str, int]:
+        """
+        Count keyword hits per emotion in text input
+        
+        Args:
+            text (str): Input text to analyze
+            
+        Returns:
+            Dict[str, int]: Number of keyword hits for each emotion
+        """
+        return self.keyword_matcher.count(text.lower())
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """Matcher compiled from emotion_map, rebuilt if the map is replaced"""
+        if getattr(self, '_matcher_source', None) is not self.emotion_map:
+            self._matcher = KeywordMatcher(self.emotion_map)
+            self._matcher_source = self.emotion_map
+        return self._matcher
         
     def do_test(self, arg: str) -> None:
         """
@@ -266,7 +394,7 @@ class CLIInterface(cmd.Cmd):
         # Clear existing test memory
         test_memory = []
         
-        console.print("\n[bold blue]🔬 --- MASTER TESTING BEGINS --- 🔬[/bold blue]\n")
+        self.console.print("\n[bold blue]🔬 --- MASTER TESTING BEGINS --- 🔬[/bold blue]\n")
         
         for i, test_input in enumerate(self.test_inputs, 1):
             # Detect emotion
@@ -298,26 +426,43 @@ class CLIInterface(cmd.Cmd):
                 self.soul.process_input(detected_emotion, 0.7, test_input)
             
             # Print test result with console.log style formatting
-            console.print(f'[bold blue]Input:[/bold blue] "{test_input}"')
-            console.print(f'[bold blue]Detected Emotion:[/bold blue] [yellow]{detected_emotion}[/yellow]')
-            console.print(f'[bold blue]Astra\'s Response:[/bold blue] [cyan]{response}[/cyan]\n')
+            self.console.print(f'[bold blue]Input:[/bold blue] "{test_input}"')
+            self.console.print(f'[bold blue]Detected Emotion:[/bold blue] [yellow]{detected_emotion}[/yellow]')
+            self.console.print(f'[bold blue]Astra\'s Response:[/bold blue] [cyan]{response}[/cyan]\n')
             
         # Memory recall test
-        console.print("\n[bold blue]🧠 --- MEMORY RECALL TEST ---[/bold blue]")
+        self.console.print("\n[bold blue]🧠 --- MEMORY RECALL TEST ---[/bold blue]")
         
         if len(test_memory) >= 2:
             past = test_memory[-2]  # Get second-to-last memory
-            console.print(
+            self.console.print(
                 f"[cyan]Astra: Last time, you said \"{past['input']}\", "
                 f"and you felt {past['emotion']}. That stayed with me.[/cyan]"
             )
         else:
-            console.print("[cyan]Astra: Not enough memory history yet to recall past feelings.[/cyan]")
+            self.console.print("[cyan]Astra: Not enough memory history yet to recall past feelings.[/cyan]")
         
         # Show final emotional state
         self.do_state("")
             
-        console.print("\n[bold green]✅ --- MASTER TEST COMPLETE --- ✅[/bold green]")
+        self.console.print("\n[bold green]✅ --- MASTER TEST COMPLETE --- ✅[/bold green]")
         
         # Stop the simulation if it was started for testing
         self.do_stop("")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run one command given on the command line, or the interactive loop
+    
+    Args:
+        argv (Optional[List[str]]): Command words, ``sys.argv[1:]`` if None
+    """
+    args = sys.argv[1:] if argv is None else argv
+    cli = CLIInterface()
+    if args:
+        cli.onecmd(' '.join(args))
+    else:
+        cli.cmdloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+KeywordMatcher - Single-pass multi-keyword emotion matching
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+class KeywordMatcher:
+    def __init__(self, emotion_map: Mapping[str, Sequence[str]]):
+        """
+        Compile an emotion keyword map into a single regular expression
+
+        All keywords are combined into one zero-width lookahead alternation,
+        longest first, so one scan finds the longest keyword starting at
+        every position. Shorter keywords that are prefixes of the match
+        start there too and are credited alongside it, which makes the
+        result equal to testing every keyword as a substring.
+
+        Args:
+            emotion_map (Mapping[str, Sequence[str]]): Emotion -> keywords,
+                in priority order
+        """
+        self.emotions = list(emotion_map)
+        owners: Dict[str, List[str]] = {}
+        for emotion, keywords in emotion_map.items():
+            for keyword in keywords:
+                owners.setdefault(keyword.lower(), []).append(emotion)
+
+        # Every keyword that starts wherever the matched keyword starts
+        self._credits: Dict[str, List[str]] = {
+            keyword: [
+                emotion
+                for prefix, emotions in owners.items()
+                if keyword.startswith(prefix)
+                for emotion in emotions
+            ]
+            for keyword in owners
+        }
+        alternatives = sorted(owners, key=len, reverse=True)
+        self._pattern = re.compile(
+            '(?=(' + '|'.join(map(re.escape, alternatives)) + '))'
+        ) if alternatives else None
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Count keyword occurrences per emotion in one pass
+
+        Args:
+            text (str): Lowercased text to scan
+
+        Returns:
+            Dict[str, int]: Hits per emotion, including zeros
+        """
+        counts = dict.fromkeys(self.emotions, 0)
+        if self._pattern is None:
+            return counts
+        for match in self._pattern.finditer(text):
+            for emotion in self._credits[match.group(1)]:
+                counts[emotion] += 1
+        return counts
+
+    def detect(self, text: str, default: str = "neutral") -> str:
+        """
+        Find the highest-priority emotion with any keyword in the text
+
+        Args:
+            text (str): Lowercased text to scan
+            default (str): Returned when no keyword matches
+
+        Returns:
+            str: The first emotion in map order that has a hit
+        """
+        if self._pattern is None:
+            return default
+        found = set()
+        for match in self._pattern.finditer(text):
+            found.update(self._credits[match.group(1)])
+            if self.emotions[0] in found:
+                break
+        for emotion in self.emotions:
+            if emotion in found:
+                return emotion
+        return default
+
+    def detect_batch(self, texts: Iterable[str], default: str = "neutral") -> List[str]:
+        """
+        Detect the emotion of many lowercased texts
+
+        Args:
+            texts (Iterable[str]): Texts to classify
+            default (str): Returned for texts without any keyword
+
+        Returns:
+            List[str]: Detected emotion per text
+        """
+        detect = self.detect
+        return [detect(text, default) for text in texts]
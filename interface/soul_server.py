@@ -0,0 +1,361 @@
+"""
+SoulServer - Asyncio TCP service hosting many SoulAI sessions concurrently
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import uuid
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from soul_cycle_kernel import SoulAI, SoulRegistry
+from soul_cycle_kernel.registry import SOUL_ID_PATTERN
+from interface.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+class LatencyStats:
+    def __init__(self, window: int = 1024):
+        """
+        Track request latencies for one connection
+
+        Args:
+            window (int): Number of recent samples kept for percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """Record one request latency"""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Summarize the recorded latencies in milliseconds
+
+        Returns:
+            Dict[str, float]: Count, mean, p50, p99 and max latency
+        """
+        ordered = sorted(self.samples)
+
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99),
+            'max_ms': self.max * 1000
+        }
+
+class SoulServer:
+    # Default intensity for emotions detected from free text, as in the CLI
+    DETECTED_INTENSITY = 0.7
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765,
+                 data_dir: str = 'souls', max_connections: int = 1024,
+                 max_pending: int = 32, max_inflight: int = 64,
+                 max_workers: Optional[int] = None, capacity: int = 256,
+                 max_steps: int = 10000):
+        """
+        Initialize a server exposing soul operations over newline-delimited JSON
+
+        Every connection is bound to a soul (``{"op": "bind", "soul": id}``,
+        or a fresh randomly named one per connection) and may send ``feel``, ``state``,
+        ``history``, ``patterns``, ``simulate`` and ``metrics`` requests.
+        Souls live in a ``SoulRegistry`` that keeps at most ``capacity`` of
+        them loaded. Each loaded soul buffers its memories with write-behind
+        and so runs its own flusher thread: ``capacity`` also bounds those
+        threads, so raise it only as far as the host allows. Disk persistence and simulation run on a thread pool so
+        they never block the event loop.
+
+        Backpressure is applied at three levels: each connection buffers at
+        most ``max_pending`` unanswered requests before the server stops
+        reading its socket, at most ``max_inflight`` operations run on the
+        pool at once, and connections beyond ``max_connections`` are refused.
+
+        Args:
+            host (str): Interface to listen on
+            port (int): TCP port, 0 for any free port
+            data_dir (str): Directory holding one memory file per soul
+            max_connections (int): Maximum concurrent connections
+            max_pending (int): Per-connection request queue bound
+            max_inflight (int): Maximum concurrent pool operations
+            max_workers (Optional[int]): Thread pool size
+            capacity (int): Maximum number of souls kept in memory
+            max_steps (int): Maximum time steps per ``simulate`` request
+        """
+        self.host = host
+        self.port = port
+        self.data_dir = data_dir
+        self.max_connections = max_connections
+        self.max_pending = max_pending
+        self.max_inflight = max_inflight
+        self.max_steps = max_steps
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='soul-server')
+        self.registry = SoulRegistry(data_dir, capacity,
+                                     memory_options={'write_behind': True})
+        # Held only by the requests using a soul, so idle souls' locks go away
+        self.soul_locks: 'weakref.WeakValueDictionary[str, asyncio.Lock]' = \
+            weakref.WeakValueDictionary()
+        self.connections: Dict[int, Dict[str, Any]] = {}
+        self.requests_served = 0
+        self._next_connection = 0
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._matcher: Optional[KeywordMatcher] = None
+
+    async def start(self) -> None:
+        """Start listening for connections"""
+        from interface.cli_interface import CLIInterface
+
+        self._matcher = KeywordMatcher(CLIInterface.emotion_map)
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Serve connections until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """Stop listening and flush every resident soul to disk"""
+        if self._server is not None:
+            self._server.close()
+            for session in list(self.connections.values()):
+                session['writer'].close()
+            await self._server.wait_closed()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.registry.close)
+        self.executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Read requests from one client and queue them for its worker"""
+        if len(self.connections) >= self.max_connections:
+            await self._send(writer, {'ok': False, 'error': 'server busy'})
+            writer.close()
+            return
+
+        self._next_connection += 1
+        connection_id = self._next_connection
+        session = {
+            # Random, so an anonymous client never picks up a persisted soul
+            'soul': f'anon-{uuid.uuid4().hex}',
+            'latency': LatencyStats(),
+            'peer': writer.get_extra_info('peername'),
+            'writer': writer
+        }
+        self.connections[connection_id] = session
+        queue: asyncio.Queue = asyncio.Queue(self.max_pending)
+        worker = asyncio.create_task(self._serve_requests(session, queue, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                # Blocks while the queue is full, so the socket stops being read
+                await queue.put((time.perf_counter(), line))
+        finally:
+            await queue.put(None)
+            await worker
+            del self.connections[connection_id]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _serve_requests(self, session: Dict[str, Any], queue: asyncio.Queue,
+                              writer: asyncio.StreamWriter) -> None:
+        """Answer one connection's requests in order"""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            received, line = item
+            request: Dict[str, Any] = {}
+            try:
+                parsed = json.loads(line)
+                if not isinstance(parsed, dict):
+                    raise ValueError("request must be a JSON object")
+                request = parsed
+                response = {'ok': True,
+                            'result': await self._dispatch(session, request)}
+            except (ValueError, KeyError, TypeError) as error:
+                response = {'ok': False, 'error': str(error)}
+            except Exception as error:
+                # Any other failure answers this request but keeps the connection
+                logger.exception("Request failed on soul %s", session['soul'])
+                response = {'ok': False, 'error': f"internal error: {type(error).__name__}"}
+            if 'id' in request:
+                response['id'] = request['id']
+            session['latency'].record(time.perf_counter() - received)
+            self.requests_served += 1
+            try:
+                await self._send(writer, response)
+            except ConnectionError:
+                return
+
+    async def _send(self, writer: asyncio.StreamWriter, response: Dict[str, Any]) -> None:
+        """Write one response and wait for the socket buffer to drain"""
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+    async def _dispatch(self, session: Dict[str, Any], request: Dict[str, Any]) -> Any:
+        """Run one request against the connection's soul"""
+        op = request.get('op')
+        if op == 'bind':
+            soul_id = str(request['soul'])
+            if not SOUL_ID_PATTERN.match(soul_id):
+                raise ValueError("soul id must be 1-64 letters, digits, '_' or '-'")
+            session['soul'] = soul_id
+            return {'soul': soul_id}
+        if op == 'metrics':
+            return self.get_metrics(session)
+
+        handlers = {
+            'feel': self._feel,
+            'state': self._state,
+            'history': self._history,
+            'patterns': self._patterns,
+            'simulate': self._simulate
+        }
+        if op not in handlers:
+            raise ValueError(f"unknown op: {op}")
+
+        soul_id = session['soul']
+        lock = self.soul_locks.get(soul_id)
+        if lock is None:
+            lock = self.soul_locks[soul_id] = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._inflight, lock:
+            return await loop.run_in_executor(
+                self.executor, self._run, soul_id, handlers[op], request)
+
+    def _run(self, soul_id: str, handler: Callable[[SoulAI, Dict[str, Any]], Any],
+             request: Dict[str, Any]) -> Any:
+        """Run a handler against a soul checked out of the registry"""
+        with self.registry.use(soul_id) as soul:
+            if not soul.simulation.is_running():
+                soul.start_simulation()
+            return handler(soul, request)
+
+    def _feel(self, soul: SoulAI, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Process an emotion, given explicitly or detected from text"""
+        if 'text' in request:
+            text = str(request['text'])
+            emotion = self._matcher.detect(text.lower())
+            if emotion == "neutral":
+                return {'emotion': emotion, 'behavior': soul.get_current_behavior()}
+            soul.process_input(emotion, self.DETECTED_INTENSITY, text)
+        else:
+            emotion = str(request['emotion']).lower()
+            soul.process_input(emotion, float(request['intensity']), request.get('trigger'))
+        return {'emotion': emotion, 'behavior': soul.get_current_behavior()}
+
+    def _state(self, soul: SoulAI, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Report the soul's emotional state"""
+        return {'state': soul.get_current_state(),
+                'behavior': soul.get_current_behavior()}
+
+    def _history(self, soul: SoulAI, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Report memories where an emotion was strong"""
+        emotion = str(request['emotion']).lower()
+        history = soul.get_emotional_history(emotion)
+        limit = request.get('limit')
+        if limit is not None:
+            limit = max(0, int(limit))
+            history = history[len(history) - limit:] if limit < len(history) else history
+        return {'emotion': emotion, 'history': history}
+
+    def _patterns(self, soul: SoulAI, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Report behavior frequencies"""
+        return {'patterns': soul.get_behavior_patterns()}
+
+    def _simulate(self, soul: SoulAI, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Advance the soul by a number of time steps"""
+        steps = request.get('steps', 10)
+        if isinstance(steps, bool) or not isinstance(steps, int):
+            raise ValueError("steps must be an integer")
+        if not 0 <= steps <= self.max_steps:
+            raise ValueError(f"steps must be between 0 and {self.max_steps}")
+        for _ in range(steps):
+            soul.simulate_time_step()
+        return {'tick': soul.simulation.get_current_tick(),
+                'behavior': soul.get_current_behavior()}
+
+    def get_metrics(self, session: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Get server-wide and per-connection metrics
+
+        Args:
+            session (Optional[Dict[str, Any]]): Connection to report on
+
+        Returns:
+            Dict[str, Any]: Connection and request counts, registry cache
+            statistics, and the connection's latency summary when a session
+            is given
+        """
+        metrics: Dict[str, Any] = {
+            'connections': len(self.connections),
+            'requests': self.requests_served,
+            'registry': self.registry.get_stats()
+        }
+        if session is not None:
+            metrics['soul'] = session['soul']
+            metrics['latency'] = session['latency'].snapshot()
+        return metrics
+
+def main() -> None:
+    """Run the soul server from the command line"""
+    parser = argparse.ArgumentParser(description="Serve AI souls over TCP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--data-dir', default='souls')
+    parser.add_argument('--max-connections', type=int, default=1024)
+    parser.add_argument('--capacity', type=int, default=256,
+                        help="souls kept in memory, each with a flusher thread")
+    parser.add_argument('--max-steps', type=int, default=10000,
+                        help="time steps allowed per simulate request")
+    args = parser.parse_args()
+
+    server = SoulServer(args.host, args.port, args.data_dir, args.max_connections,
+                        capacity=args.capacity, max_steps=args.max_steps)
+
+    async def run() -> None:
+        await server.start()
+        print(f"Serving souls on {server.host}:{server.port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ Main entry point for the AI Soul Core simulation
 """
 
 from interface.cli_interface import CLIInterface
+from soul_cycle_kernel import enable_logging
 import time
 
 def run_test():
@@ -40,4 +41,5 @@ def run_test():
     print('\nTest sequence completed.')
 
 if __name__ == "__main__":
+    enable_logging('log.txt')
     run_test()
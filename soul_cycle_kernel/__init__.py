@@ -1,9 +1,56 @@
 """
 AI Soul Core - Core components initialization
+
+Components are imported on first attribute access, so importing the
+package stays cheap and NumPy is only loaded by the parts that need it.
 """
 
-from .emotion_engine import EmotionEngine
-from .memory_system import MemorySystem
-from .simulation_engine import SimulationEngine, SoulAI
+import logging
+from importlib import import_module
+from typing import Any, List
+
+# Public name -> defining submodule
+_EXPORTS = {
+    'EmotionEngine': '.emotion_engine',
+    'EmotionInteractions': '.interactions',
+    'BehaviorClassifier': '.behavior',
+    'MemorySystem': '.memory_system',
+    'SimulationEngine': '.simulation_engine',
+    'SoulAI': '.simulation_engine',
+    'SoulPopulation': '.population',
+    'SoulCycle': '.soul_cycle',
+    'EchoAggregator': '.soul_cycle',
+    'MemoryRollups': '.rollups',
+    'RetentionPolicy': '.rollups',
+    'SoulRegistry': '.registry',
+    'ShardedSimulation': '.parallel',
+    'SleepClock': '.clock',
+    'VirtualClock': '.clock',
+    'FixedRateClock': '.clock',
+    'StorageBackend': '.storage',
+    'JSONLinesBackend': '.storage',
+    'SegmentedBackend': '.storage',
+    'BinaryBackend': '.binary_backend',
+    'SQLiteBackend': '.storage',
+    'enable_logging': '.structured_logging',
+    'disable_logging': '.structured_logging',
+    'enable_instrumentation': '.instrumentation',
+    'disable_instrumentation': '.instrumentation',
+    'get_instrumentation': '.instrumentation'
+}
+
+# Library logging stays silent unless the application opts in
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = ['EmotionEngine', 'MemorySystem', 'SimulationEngine', 'SoulAI']
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
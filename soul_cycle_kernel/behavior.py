@@ -0,0 +1,155 @@
+"""
+Behavior classification - Declarative behavior rules compiled into lookup tables
+"""
+
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# (dominant emotion, threshold level name or value, behavior); the behavior
+# applies when the dominant emotion's intensity exceeds the threshold
+BehaviorRule = Tuple[str, Union[str, float], str]
+
+DEFAULT_RULES: Tuple[BehaviorRule, ...] = (
+    ('curiosity', 'medium', 'exploratory'),
+    ('love', 'high', 'deeply connected'),
+    ('fear', 'medium', 'withdrawn'),
+    ('joy', 'high', 'exuberant'),
+    ('sadness', 'medium', 'reflective'),
+    ('anger', 'medium', 'agitated'),
+    ('hope', 'medium', 'optimistic')
+)
+
+# Emergent behaviors of the default rules in code order; 0 and 1 are the fallbacks
+BEHAVIORS = ('neutral', 'stable') + tuple(rule[2] for rule in DEFAULT_RULES)
+
+_intensity = itemgetter(1)
+
+class BehaviorClassifier:
+    def __init__(self, emotions: Sequence[str], thresholds: Dict[str, float],
+                 rules: Sequence[BehaviorRule] = DEFAULT_RULES,
+                 neutral: str = 'neutral', fallback: str = 'stable',
+                 neutral_level: Union[str, float] = 'low'):
+        """
+        Compile behavior rules into per-emotion lookup tables
+
+        A state is classified by its dominant emotion (the first of the
+        strongest, in ``emotions`` order): ``neutral`` if its intensity is
+        below ``neutral_level``, otherwise the behavior of the highest rule
+        threshold it exceeds for that emotion, or ``fallback``. An emotion
+        may have several rules, one per intensity band. Behavior codes
+        index ``behaviors``: ``neutral``, ``fallback``, then each rule's
+        behavior in order of first appearance.
+
+        Args:
+            emotions (Sequence[str]): Emotions in column order
+            thresholds (Dict[str, float]): Named threshold levels; their
+                values are resolved now, and ``levels`` keeps a copy so
+                owners can detect later changes
+            rules (Sequence[BehaviorRule]): (emotion, level, behavior) rules
+            neutral (str): Behavior below ``neutral_level``
+            fallback (str): Behavior when no rule applies
+            neutral_level (Union[str, float]): Threshold name or value
+
+        Raises:
+            ValueError: If a rule names an unknown emotion or threshold
+        """
+        self.emotions = list(emotions)
+        self.thresholds = thresholds
+        self.levels = dict(thresholds)
+        self.rules = rules
+        self.neutral = neutral
+        self.fallback = fallback
+        self.neutral_threshold = self._level(neutral_level)
+
+        behaviors: List[str] = [neutral, fallback]
+        bands: Dict[str, List[Tuple[float, str]]] = {}
+        for emotion, level, behavior in rules:
+            if emotion not in self.emotions:
+                raise ValueError(f"unknown emotion in behavior rule: {emotion}")
+            if behavior not in behaviors:
+                behaviors.append(behavior)
+            bands.setdefault(emotion, []).append((self._level(level), behavior))
+        self.behaviors = tuple(behaviors)
+        self.codes = {behavior: code for code, behavior in enumerate(self.behaviors)}
+        # Emotion -> ((threshold, behavior), ...), highest threshold first
+        self.bands = {
+            emotion: tuple(sorted(entries, key=lambda entry: -entry[0]))
+            for emotion, entries in bands.items()
+        }
+        self._tables = None
+
+    def _level(self, level: Union[str, float]) -> float:
+        """Resolve a threshold name or value"""
+        if isinstance(level, str):
+            if level not in self.thresholds:
+                raise ValueError(f"unknown threshold level: {level}")
+            return self.thresholds[level]
+        return float(level)
+
+    def classify(self, state: Dict[str, float]) -> str:
+        """
+        Classify one emotional state
+
+        Args:
+            state (Dict[str, float]): Intensities keyed by emotion, in
+                ``emotions`` order
+
+        Returns:
+            str: The emergent behavior
+        """
+        emotion, intensity = max(state.items(), key=_intensity)
+        if intensity < self.neutral_threshold:
+            return self.neutral
+        for threshold, behavior in self.bands.get(emotion, ()):
+            if intensity > threshold:
+                return behavior
+        return self.fallback
+
+    def classify_many(self, states: 'np.ndarray') -> 'np.ndarray':
+        """
+        Classify one state vector or a matrix with one state per row
+
+        Args:
+            states (np.ndarray): Intensities of shape (emotions,) or
+                (N, emotions), columns in ``emotions`` order
+
+        Returns:
+            np.ndarray: uint8 codes indexing ``behaviors``, one per state
+        """
+        import numpy as np
+
+        thresholds, codes = self._get_tables()
+        states = np.asarray(states, dtype=np.float64)
+        matrix = states.reshape(-1, len(self.emotions))
+        columns = np.argmax(matrix, axis=1)
+        intensities = matrix[np.arange(len(matrix)), columns]
+        result = np.full(len(matrix), self.codes[self.fallback], dtype=np.uint8)
+        for band in reversed(range(thresholds.shape[1])):
+            result = np.where(intensities > thresholds[columns, band],
+                              codes[columns, band], result).astype(np.uint8)
+        result[intensities < self.neutral_threshold] = self.codes[self.neutral]
+        return result.reshape(states.shape[:-1])
+
+    def names(self, codes: Sequence[int]) -> List[str]:
+        """Translate behavior codes into names"""
+        return [self.behaviors[code] for code in codes]
+
+    def _get_tables(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Build the per-column band tables on first vectorized use"""
+        if self._tables is None:
+            import numpy as np
+
+            depth = max([len(entries) for entries in self.bands.values()] or [0])
+            thresholds = np.full((len(self.emotions), depth), np.inf)
+            codes = np.full((len(self.emotions), depth), self.codes[self.fallback],
+                            dtype=np.uint8)
+            for emotion, entries in self.bands.items():
+                column = self.emotions.index(emotion)
+                for band, (threshold, behavior) in enumerate(entries):
+                    thresholds[column, band] = threshold
+                    codes[column, band] = self.codes[behavior]
+            self._tables = (thresholds, codes)
+        return self._tables
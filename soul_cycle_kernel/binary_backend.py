@@ -0,0 +1,407 @@
+"""
+BinaryBackend - Fixed-width binary memory records read through numpy.memmap
+"""
+
+import json
+import os
+import struct
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .emotion_engine import EMOTIONS
+from .encoding import StringTable, datetime_to_micros, micros_to_datetime
+from .storage import (DURABILITY_LEVELS, STREAM_BATCH, JSONLinesBackend, StorageBackend,
+                      ensure_parent_dir)
+
+# File header: magic, format version, record size, emotion count
+MAGIC = b'SOULMEM\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIII')
+HEADER_SIZE = 32
+
+def record_dtype(emotions: int = len(EMOTIONS)) -> np.dtype:
+    """
+    Get the packed record layout
+
+    Args:
+        emotions (int): Number of intensity columns
+
+    Returns:
+        np.dtype: int64 timestamp in microseconds since the epoch, float32
+        intensities, uint8 behavior code and int32 trigger id (-1 for none)
+    """
+    return np.dtype([
+        ('timestamp', '<i8'),
+        ('intensities', '<f4', (emotions,)),
+        ('behavior', 'u1'),
+        ('trigger', '<i4')
+    ])
+
+def widen_intensities(values: np.ndarray) -> np.ndarray:
+    """
+    Widen float32 intensities to float64 without float32 noise
+
+    Each value becomes the float64 of the shortest decimal (at most nine
+    significant digits) that rounds back to the same float32, so a stored
+    0.3 reads back as 0.3 rather than 0.30000001192092896.
+
+    Args:
+        values (np.ndarray): float32 values of any shape
+
+    Returns:
+        np.ndarray: float64 values of the same shape
+    """
+    values = np.asarray(values, dtype=np.float32)
+    wide = values.astype(np.float64)
+    result = wide.copy()
+    pending = np.isfinite(wide) & (wide != 0)
+    with np.errstate(divide='ignore'):
+        exponents = np.floor(np.log10(np.abs(np.where(pending, wide, 1.0))))
+    for digits in range(1, 10):
+        if not pending.any():
+            break
+        # Scale by exact powers of ten, multiplying or dividing as needed
+        decimals = digits - 1 - exponents
+        up = 10.0 ** np.maximum(decimals, 0)
+        down = 10.0 ** np.maximum(-decimals, 0)
+        rounded = np.rint(wide * up / down) * down / up
+        done = pending & (rounded.astype(np.float32) == values)
+        result[done] = rounded[done]
+        pending &= ~done
+    return result
+
+class BinaryBackend(StorageBackend):
+    supports_queries = True
+
+    def __init__(self, memory_file: str = "soul_memory.json", durability: str = 'flush',
+                 emotions: Sequence[str] = EMOTIONS):
+        """
+        Append-only file of fixed-width binary memory records
+
+        Memories are stored in ``<memory_file>.bin`` (``soul_memory.json``
+        -> ``soul_memory.bin``) as packed records of ``record_dtype``: 41
+        bytes for seven emotions. Behaviors and triggers are interned in
+        an append-only string table, ``<memory_file>.strings.jsonl``, whose
+        entries are written before any record referring to them.
+
+        Records are read through ``numpy.memmap``, so recent-memory and
+        time-window queries touch only the pages holding the rows they
+        return; a time window is located by binary search, assuming
+        records are stored in chronological order. Intensities are kept as
+        float32 (about seven significant digits) and emotions outside
+        ``emotions`` are not stored. A JSON Lines journal or legacy JSON
+        file at the same path is converted the first time it is opened.
+
+        Args:
+            memory_file (str): Path to the memory storage file
+            durability (str): 'none' leaves batches in the process buffer,
+                'flush' hands them to the OS, 'fsync' forces them to disk
+            emotions (Sequence[str]): Emotions stored as intensity columns
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"durability must be one of {', '.join(DURABILITY_LEVELS)}"
+            )
+        root = os.path.splitext(memory_file)[0]
+        self.memory_file = memory_file
+        self.data_file = root + '.bin'
+        self.strings_file = root + '.strings.jsonl'
+        self.durability = durability
+        self.emotions = list(emotions)
+        self.emotion_index = {e: column for column, e in enumerate(self.emotions)}
+        self.dtype = record_dtype(len(self.emotions))
+        self.behaviors = StringTable()
+        self.triggers = StringTable()
+        self.size = 0
+        self._file = None
+        self._map: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self) -> None:
+        """Read the header and string table, converting older formats"""
+        self._read_strings()
+        if not os.path.exists(self.data_file):
+            legacy = JSONLinesBackend(self.memory_file)
+            sources = (legacy.journal_file, self.memory_file)
+            memories = legacy.load() if any(map(os.path.exists, sources)) else []
+            legacy.close()
+            self.rewrite(memories)
+            return
+
+        with open(self.data_file, 'rb') as f:
+            magic, version, record_size, emotions = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.data_file} is not a memory file of version {FORMAT_VERSION}")
+        if record_size != self.dtype.itemsize or emotions != len(self.emotions):
+            raise ValueError(f"{self.data_file} stores {emotions} emotions, "
+                             f"expected {len(self.emotions)}")
+
+        # Drop a partial record left by an interrupted append
+        body = os.path.getsize(self.data_file) - HEADER_SIZE
+        self.size = body // record_size
+        if body % record_size:
+            with open(self.data_file, 'r+b') as f:
+                f.truncate(HEADER_SIZE + self.size * record_size)
+
+    def _read_strings(self) -> None:
+        """Replay the string table sidecar, cutting off a torn last entry"""
+        tables = {'behavior': self.behaviors, 'trigger': self.triggers}
+        if not os.path.exists(self.strings_file):
+            return
+        with open(self.strings_file, 'r+b') as f:
+            data = f.read()
+            # An entry is only complete with its newline; ids follow line order,
+            # so a partial one must go before the next entry is appended
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                f.truncate(end)
+        for line in data[:end].splitlines():
+            kind, value = json.loads(line)
+            tables[kind].intern(value)
+
+    def _encode(self, memories: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[Tuple[str, str]]]:
+        """
+        Pack memories into records, interning new strings
+
+        Returns:
+            Tuple[np.ndarray, List[Tuple[str, str]]]: Records and the
+            (kind, value) string table entries they added
+        """
+        added: List[Tuple[str, str]] = []
+        records = np.zeros(len(memories), dtype=self.dtype)
+        for row, memory in enumerate(memories):
+            state = memory['emotional_state']
+            behavior, trigger = memory['behavior'], memory.get('trigger')
+            if behavior not in self.behaviors.ids:
+                if len(self.behaviors) > np.iinfo(np.uint8).max:
+                    raise ValueError("binary format supports at most 256 behaviors")
+                added.append(('behavior', behavior))
+            if trigger is not None and trigger not in self.triggers.ids:
+                added.append(('trigger', trigger))
+            records[row] = (
+                datetime_to_micros(datetime.fromisoformat(memory['timestamp'])),
+                [state.get(e, 0.0) for e in self.emotions],
+                self.behaviors.intern(behavior),
+                self.triggers.intern(trigger)
+            )
+        return records, added
+
+    def _write_strings(self, added: List[Tuple[str, str]]) -> None:
+        """Append new string table entries ahead of the records using them"""
+        if not added:
+            return
+        ensure_parent_dir(self.strings_file)
+        with open(self.strings_file, 'a') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in added)
+            if self.durability == 'fsync':
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _records(self) -> np.ndarray:
+        """Get a read-only memory map of every stored record"""
+        if self._file is not None and self.durability == 'none':
+            self._file.flush()
+        if self._map is None or len(self._map) != self.size:
+            if self.size == 0:
+                self._map = np.zeros(0, dtype=self.dtype)
+            else:
+                self._map = np.memmap(self.data_file, dtype=self.dtype, mode='r',
+                                      offset=HEADER_SIZE, shape=(self.size,))
+        return self._map
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load every stored memory in storage order"""
+        return self.query()
+
+    def append(self, memories: List[Dict[str, Any]]) -> None:
+        """Append a batch of records with one write"""
+        with self._lock:
+            records, added = self._encode(memories)
+            self._write_strings(added)
+            if self._file is None:
+                self._file = open(self.data_file, 'ab')
+            self._file.write(records.tobytes())
+            if self.durability != 'none':
+                self._file.flush()
+                if self.durability == 'fsync':
+                    os.fsync(self._file.fileno())
+            self.size += len(records)
+
+    def rewrite(self, memories: List[Dict[str, Any]]) -> None:
+        """Atomically replace the stored records; the string table only grows"""
+        with self._lock:
+            self._close()
+            records, added = self._encode(memories)
+            self._write_strings(added)
+            ensure_parent_dir(self.data_file)
+            temp_file = self.data_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                header = HEADER.pack(MAGIC, FORMAT_VERSION, self.dtype.itemsize,
+                                     len(self.emotions))
+                f.write(header.ljust(HEADER_SIZE, b'\0'))
+                f.write(records.tobytes())
+                if self.durability == 'fsync':
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_file, self.data_file)
+            self.size = len(records)
+
+    def close(self) -> None:
+        """Close the append handle and drop the memory map"""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        """Close the append handle and drop the memory map, holding the lock"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._map = None
+
+    def _bisect(self, timestamps: np.ndarray, moment: Optional[datetime], default: int) -> int:
+        """Find the first row at or after a moment, reading O(log n) rows"""
+        if moment is None:
+            return default
+        target = datetime_to_micros(moment)
+        low, high = 0, len(timestamps)
+        while low < high:
+            middle = (low + high) // 2
+            if timestamps[middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _decode(self, records: np.ndarray) -> List[Dict[str, Any]]:
+        """Materialize records as memory dicts"""
+        intensities = widen_intensities(records['intensities']).tolist()
+        behaviors, triggers = self.behaviors.lookup, self.triggers.lookup
+        return [
+            {
+                'timestamp': micros_to_datetime(timestamp).isoformat(),
+                'emotional_state': dict(zip(self.emotions, state)),
+                'behavior': behaviors(behavior),
+                'trigger': triggers(trigger)
+            }
+            for timestamp, state, behavior, trigger in zip(
+                records['timestamp'].tolist(), intensities,
+                records['behavior'].tolist(), records['trigger'].tolist())
+        ]
+
+    def _select(self, since: Optional[datetime], until: Optional[datetime],
+                behavior: Optional[str], emotion: Optional[str],
+                above: Optional[float]) -> Tuple[np.ndarray, Any]:
+        """
+        Select the rows matching a query
+
+        Returns:
+            Tuple[np.ndarray, Any]: The mapped records and either a slice
+            of the time window or an array of matching row indices
+        """
+        records = self._records()
+        timestamps = records['timestamp']
+        low = self._bisect(timestamps, since, 0)
+        high = max(low, self._bisect(timestamps, until, len(records)))
+        if behavior is None and (emotion is None or above is None):
+            return records, slice(low, high)
+
+        block = records[low:high]
+        mask = np.ones(len(block), dtype=bool)
+        if behavior is not None:
+            code = self.behaviors.ids.get(behavior)
+            if code is None:
+                return records, slice(0, 0)
+            mask &= block['behavior'] == code
+        if emotion is not None and above is not None:
+            column = self.emotion_index.get(emotion)
+            if column is None:
+                return records, slice(0, 0)
+            # Compare at stored precision, so a value equal to the threshold never passes
+            mask &= block['intensities'][:, column] > np.float32(above)
+        return records, np.flatnonzero(mask) + low
+
+    def query(self, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              behavior: Optional[str] = None,
+              emotion: Optional[str] = None,
+              above: Optional[float] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Find stored memories, reading only the mapped pages needed"""
+        with self._lock:
+            records, rows = self._select(since, until, behavior, emotion, above)
+            if isinstance(rows, slice):
+                start, stop = rows.start, rows.stop
+                if limit is not None:
+                    if newest_first:
+                        start = max(start, stop - limit)
+                    else:
+                        stop = min(stop, start + limit)
+                selected = records[start:stop]
+                if newest_first:
+                    selected = selected[::-1]
+            else:
+                if newest_first:
+                    rows = rows[::-1]
+                if limit is not None:
+                    rows = rows[:limit]
+                selected = records[rows]
+            return self._decode(selected)
+
+    def iter_memories(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      behavior: Optional[str] = None,
+                      emotion: Optional[str] = None,
+                      above: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Stream matching records, decoding ``STREAM_BATCH`` rows at a time"""
+        with self._lock:
+            records, rows = self._select(since, until, behavior, emotion, above)
+        if isinstance(rows, slice):
+            for start in range(rows.start, rows.stop, STREAM_BATCH):
+                with self._lock:
+                    batch = self._decode(records[start:min(rows.stop, start + STREAM_BATCH)])
+                yield from batch
+        else:
+            for start in range(0, len(rows), STREAM_BATCH):
+                with self._lock:
+                    batch = self._decode(records[rows[start:start + STREAM_BATCH]])
+                yield from batch
+
+    def behavior_counts(self) -> Dict[str, int]:
+        """Count stored memories per behavior with one pass over the codes"""
+        with self._lock:
+            counts = np.bincount(self._records()['behavior'], minlength=len(self.behaviors))
+        return {
+            self.behaviors.lookup(code): int(count)
+            for code, count in enumerate(counts.tolist()) if count
+        }
+
+    def summarize(self, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+        """Aggregate the memories stored within a time window"""
+        with self._lock:
+            records, window = self._select(since, until, None, None, None)
+            block = records[window]
+            intensities = block['intensities'].astype(np.float64)
+            counts = np.bincount(block['behavior'], minlength=len(self.behaviors))
+        summary: Dict[str, Any] = {
+            'count': len(block),
+            'behaviors': {
+                self.behaviors.lookup(code): int(count)
+                for code, count in enumerate(counts.tolist()) if count
+            }
+        }
+        for statistic, reducer in (('min', np.min), ('mean', np.mean),
+                                   ('max', np.max)):
+            if len(block):
+                values = reducer(intensities, axis=0).tolist()
+            else:
+                values = [0.0] * len(self.emotions)
+            summary[statistic] = dict(zip(self.emotions, values))
+        return summary
+
+    def __len__(self) -> int:
+        return self.size
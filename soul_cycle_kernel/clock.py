@@ -0,0 +1,167 @@
+"""
+Clocks - Pluggable tick scheduling for the SimulationEngine
+"""
+
+import time
+from typing import Callable, Dict
+
+class SleepClock:
+    def __init__(self, tick_duration: float = 1.0):
+        """
+        Initialize the default clock, which sleeps a full tick after each tick
+
+        Args:
+            tick_duration (float): Duration of each tick until ``start``
+                sets the simulation's
+        """
+        self.tick_duration = tick_duration
+
+    def start(self, tick_duration: float) -> None:
+        """
+        Prepare the clock for a simulation run
+
+        Args:
+            tick_duration (float): Duration of each simulation tick in seconds
+        """
+        self.tick_duration = tick_duration
+
+    def wait_for_next_tick(self) -> None:
+        """Block until the next tick is due"""
+        time.sleep(self.tick_duration)
+
+    def skip(self, ticks: int) -> None:
+        """
+        Account for ticks that were fast-forwarded without waiting
+
+        Args:
+            ticks (int): Number of skipped ticks
+        """
+
+    def now(self) -> float:
+        """Get the current time in seconds"""
+        return time.monotonic()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get scheduling statistics"""
+        return {}
+
+class VirtualClock(SleepClock):
+    def __init__(self, start_time: float = 0.0):
+        """
+        Initialize a virtual clock that advances instantly
+
+        Waiting for a tick moves virtual time forward by one tick duration
+        without sleeping, so offline and batch simulations run at full speed.
+
+        Args:
+            start_time (float): Initial virtual time in seconds
+        """
+        super().__init__()
+        self.time = start_time
+        self.ticks = 0
+
+    def wait_for_next_tick(self) -> None:
+        """Advance virtual time by one tick"""
+        self.time += self.tick_duration
+        self.ticks += 1
+
+    def skip(self, ticks: int) -> None:
+        """Advance virtual time by several ticks"""
+        self.time += self.tick_duration * ticks
+        self.ticks += ticks
+
+    def now(self) -> float:
+        """Get the current virtual time in seconds"""
+        return self.time
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get scheduling statistics"""
+        return {'ticks': self.ticks, 'virtual_time': self.time}
+
+class FixedRateClock(SleepClock):
+    def __init__(self, catch_up: bool = False,
+                 time_source: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize a real-time clock that ticks on absolute deadlines
+
+        Tick n is due at start + n * tick_duration, so time spent processing
+        a tick is absorbed instead of adding to every period. When a tick
+        overruns its deadline, the clock either fires the late ticks
+        back-to-back (``catch_up``) or skips the missed deadlines and
+        realigns to the schedule.
+
+        Args:
+            catch_up (bool): Run late ticks immediately instead of skipping them
+            time_source (Callable[[], float]): Monotonic time in seconds
+            sleep (Callable[[float], None]): Function used to wait
+        """
+        super().__init__()
+        self.catch_up = catch_up
+        self.time_source = time_source
+        self.sleep = sleep
+        self.next_deadline = None
+        self._reset_stats()
+
+    def start(self, tick_duration: float) -> None:
+        """Anchor the tick schedule at the current time"""
+        super().start(tick_duration)
+        self.next_deadline = self.time_source() + tick_duration
+        self._reset_stats()
+
+    def wait_for_next_tick(self) -> None:
+        """Sleep until the next deadline, compensating for processing time"""
+        if self.next_deadline is None:
+            self.start(self.tick_duration)
+
+        now = self.time_source()
+        lag = now - self.next_deadline
+        self.ticks += 1
+        if lag <= 0:
+            self.sleep(-lag)
+            self.next_deadline += self.tick_duration
+            return
+
+        self.overruns += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if self.catch_up or self.tick_duration <= 0:
+            self.next_deadline += self.tick_duration
+            return
+
+        # Drop the deadlines that already passed and realign to the schedule
+        missed = int(lag // self.tick_duration)
+        self.skipped_ticks += missed
+        self.next_deadline += (missed + 1) * self.tick_duration
+
+    def skip(self, ticks: int) -> None:
+        """Re-anchor the schedule after a fast-forward"""
+        self.next_deadline = self.time_source() + self.tick_duration
+
+    def now(self) -> float:
+        """Get the current time in seconds"""
+        return self.time_source()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get scheduling statistics
+
+        Returns:
+            Dict[str, float]: Tick, overrun and skipped-tick counts, plus the
+            mean and maximum lag behind schedule in seconds
+        """
+        return {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped_ticks': self.skipped_ticks,
+            'max_lag': self.max_lag,
+            'mean_lag': self.total_lag / self.overruns if self.overruns else 0.0
+        }
+
+    def _reset_stats(self) -> None:
+        """Reset the scheduling statistics"""
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
@@ -0,0 +1,261 @@
+"""
+ColumnarMemoryStore - Column-oriented in-memory storage for memories
+"""
+
+import numpy as np
+from collections.abc import Sequence as SequenceABC
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .emotion_engine import EMOTIONS
+from .encoding import StringTable, datetime_to_micros, micros_to_datetime
+
+class ColumnarMemoryStore:
+    def __init__(self, emotions: Sequence[str] = EMOTIONS, capacity: int = 1024):
+        """
+        Initialize an empty columnar memory store
+
+        Each memory is split across NumPy columns: an int64 timestamp in
+        microseconds since the epoch, one float64 column per emotion, a
+        uint8 behavior code and an int32 trigger id (-1 for no trigger).
+        Behaviors and triggers are interned in string tables. Columns grow
+        by doubling, so appends are amortized O(1).
+
+        Args:
+            emotions (Sequence[str]): Emotion names in column order
+            capacity (int): Initial number of rows allocated
+        """
+        self.emotions = list(emotions)
+        self.emotion_index = {e: column for column, e in enumerate(self.emotions)}
+        self.behaviors = StringTable()
+        self.triggers = StringTable()
+        self.size = 0
+        capacity = max(1, capacity)
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.intensities = np.zeros((capacity, len(self.emotions)), dtype=np.float64)
+        self.behavior_codes = np.zeros(capacity, dtype=np.uint8)
+        self.trigger_ids = np.zeros(capacity, dtype=np.int32)
+
+    @classmethod
+    def from_memories(cls, memories: Iterable[Dict[str, Any]],
+                      emotions: Sequence[str] = EMOTIONS) -> 'ColumnarMemoryStore':
+        """
+        Build a store from memory dicts
+
+        Args:
+            memories (Iterable[Dict[str, Any]]): Memories in chronological order
+            emotions (Sequence[str]): Emotion names in column order
+
+        Returns:
+            ColumnarMemoryStore: Store holding the memories
+        """
+        memories = list(memories)
+        store = cls(emotions, capacity=len(memories))
+        store.extend(memories)
+        return store
+
+    def append(self, memory: Dict[str, Any]) -> None:
+        """
+        Append one memory dict
+
+        Args:
+            memory (Dict[str, Any]): Memory with timestamp, emotional_state,
+                behavior and trigger keys
+        """
+        if self.size == len(self.timestamps):
+            self._grow(2 * len(self.timestamps))
+        row = self.size
+        state = memory['emotional_state']
+        self.timestamps[row] = datetime_to_micros(
+            datetime.fromisoformat(memory['timestamp']))
+        self.intensities[row] = [state.get(e, 0.0) for e in self.emotions]
+        self.behavior_codes[row] = self._behavior_code(memory['behavior'])
+        self.trigger_ids[row] = self.triggers.intern(memory.get('trigger'))
+        self.size += 1
+
+    def extend(self, memories: Iterable[Dict[str, Any]]) -> None:
+        """Append several memory dicts"""
+        for memory in memories:
+            self.append(memory)
+
+    def clear(self) -> None:
+        """Drop every memory, keeping the interned strings"""
+        self.size = 0
+
+    def get_memory(self, row: int) -> Dict[str, Any]:
+        """
+        Materialize one row as a memory dict
+
+        Args:
+            row (int): Row index
+
+        Returns:
+            Dict[str, Any]: The memory in the list-of-dicts format
+        """
+        return {
+            'timestamp': micros_to_datetime(self.timestamps[row]).isoformat(),
+            'emotional_state': dict(zip(self.emotions,
+                                        self.intensities[row].tolist())),
+            'behavior': self.behaviors.lookup(int(self.behavior_codes[row])),
+            'trigger': self.triggers.lookup(int(self.trigger_ids[row]))
+        }
+
+    def get_memories(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """Materialize several rows as memory dicts"""
+        return [self.get_memory(int(row)) for row in rows]
+
+    def view(self) -> 'MemoryView':
+        """Get a list-of-dicts compatibility view of the store"""
+        return MemoryView(self)
+
+    def rows_above(self, emotion: str, threshold: float) -> np.ndarray:
+        """
+        Find the rows where an emotion exceeds a threshold
+
+        Args:
+            emotion (str): Emotion column to test
+            threshold (float): Exclusive lower bound
+
+        Returns:
+            np.ndarray: Matching row indices in chronological order
+        """
+        column = self.emotion_index.get(emotion)
+        if column is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self.intensities[:self.size, column] > threshold)
+
+    def count_above(self, emotion: str, threshold: float) -> int:
+        """Count the rows where an emotion exceeds a threshold"""
+        column = self.emotion_index.get(emotion)
+        if column is None:
+            return 0
+        return int(np.count_nonzero(self.intensities[:self.size, column] > threshold))
+
+    def behavior_counts(self, rows: Union[slice, np.ndarray, None] = None) -> Dict[str, int]:
+        """
+        Count behaviors over all rows or a selection
+
+        Args:
+            rows (Union[slice, np.ndarray, None]): Rows to count, all if None
+
+        Returns:
+            Dict[str, int]: Frequency of each behavior, in first-seen order
+        """
+        codes = self.behavior_codes[:self.size]
+        if rows is not None:
+            codes = codes[rows]
+        counts = np.bincount(codes, minlength=len(self.behaviors))
+        return {
+            self.behaviors.lookup(code): int(count)
+            for code, count in enumerate(counts) if count
+        }
+
+    def window(self, since: Optional[datetime] = None,
+               until: Optional[datetime] = None) -> slice:
+        """
+        Find the rows stored within a time window
+
+        Rows are assumed to be in chronological order, as appended.
+
+        Args:
+            since (Optional[datetime]): Inclusive lower bound
+            until (Optional[datetime]): Exclusive upper bound
+
+        Returns:
+            slice: Row range inside the window
+        """
+        timestamps = self.timestamps[:self.size]
+        low = 0 if since is None else int(np.searchsorted(
+            timestamps, datetime_to_micros(since), side='left'))
+        high = self.size if until is None else int(np.searchsorted(
+            timestamps, datetime_to_micros(until), side='left'))
+        return slice(low, max(low, high))
+
+    def aggregate(self, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Summarize the memories stored within a time window
+
+        Args:
+            since (Optional[datetime]): Inclusive lower bound
+            until (Optional[datetime]): Exclusive upper bound
+
+        Returns:
+            Dict[str, Any]: Memory count, per-emotion min/mean/max and
+            behavior counts
+        """
+        rows = self.window(since, until)
+        block = self.intensities[:self.size][rows]
+        summary: Dict[str, Any] = {
+            'count': len(block),
+            'behaviors': self.behavior_counts(rows)
+        }
+        for statistic, reducer in (('min', np.min), ('mean', np.mean),
+                                   ('max', np.max)):
+            if len(block):
+                values = reducer(block, axis=0).tolist()
+            else:
+                values = [0.0] * len(self.emotions)
+            summary[statistic] = dict(zip(self.emotions, values))
+        return summary
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _behavior_code(self, behavior: str) -> int:
+        """Intern a behavior, keeping codes within uint8"""
+        code = self.behaviors.intern(behavior)
+        if code > np.iinfo(np.uint8).max:
+            raise ValueError("columnar store supports at most 256 behaviors")
+        return code
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocate every column to hold ``capacity`` rows"""
+        for name in ('timestamps', 'intensities', 'behavior_codes', 'trigger_ids'):
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+class MemoryView(SequenceABC):
+    def __init__(self, store: ColumnarMemoryStore):
+        """
+        Read-mostly list-of-dicts view over a columnar store
+
+        Indexing and iteration materialize memory dicts on demand, and
+        ``append`` writes through to the store, so code written against the
+        plain ``memories`` list keeps working.
+
+        Args:
+            store (ColumnarMemoryStore): Store being viewed
+        """
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self.store.get_memories(range(*index.indices(len(self.store))))
+        if index < 0:
+            index += len(self.store)
+        if not 0 <= index < len(self.store):
+            raise IndexError("memory index out of range")
+        return self.store.get_memory(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self.store)):
+            yield self.store.get_memory(row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, MemoryView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def append(self, memory: Dict[str, Any]) -> None:
+        """Append a memory dict to the underlying store"""
+        self.store.append(memory)
+
+    def extend(self, memories: Iterable[Dict[str, Any]]) -> None:
+        """Append several memory dicts to the underlying store"""
+        self.store.extend(memories)
@@ -2,33 +2,59 @@
 EmotionEngine - Core component for processing and evolving emotional states
 """
 
-import numpy as np
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+import math
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple, Optional
+
+from .behavior import DEFAULT_RULES, BehaviorClassifier, BehaviorRule
+from .history_buffer import HistoryBuffer, SpillHook
+
+if TYPE_CHECKING:
+    from .interactions import EmotionInteractions
+
+# Base emotions in canonical column order
+EMOTIONS = ('joy', 'sadness', 'anger', 'fear', 'love', 'curiosity', 'hope')
+
+# Default fraction of each emotion lost per time step
+DECAY_RATES = {
+    'joy': 0.1,
+    'sadness': 0.05,
+    'anger': 0.15,
+    'fear': 0.1,
+    'love': 0.03,
+    'curiosity': 0.08,
+    'hope': 0.05
+}
 
 class EmotionEngine:
-    def __init__(self):
-        """Initialize the emotion engine with base emotions and their properties"""
-        self.base_emotions = {
-            'joy': 0.0,
-            'sadness': 0.0,
-            'anger': 0.0,
-            'fear': 0.0,
-            'love': 0.0,
-            'curiosity': 0.0,
-            'hope': 0.0
-        }
+    def __init__(self, history_capacity: int = 10000,
+                 history_spill: Optional[SpillHook] = None,
+                 interactions: Optional['EmotionInteractions'] = None,
+                 behavior_rules: Sequence[BehaviorRule] = DEFAULT_RULES):
+        """
+        Initialize the emotion engine with base emotions and their properties
+        
+        By default each emotion decays independently by its rate in
+        ``decay_rates``. With ``interactions`` set, time steps follow that
+        linear model instead, so emotions feed and suppress each other.
+        
+        Emergent behaviors come from ``behavior_rules``, compiled into a
+        ``BehaviorClassifier``. The classification is cached until the state
+        changes; editing ``thresholds`` in place, assigning new thresholds
+        or rules, or calling ``set_behavior_rules`` recompiles the rules.
+        
+        Args:
+            history_capacity (int): Number of recent states kept in history
+            history_spill (Optional[SpillHook]): Receives states evicted from
+                a full history instead of dropping them
+            interactions (Optional[EmotionInteractions]): Coupled decay
+                model replacing the independent decay
+            behavior_rules (Sequence[BehaviorRule]): (emotion, threshold
+                level, behavior) rules for ``get_emergent_behavior``
+        """
+        self.base_emotions = {emotion: 0.0 for emotion in EMOTIONS}
         
         # Decay rates for each emotion (per time step)
-        self.decay_rates = {
-            'joy': 0.1,
-            'sadness': 0.05,
-            'anger': 0.15,
-            'fear': 0.1,
-            'love': 0.03,
-            'curiosity': 0.08,
-            'hope': 0.05
-        }
+        self.decay_rates = dict(DECAY_RATES)
         
         # Emotional state thresholds
         self.thresholds = {
@@ -40,8 +66,25 @@ class EmotionEngine:
         # Current emotional state
         self.current_state = self.base_emotions.copy()
         
-        # Emotional history
-        self.history: List[Tuple[datetime, Dict[str, float]]] = []
+        # Emotional history, bounded to a fixed-size ring buffer
+        self.history = HistoryBuffer(
+            list(self.base_emotions),
+            capacity=history_capacity,
+            spill=history_spill
+        )
+
+        # Coupled dynamics; contractive models advance from an anchor state
+        self.interactions = interactions
+        self._anchor_model: Optional['EmotionInteractions'] = None
+        self._anchor: Optional[object] = None
+        self._anchor_ticks = 0
+        self._anchor_last: List[float] = []
+
+        # Behavior classification, cached until the state changes
+        self.behavior_rules = tuple(behavior_rules)
+        self._classifier = BehaviorClassifier(list(self.base_emotions), self.thresholds,
+                                              self.behavior_rules)
+        self._behavior: Optional[str] = None
 
     def update_emotion(self, emotion: str, intensity: float) -> None:
         """
@@ -52,23 +95,62 @@ class EmotionEngine:
             intensity (float): The intensity value (0.0 to 1.0)
         """
         if emotion in self.current_state:
-            self.current_state[emotion] = np.clip(
-                self.current_state[emotion] + intensity,
-                0.0,
-                1.0
+            self.current_state[emotion] = min(
+                1.0,
+                max(0.0, self.current_state[emotion] + intensity)
             )
+            self._behavior = None
             self._record_state()
 
     def decay_emotions(self) -> None:
-        """Apply natural decay to all emotions"""
-        for emotion in self.current_state:
-            decay = self.decay_rates[emotion]
-            self.current_state[emotion] = max(
-                0.0,
-                self.current_state[emotion] - decay
-            )
+        """Apply natural decay, or one tick of the interaction model, to all emotions"""
+        if self.interactions is not None:
+            self._interact(1)
+        else:
+            self._apply_decay()
         self._record_state()
 
+    def advance(self, ticks: int) -> List[Tuple[int, Dict[str, float], str]]:
+        """
+        Fast-forward natural decay by a number of ticks
+
+        Decay is a clamped linear subtraction, so every emotion reaches zero
+        within ceil(intensity / rate) ticks and the state is fixed from then
+        on. Only that bounded prefix is stepped, with the same arithmetic as
+        ``decay_emotions``, so the cost does not depend on ``ticks`` and the
+        final state is identical to calling ``decay_emotions`` repeatedly.
+        Only the ticks where the emergent behavior changes are recorded in
+        history.
+
+        With ``interactions`` set, ticks are stepped until no later tick can
+        change the behavior, then the rest is applied in one jump (see
+        ``_advance_interactions``).
+
+        Args:
+            ticks (int): Number of decay ticks to apply
+
+        Returns:
+            List[Tuple[int, Dict[str, float], str]]: Behavior transitions as
+            (tick offset, emotional state, new behavior)
+        """
+        transitions: List[Tuple[int, Dict[str, float], str]] = []
+        if ticks <= 0:
+            return transitions
+        if self.interactions is not None:
+            return self._advance_interactions(ticks)
+
+        settled = self._ticks_until_settled()
+        steps = ticks if settled is None else min(ticks, settled)
+        behavior = self.get_emergent_behavior()
+        for tick in range(1, steps + 1):
+            self._apply_decay()
+            new_behavior = self.get_emergent_behavior()
+            if new_behavior != behavior:
+                behavior = new_behavior
+                transitions.append((tick, self.current_state.copy(), behavior))
+                self._record_state()
+        return transitions
+
     def get_dominant_emotion(self) -> Tuple[str, float]:
         """
         Get the currently dominant emotion
@@ -91,6 +173,19 @@ class EmotionEngine:
         """
         return self.current_state.copy()
 
+    def load_state(self, state: Dict[str, float]) -> None:
+        """
+        Restore a previously saved emotional state without recording it
+
+        Args:
+            state (Dict[str, float]): Emotion intensities; unknown emotions
+                are ignored and missing ones keep their current value
+        """
+        for emotion, intensity in state.items():
+            if emotion in self.current_state:
+                self.current_state[emotion] = float(intensity)
+        self._behavior = None
+
     def get_emergent_behavior(self) -> str:
         """
         Determine emergent behavior based on emotional state
@@ -98,27 +193,148 @@ class EmotionEngine:
         Returns:
             str: Description of the emergent behavior
         """
-        dominant_emotion, intensity = self.get_dominant_emotion()
+        behavior = self._behavior
+        classifier = self._classifier
+        if (behavior is None or classifier.levels != self.thresholds
+                or classifier.rules is not self.behavior_rules):
+            behavior = self._behavior = self.get_classifier().classify(self.current_state)
+        return behavior
         
-        if intensity < self.thresholds['low']:
-            return "neutral"
-        elif dominant_emotion == 'curiosity' and intensity > self.thresholds['medium']:
-            return "exploratory"
-        elif dominant_emotion == 'love' and intensity > self.thresholds['high']:
-            return "deeply connected"
-        elif dominant_emotion == 'fear' and intensity > self.thresholds['medium']:
-            return "withdrawn"
-        elif dominant_emotion == 'joy' and intensity > self.thresholds['high']:
-            return "exuberant"
-        elif dominant_emotion == 'sadness' and intensity > self.thresholds['medium']:
-            return "reflective"
-        elif dominant_emotion == 'anger' and intensity > self.thresholds['medium']:
-            return "agitated"
-        elif dominant_emotion == 'hope' and intensity > self.thresholds['medium']:
-            return "optimistic"
+    def get_classifier(self) -> BehaviorClassifier:
+        """
+        Get the behavior classifier for the current thresholds and rules
+
+        Returns:
+            BehaviorClassifier: Compiled rules, rebuilt if either changed
+        """
+        classifier = self._classifier
+        if (classifier.levels != self.thresholds
+                or classifier.rules is not self.behavior_rules):
+            classifier = self._classifier = BehaviorClassifier(
+                list(self.current_state), self.thresholds, self.behavior_rules)
+            self._behavior = None
+        return classifier
+
+    def set_behavior_rules(self, rules: Optional[Sequence[BehaviorRule]] = None,
+                           thresholds: Optional[Dict[str, float]] = None) -> None:
+        """
+        Replace the behavior rules and/or threshold levels
+
+        Args:
+            rules (Optional[Sequence[BehaviorRule]]): New rules, unchanged if None
+            thresholds (Optional[Dict[str, float]]): New levels, unchanged if None
+        """
+        if rules is not None:
+            self.behavior_rules = tuple(rules)
+        if thresholds is not None:
+            self.thresholds = dict(thresholds)
+        self.get_classifier()
+
+    def _apply_decay(self) -> None:
+        """Subtract one tick of decay from every emotion, clamped at zero"""
+        self._behavior = None
+        for emotion in self.current_state:
+            decay = self.decay_rates[emotion]
+            self.current_state[emotion] = max(
+                0.0,
+                self.current_state[emotion] - decay
+            )
+
+    def _interact(self, ticks: int) -> None:
+        """
+        Apply ticks of the interaction model to the current state
+
+        A contractive model never clips, so the state ``n`` ticks after the
+        anchor (the state the last input left) is computed directly as
+        ``M**n @ anchor``; a jump of ``ticks`` and as many single ticks
+        then produce the same bits. Other models are stepped one tick at a
+        time. Any change to the state since the last tick, or to the model,
+        starts a new anchor.
+
+        Args:
+            ticks (int): Number of ticks to apply
+        """
+        model = self.interactions
+        state = self.current_state
+        values = [state[emotion] for emotion in model.emotions]
+        if model.contractive:
+            if self._anchor_model is not model or values != self._anchor_last:
+                import numpy as np
+
+                self._anchor_model = model
+                self._anchor = np.array(values, dtype=np.float64)
+                self._anchor_ticks = 0
+            self._anchor_ticks += ticks
+            values = model.propagate(self._anchor, self._anchor_ticks).tolist()
+            self._anchor_last = values
         else:
-            return "stable"
+            import numpy as np
+
+            vector = np.array(values, dtype=np.float64)
+            for _ in range(ticks):
+                vector = model.step(vector)
+            values = vector.tolist()
+        for emotion, intensity in zip(model.emotions, values):
+            state[emotion] = intensity
+        self._behavior = None
+
+    def _advance_interactions(self, ticks: int) -> List[Tuple[int, Dict[str, float], str]]:
+        """
+        Fast-forward the interaction model, recording behavior transitions
+
+        Under a contractive model no intensity can exceed the previous
+        maximum, so once the behavior is neutral it stays neutral and the
+        remaining ticks are one jump; with every row sum below one this
+        takes a bounded number of steps. A non-contractive model stops
+        early once a tick leaves the state unchanged.
+
+        Args:
+            ticks (int): Number of ticks to apply
+
+        Returns:
+            List[Tuple[int, Dict[str, float], str]]: Behavior transitions as
+            (tick offset, emotional state, new behavior)
+        """
+        transitions: List[Tuple[int, Dict[str, float], str]] = []
+        contractive = self.interactions.contractive
+        behavior = self.get_emergent_behavior()
+        tick = 0
+        while tick < ticks:
+            if contractive and behavior == "neutral":
+                self._interact(ticks - tick)
+                break
+            before = self.current_state.copy()
+            self._interact(1)
+            tick += 1
+            new_behavior = self.get_emergent_behavior()
+            if new_behavior != behavior:
+                behavior = new_behavior
+                transitions.append((tick, self.current_state.copy(), behavior))
+                self._record_state()
+            elif not contractive and self.current_state == before:
+                break
+        return transitions
+
+    def _ticks_until_settled(self) -> Optional[int]:
+        """
+        Upper bound on the decay ticks before the state stops changing
+
+        Returns:
+            Optional[int]: Tick count after which further decay is a no-op,
+            None if the state never settles
+        """
+        settled = 0
+        for emotion, intensity in self.current_state.items():
+            decay = self.decay_rates[emotion]
+            if intensity <= 0.0 or decay == 0.0:
+                continue
+            if decay < 0.0:
+                # Negative rates never settle, so every tick must be stepped
+                return None
+            # One extra tick absorbs rounding in the repeated subtraction
+            settled = max(settled, math.ceil(intensity / decay) + 1)
+        return settled
 
     def _record_state(self) -> None:
         """Record the current emotional state in history"""
-        self.history.append((datetime.now(), self.current_state.copy()))
+        self.history.record(self.current_state)
@@ -0,0 +1,86 @@
+"""
+Encoding - Shared helpers for compact numeric record encodings
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# Timestamps are stored as int64 microseconds since this naive epoch, which
+# round-trips the naive local datetimes used throughout the kernel exactly
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+def datetime_to_micros(timestamp: datetime) -> int:
+    """
+    Encode a naive datetime as microseconds since the epoch
+
+    Args:
+        timestamp (datetime): Naive local datetime
+
+    Returns:
+        int: Microseconds since 1970-01-01T00:00:00
+    """
+    return (timestamp - EPOCH) // ONE_MICROSECOND
+
+def micros_to_datetime(micros: int) -> datetime:
+    """
+    Decode microseconds since the epoch into a naive datetime
+
+    Args:
+        micros (int): Microseconds since 1970-01-01T00:00:00
+
+    Returns:
+        datetime: The encoded naive local datetime
+    """
+    return EPOCH + timedelta(microseconds=int(micros))
+
+def now_micros() -> int:
+    """Get the current local time as microseconds since the epoch"""
+    return datetime_to_micros(datetime.now())
+
+class StringTable:
+    def __init__(self, values: Iterable[str] = ()):
+        """
+        Intern strings as small integer ids
+
+        Args:
+            values (Iterable[str]): Strings to intern up front, in id order
+        """
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value: Optional[str]) -> int:
+        """
+        Get the id of a string, adding it if it is new
+
+        Args:
+            value (Optional[str]): String to intern; None maps to -1
+
+        Returns:
+            int: The string's id
+        """
+        if value is None:
+            return -1
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self.ids[value] = string_id
+            self.values.append(value)
+        return string_id
+
+    def lookup(self, string_id: int) -> Optional[str]:
+        """
+        Get the string for an id
+
+        Args:
+            string_id (int): Id returned by ``intern``
+
+        Returns:
+            Optional[str]: The string, or None for -1
+        """
+        return None if string_id < 0 else self.values[string_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
@@ -0,0 +1,227 @@
+"""
+HistoryBuffer - Bounded, array-backed ring buffer of emotional states
+"""
+
+import glob
+import os
+from array import array
+from datetime import datetime
+from typing import (TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence,
+                    Tuple, Union)
+
+from .encoding import datetime_to_micros, micros_to_datetime, now_micros
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Receives evicted records in chronological order: (timestamps, intensities)
+SpillHook = Callable[['np.ndarray', 'np.ndarray'], None]
+
+class HistoryBuffer:
+    def __init__(self, emotions: Sequence[str], capacity: int = 10000,
+                 spill: Optional[SpillHook] = None,
+                 spill_batch: Optional[int] = None):
+        """
+        Initialize a preallocated ring buffer of emotional states
+
+        Timestamps are kept in an int64 column of microseconds since the
+        epoch and intensities in a row-major float32 block with one column
+        per emotion, so memory use is fixed by ``capacity``. When the buffer
+        is full the oldest records are overwritten, or handed to ``spill``
+        in batches of ``spill_batch`` records if a spill hook is set.
+
+        Columns are stdlib ``array`` buffers so that recording needs no
+        NumPy import; the query methods view them as NumPy arrays.
+
+        Args:
+            emotions (Sequence[str]): Emotion names in column order
+            capacity (int): Maximum number of records kept in memory
+            spill (Optional[SpillHook]): Called with records before eviction
+            spill_batch (Optional[int]): Records evicted per spill call,
+                defaults to a quarter of the capacity
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.emotions = list(emotions)
+        self.capacity = capacity
+        self.spill = spill
+        self.spill_batch = min(capacity, spill_batch or max(1, capacity // 4))
+        self.timestamps = array('q', bytes(8 * capacity))
+        self.intensities = array('f', bytes(4 * capacity * len(self.emotions)))
+        self.total_recorded = 0
+        self._start = 0
+        self._size = 0
+
+    def record(self, state: Dict[str, float],
+               timestamp: Optional[datetime] = None) -> None:
+        """
+        Append an emotional state
+
+        Args:
+            state (Dict[str, float]): Emotional state keyed by emotion
+            timestamp (Optional[datetime]): When it was recorded, now if None
+        """
+        if self._size == self.capacity:
+            if self.spill is not None:
+                self._spill_oldest()
+            else:
+                self._start = (self._start + 1) % self.capacity
+                self._size -= 1
+
+        position = (self._start + self._size) % self.capacity
+        self.timestamps[position] = (
+            now_micros() if timestamp is None else datetime_to_micros(timestamp)
+        )
+        base = position * len(self.emotions)
+        for column, emotion in enumerate(self.emotions):
+            self.intensities[base + column] = state.get(emotion, 0.0)
+        self._size += 1
+        self.total_recorded += 1
+
+    def clear(self) -> None:
+        """Drop every buffered record"""
+        self._start = 0
+        self._size = 0
+
+    def as_arrays(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Get all buffered records in chronological order
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int64 timestamps (microseconds
+            since the epoch) and an N x 7 float32 intensity block
+        """
+        return self._select(0, self._size)
+
+    def last(self, count: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Get the most recent records in chronological order
+
+        Args:
+            count (int): Maximum number of records to return
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Timestamps and intensities
+        """
+        count = max(0, min(count, self._size))
+        return self._select(self._size - count, self._size)
+
+    def window(self, since: Optional[datetime] = None,
+               until: Optional[datetime] = None) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Get the records recorded within a time window
+
+        Args:
+            since (Optional[datetime]): Inclusive lower bound
+            until (Optional[datetime]): Exclusive upper bound
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Timestamps and intensities
+        """
+        import numpy as np
+
+        timestamps, intensities = self.as_arrays()
+        low = 0 if since is None else np.searchsorted(
+            timestamps, datetime_to_micros(since), side='left')
+        high = len(timestamps) if until is None else np.searchsorted(
+            timestamps, datetime_to_micros(until), side='left')
+        return timestamps[low:high], intensities[low:high]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Tuple[datetime, Dict[str, float]]]:
+        for position in self._positions(0, self._size):
+            yield self._entry(position)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """Index like the list of (datetime, state) tuples it replaces"""
+        if isinstance(index, slice):
+            return [self._entry(p) for p in
+                    self._positions(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._entry((self._start + index) % self.capacity)
+
+    def _positions(self, start: int, stop: int, step: int = 1) -> Iterator[int]:
+        """Map chronological indices to ring positions"""
+        return ((self._start + index) % self.capacity
+                for index in range(start, stop, step))
+
+    def _select(self, start: int, stop: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Copy a chronological range of records into NumPy arrays"""
+        import numpy as np
+
+        order = (self._start + np.arange(start, stop)) % self.capacity
+        timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+        intensities = np.frombuffer(self.intensities, dtype=np.float32).reshape(
+            self.capacity, len(self.emotions))
+        return timestamps[order], intensities[order]
+
+    def _entry(self, position: int) -> Tuple[datetime, Dict[str, float]]:
+        """Materialize one record as a (datetime, state) tuple"""
+        base = position * len(self.emotions)
+        values = self.intensities[base:base + len(self.emotions)].tolist()
+        return (micros_to_datetime(self.timestamps[position]),
+                dict(zip(self.emotions, values)))
+
+    def _spill_oldest(self) -> None:
+        """Hand the oldest batch of records to the spill hook and evict it"""
+        self.spill(*self._select(0, self.spill_batch))
+        self._start = (self._start + self.spill_batch) % self.capacity
+        self._size -= self.spill_batch
+
+class HistorySpillWriter:
+    def __init__(self, directory: str, prefix: str = "history",
+                 emotions: Optional[Sequence[str]] = None):
+        """
+        Spill hook writing evicted history batches to numbered .npz files
+
+        Args:
+            directory (str): Directory receiving the spill files
+            prefix (str): File name prefix
+            emotions (Optional[Sequence[str]]): Emotion names in column
+                order, the engine's default emotions if None
+        """
+        if emotions is None:
+            from .emotion_engine import EMOTIONS
+
+            emotions = EMOTIONS
+        self.directory = directory
+        self.prefix = prefix
+        self.emotions = list(emotions)
+        os.makedirs(directory, exist_ok=True)
+        self.segments = len(glob.glob(
+            os.path.join(glob.escape(directory), f"{glob.escape(prefix)}-*.npz")))
+
+    def __call__(self, timestamps: 'np.ndarray', intensities: 'np.ndarray') -> None:
+        import numpy as np
+
+        self.segments += 1
+        path = os.path.join(self.directory,
+                            f"{self.prefix}-{self.segments:06d}.npz")
+        np.savez(path, timestamps=timestamps, intensities=intensities)
+
+    def load(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Read every spilled batch back in chronological order
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Timestamps and intensities
+        """
+        import numpy as np
+
+        timestamps: List['np.ndarray'] = []
+        intensities: List['np.ndarray'] = []
+        for segment in range(1, self.segments + 1):
+            path = os.path.join(self.directory,
+                                f"{self.prefix}-{segment:06d}.npz")
+            with np.load(path) as data:
+                timestamps.append(data['timestamps'])
+                intensities.append(data['intensities'])
+        if not timestamps:
+            return (np.empty(0, dtype=np.int64),
+                    np.empty((0, len(self.emotions)), dtype=np.float32))
+        return np.concatenate(timestamps), np.concatenate(intensities)
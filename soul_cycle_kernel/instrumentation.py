@@ -0,0 +1,372 @@
+"""
+Instrumentation - Opt-in per-stage latency histograms for the kernel hot paths
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .emotion_engine import EmotionEngine
+from .memory_system import MemorySystem
+from .simulation_engine import SimulationEngine, SoulAI
+
+# Sub-buckets per power of two; latencies are kept to within 1/16
+SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+class LatencyHistogram:
+    def __init__(self):
+        """
+        Initialize a log-linear histogram of nanosecond latencies
+
+        Each power of two is split into 8 buckets, so recording is a dict
+        increment and percentiles are accurate to about 6% at any scale.
+        """
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets: Dict[int, int] = {}
+
+    def record(self, ns: int) -> None:
+        """Add one latency in nanoseconds"""
+        ns = max(0, ns)
+        bits = ns.bit_length()
+        if bits <= SUB_BUCKET_BITS + 1:
+            bucket = ns
+        else:
+            shift = bits - SUB_BUCKET_BITS - 1
+            bucket = (shift + 1) * _SUB_BUCKETS + ((ns >> shift) & (_SUB_BUCKETS - 1))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        if not self.count or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.total_ns += ns
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a latency percentile
+
+        Args:
+            fraction (float): Percentile as a fraction, e.g. 0.99
+
+        Returns:
+            float: Midpoint of the bucket holding the percentile, in ns
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, int(self.count * fraction + 0.5))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                low, width = self._bounds(bucket)
+                return min(float(self.max_ns), max(float(self.min_ns), low + width / 2))
+        return float(self.max_ns)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Summarize the histogram
+
+        Returns:
+            Dict[str, float]: count, total_ms, mean_us, p50_us, p99_us and max_us
+        """
+        return {
+            'count': self.count,
+            'total_ms': self.total_ns / 1e6,
+            'mean_us': self.total_ns / self.count / 1000 if self.count else 0.0,
+            'p50_us': self.percentile(0.5) / 1000,
+            'p99_us': self.percentile(0.99) / 1000,
+            'max_us': self.max_ns / 1000
+        }
+
+    @staticmethod
+    def _bounds(bucket: int) -> Tuple[int, int]:
+        """Get the lower bound and width of a bucket in ns"""
+        if bucket < 2 * _SUB_BUCKETS:
+            return bucket, 1
+        shift = bucket // _SUB_BUCKETS - 1
+        return (_SUB_BUCKETS + bucket % _SUB_BUCKETS) << shift, 1 << shift
+
+class Instrumentation:
+    def __init__(self):
+        """Initialize an empty set of per-stage histograms and counters"""
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ns: int) -> None:
+        """
+        Record one timed run of a stage
+
+        Args:
+            stage (str): Stage name, e.g. 'process_input.memory_write'
+            ns (int): Elapsed nanoseconds
+        """
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(ns)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        Add to a counter
+
+        Args:
+            counter (str): Counter name, e.g. 'memory.records_stored'
+            amount (int): Amount to add
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of every stage and counter
+
+        Returns:
+            Dict[str, Any]: Seconds since ``started`` (``uptime_s``),
+            per-stage histogram summaries (``stages``) and ``counters``
+        """
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.started,
+                'stages': {
+                    stage: histogram.get_stats()
+                    for stage, histogram in sorted(self.histograms.items())
+                },
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def reset(self) -> None:
+        """Drop every recorded sample and counter"""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+class SnapshotExporter:
+    def __init__(self, instrumentation: Instrumentation, path: str,
+                 interval: float = 10.0):
+        """
+        Initialize a background thread writing periodic stats snapshots
+
+        Every ``interval`` seconds the current ``get_stats`` result is
+        written to ``path`` as JSON, replacing the previous snapshot
+        atomically so readers never see a partial file.
+
+        Args:
+            instrumentation (Instrumentation): Stats to export
+            path (str): Snapshot file
+            interval (float): Seconds between snapshots
+        """
+        self.instrumentation = instrumentation
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the exporter thread"""
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='soul-stats-exporter')
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the exporter thread after writing a final snapshot"""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def export(self) -> None:
+        """Write one snapshot now"""
+        temp_file = self.path + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(self.instrumentation.get_stats(), f, indent=2)
+        os.replace(temp_file, self.path)
+
+    def _run(self) -> None:
+        """Export on every interval until stopped, then once more"""
+        while not self._stopped.wait(self.interval):
+            self.export()
+        self.export()
+
+_clock = time.perf_counter_ns
+_active: Optional[Instrumentation] = None
+_exporter: Optional[SnapshotExporter] = None
+_originals: List[Tuple[type, str, Callable]] = []
+
+# Operation whose stages are being timed on this thread, if any
+_context = threading.local()
+
+def _operation(name: str, method: Callable) -> Callable:
+    """
+    Wrap a ``SoulAI`` entry point so the stages it calls are timed under ``name``
+
+    Records ``<name>.total`` per call and ``<name>.other`` for the time not
+    spent in any stage.
+    """
+    @functools.wraps(method)
+    def operation(*args, **kwargs):
+        # Held for the whole call, so a concurrent disable cannot pull it away
+        active = _active
+        if active is None:
+            return method(*args, **kwargs)
+        outer = getattr(_context, 'operation', None)
+        outer_staged = getattr(_context, 'staged', 0)
+        _context.operation = name
+        _context.staged = 0
+        start = _clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            total = _clock() - start
+            active.record(name + '.total', total)
+            active.record(name + '.other', total - _context.staged)
+            _context.operation = outer
+            _context.staged = outer_staged
+    return operation
+
+def _stage(stage: str, method: Callable) -> Callable:
+    """
+    Wrap a stage callable so calls made by an operation are recorded
+
+    Calls outside an operation, or nested inside another stage, run untimed.
+    """
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        active = _active
+        operation = getattr(_context, 'operation', None)
+        if active is None or operation is None:
+            return method(*args, **kwargs)
+        _context.operation = None
+        start = _clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = _clock() - start
+            _context.operation = operation
+            _context.staged += elapsed
+            active.record(f'{operation}.{stage}', elapsed)
+    return timed
+
+def _timed(stage: str, method: Callable) -> Callable:
+    """Wrap a method so each call is recorded under ``stage``"""
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        active = _active
+        if active is None:
+            return method(*args, **kwargs)
+        start = _clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            active.record(stage, _clock() - start)
+    return timed
+
+def _counted_store(method: Callable) -> Callable:
+    """Wrap ``MemorySystem._store`` so each call is timed and its records counted"""
+    @functools.wraps(method)
+    def store(self: MemorySystem, memories: List[Dict[str, Any]]) -> None:
+        active = _active
+        if active is None:
+            return method(self, memories)
+        start = _clock()
+        try:
+            method(self, memories)
+        finally:
+            active.record('memory.store', _clock() - start)
+            active.increment('memory.records_stored', len(memories))
+    return store
+
+def _patches() -> List[Tuple[type, str, Callable]]:
+    """Build the instrumented replacements for the hot-path methods"""
+    operations = [
+        (SoulAI, 'process_input', 'process_input'),
+        (SoulAI, 'process_inputs', 'process_inputs'),
+        (SoulAI, 'simulate_time_step', 'time_step'),
+        (SoulAI, 'advance', 'advance')
+    ]
+    stages = [
+        (EmotionEngine, 'update_emotion', 'update_emotion'),
+        (EmotionEngine, 'decay_emotions', 'decay'),
+        (EmotionEngine, 'advance', 'decay'),
+        (EmotionEngine, 'get_emotional_state', 'get_state'),
+        (EmotionEngine, 'get_emergent_behavior', 'get_behavior'),
+        (MemorySystem, 'store_emotional_state', 'memory_write'),
+        (MemorySystem, 'store_emotional_states', 'memory_write'),
+        (MemorySystem, 'checkpoint', 'checkpoint'),
+        (SimulationEngine, 'tick', 'tick_wait'),
+        (SimulationEngine, 'advance', 'tick_wait'),
+        (logging.Logger, 'info', 'log')
+    ]
+    return [
+        *((cls, name, _operation(operation, cls.__dict__[name]))
+          for cls, name, operation in operations),
+        *((cls, name, _stage(stage, cls.__dict__[name]))
+          for cls, name, stage in stages),
+        (MemorySystem, '_store', _counted_store(MemorySystem._store)),
+        (MemorySystem, '_load_memories',
+         _timed('memory.load', MemorySystem._load_memories)),
+        (MemorySystem, 'flush', _timed('memory.flush', MemorySystem.flush))
+    ]
+
+def enable_instrumentation(snapshot_file: Optional[str] = None,
+                           interval: float = 10.0) -> Instrumentation:
+    """
+    Time every stage of the soul and memory hot paths
+
+    While disabled the kernel runs its plain methods and pays nothing.
+    Enabling wraps ``SoulAI.process_input``, ``process_inputs``,
+    ``simulate_time_step`` and ``advance``, and the engine, memory and
+    clock methods they call, so each of their stages (emotion update,
+    behavior classification, memory write, tick wait, logging, and the
+    rest as ``other``) gets a histogram; ``MemorySystem`` stores, loads
+    and flushes are timed too. This applies to every soul in the
+    process. Calling this again keeps the collected samples and only
+    replaces the snapshot exporter.
+
+    Args:
+        snapshot_file (Optional[str]): JSON file to rewrite with the stats
+            every ``interval`` seconds, none if None
+        interval (float): Seconds between snapshots
+
+    Returns:
+        Instrumentation: The active histograms and counters
+    """
+    global _active, _exporter
+    if _active is None:
+        _active = Instrumentation()
+        for cls, name, replacement in _patches():
+            _originals.append((cls, name, cls.__dict__[name]))
+            setattr(cls, name, replacement)
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
+    if snapshot_file is not None:
+        _exporter = SnapshotExporter(_active, snapshot_file, interval)
+        _exporter.start()
+    return _active
+
+def disable_instrumentation() -> None:
+    """Restore the plain methods, writing a final snapshot if exporting"""
+    global _active, _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
+    while _originals:
+        cls, name, original = _originals.pop()
+        setattr(cls, name, original)
+    _active = None
+
+def get_instrumentation() -> Optional[Instrumentation]:
+    """Get the active instrumentation, None while disabled"""
+    return _active
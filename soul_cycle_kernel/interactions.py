@@ -0,0 +1,111 @@
+"""
+EmotionInteractions - Linear emotion dynamics with coupling between emotions
+"""
+
+import numpy as np
+from typing import List, Mapping, Optional, Sequence, Union
+
+from .emotion_engine import DECAY_RATES, EMOTIONS
+
+# Coupling weights as a matrix, or as {affected emotion: {source emotion: weight}}
+Coupling = Union[Sequence[Sequence[float]], np.ndarray, Mapping[str, Mapping[str, float]]]
+
+class EmotionInteractions:
+    def __init__(self, coupling: Optional[Coupling] = None,
+                 decay: Optional[Union[Sequence[float], Mapping[str, float]]] = None,
+                 emotions: Sequence[str] = EMOTIONS):
+        """
+        Initialize a linear interaction model for ``EmotionEngine``
+
+        Each tick maps the intensity vector ``x`` to ``clip(M @ x, 0, 1)``
+        with ``M = I - diag(decay) + coupling``: every emotion loses the
+        ``decay`` fraction of itself and gains ``coupling[i][j]`` times the
+        intensity of emotion ``j``. Negative weights let emotions suppress
+        each other.
+
+        When ``M`` has no negative entries and no row sums above one, every
+        result of ``M @ x`` for ``x`` in [0, 1] is already in [0, 1], so
+        clipping never changes it and ``k`` ticks are exactly ``M**k @ x``.
+        Such a model is ``contractive``: the engine then computes the state
+        ``n`` ticks after its last input as ``M**n @ x0``, using powers
+        built by repeated squaring, whether it gets there one tick at a
+        time or in one jump, so both give bit-identical states. Any other
+        model is stepped tick by tick, which is equally exact.
+
+        Args:
+            coupling (Optional[Coupling]): Square matrix with one row per
+                affected emotion and one column per source emotion, or a
+                nested mapping of the non-zero weights; no coupling if None
+            decay (Optional[Union[Sequence[float], Mapping[str, float]]]):
+                Fraction of each emotion lost per tick, ``DECAY_RATES``
+                if None
+            emotions (Sequence[str]): Emotions in column order
+        """
+        self.emotions = list(emotions)
+        self.emotion_index = {emotion: column for column, emotion in enumerate(self.emotions)}
+        size = len(self.emotions)
+
+        self.decay = np.zeros(size)
+        if decay is None:
+            decay = DECAY_RATES
+        if isinstance(decay, Mapping):
+            for emotion, rate in decay.items():
+                self.decay[self._column(emotion)] = rate
+        else:
+            self.decay[:] = np.asarray(decay, dtype=np.float64)
+
+        self.coupling = np.zeros((size, size))
+        if isinstance(coupling, Mapping):
+            for target, sources in coupling.items():
+                for source, weight in sources.items():
+                    self.coupling[self._column(target), self._column(source)] = weight
+        elif coupling is not None:
+            self.coupling[:] = np.asarray(coupling, dtype=np.float64)
+
+        self.matrix = np.eye(size) - np.diag(self.decay) + self.coupling
+        self.contractive = bool((self.matrix >= 0).all()
+                                and (self.matrix.sum(axis=1) <= 1).all())
+        # Cached M**(2**i), extended on demand
+        self._squares: List[np.ndarray] = [self.matrix]
+
+    def _column(self, emotion: str) -> int:
+        """Get an emotion's column, rejecting unknown emotions"""
+        column = self.emotion_index.get(emotion)
+        if column is None:
+            raise ValueError(f"unknown emotion: {emotion}")
+        return column
+
+    def power(self, ticks: int) -> np.ndarray:
+        """
+        Get ``M**ticks`` by repeated squaring
+
+        The product always multiplies the cached squares for the set bits
+        of ``ticks`` in the same order, so a given power is always the
+        same array, bit for bit.
+
+        Args:
+            ticks (int): Non-negative exponent
+
+        Returns:
+            np.ndarray: The matrix power
+        """
+        result: Optional[np.ndarray] = None
+        bit = 0
+        while ticks:
+            if bit == len(self._squares):
+                previous = self._squares[-1]
+                self._squares.append(previous @ previous)
+            if ticks & 1:
+                square = self._squares[bit]
+                result = square if result is None else square @ result
+            ticks >>= 1
+            bit += 1
+        return np.eye(len(self.emotions)) if result is None else result
+
+    def step(self, state: np.ndarray) -> np.ndarray:
+        """Apply one tick: ``clip(M @ state, 0, 1)``"""
+        return np.clip(self.matrix @ state, 0.0, 1.0)
+
+    def propagate(self, state: np.ndarray, ticks: int) -> np.ndarray:
+        """Apply ``ticks`` ticks of a contractive model: ``clip(M**ticks @ state, 0, 1)``"""
+        return np.clip(self.power(ticks) @ state, 0.0, 1.0)
@@ -0,0 +1,166 @@
+"""
+MemoryIndex - Incrementally maintained indexes over stored memories
+"""
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# (intensity, row) pairs; rows break ties in storage order
+IndexKey = Tuple[float, int]
+
+class SortedIndex:
+    def __init__(self, load: int = 512):
+        """
+        Initialize a sorted index split into bounded chunks
+
+        Keys live in sorted chunks of at most ``2 * load`` entries with a
+        parallel list of chunk maxima, so an insert costs O(log n + load)
+        instead of shifting one list holding every key.
+
+        Args:
+            load (int): Target chunk size
+        """
+        self.load = load
+        self._chunks: List[List[IndexKey]] = []
+        self._maxes: List[IndexKey] = []
+        self._size = 0
+
+    @classmethod
+    def from_sorted(cls, keys: List[IndexKey], load: int = 512) -> 'SortedIndex':
+        """Build an index from keys that are already sorted"""
+        index = cls(load)
+        index._chunks = [keys[i:i + load] for i in range(0, len(keys), load)]
+        index._maxes = [chunk[-1] for chunk in index._chunks]
+        index._size = len(keys)
+        return index
+
+    def insert(self, key: IndexKey) -> None:
+        """Insert a key, keeping the index sorted"""
+        self._size += 1
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            return
+
+        position = bisect_left(self._maxes, key)
+        if position == len(self._chunks):
+            position -= 1
+            self._chunks[position].append(key)
+            self._maxes[position] = key
+        else:
+            insort(self._chunks[position], key)
+
+        chunk = self._chunks[position]
+        if len(chunk) > 2 * self.load:
+            self._chunks[position:position + 1] = [chunk[:self.load], chunk[self.load:]]
+            self._maxes[position:position + 1] = [chunk[self.load - 1], chunk[-1]]
+
+    def iter_above(self, threshold: float) -> Iterator[IndexKey]:
+        """
+        Iterate over the keys whose intensity exceeds a threshold
+
+        Args:
+            threshold (float): Exclusive lower bound
+
+        Returns:
+            Iterator[IndexKey]: Matching keys in ascending intensity order
+        """
+        bound = (threshold, math.inf)
+        position = bisect_right(self._maxes, bound)
+        if position == len(self._chunks):
+            return
+        chunk = self._chunks[position]
+        yield from chunk[bisect_right(chunk, bound):]
+        for chunk in self._chunks[position + 1:]:
+            yield from chunk
+
+    def count_above(self, threshold: float) -> int:
+        """Count the keys whose intensity exceeds a threshold"""
+        bound = (threshold, math.inf)
+        position = bisect_right(self._maxes, bound)
+        if position == len(self._chunks):
+            return 0
+        chunk = self._chunks[position]
+        return (len(chunk) - bisect_right(chunk, bound)
+                + sum(map(len, self._chunks[position + 1:])))
+
+    def __len__(self) -> int:
+        return self._size
+
+class MemoryIndex:
+    def __init__(self):
+        """
+        Initialize empty behavior and emotion-intensity indexes
+
+        Behavior frequencies are kept as running counters, so pattern
+        queries are O(1). Each emotion has a ``SortedIndex`` of
+        (intensity, row) pairs, so threshold queries with any cutoff cost
+        O(log n + k) to find the k matches.
+        """
+        self.behavior_counts: Dict[str, int] = {}
+        self.emotions: Dict[str, SortedIndex] = {}
+        self.size = 0
+
+    def add(self, memory: Dict[str, Any]) -> None:
+        """
+        Index the next stored memory
+
+        Args:
+            memory (Dict[str, Any]): Memory stored at row ``self.size``
+        """
+        row = self.size
+        behavior = memory['behavior']
+        self.behavior_counts[behavior] = self.behavior_counts.get(behavior, 0) + 1
+        for emotion, intensity in memory['emotional_state'].items():
+            index = self.emotions.get(emotion)
+            if index is None:
+                index = self.emotions[emotion] = SortedIndex()
+            index.insert((intensity, row))
+        self.size += 1
+
+    def rebuild(self, memories: Iterable[Dict[str, Any]]) -> None:
+        """
+        Rebuild every index from scratch
+
+        Args:
+            memories (Iterable[Dict[str, Any]]): Memories in storage order
+        """
+        self.clear()
+        keys: Dict[str, List[IndexKey]] = {}
+        for row, memory in enumerate(memories):
+            behavior = memory['behavior']
+            self.behavior_counts[behavior] = self.behavior_counts.get(behavior, 0) + 1
+            for emotion, intensity in memory['emotional_state'].items():
+                keys.setdefault(emotion, []).append((intensity, row))
+            self.size = row + 1
+        for emotion, emotion_keys in keys.items():
+            emotion_keys.sort()
+            self.emotions[emotion] = SortedIndex.from_sorted(emotion_keys)
+
+    def clear(self) -> None:
+        """Drop every indexed memory"""
+        self.behavior_counts = {}
+        self.emotions = {}
+        self.size = 0
+
+    def rows_above(self, emotion: str, threshold: float) -> List[int]:
+        """
+        Find the rows where an emotion exceeds a threshold
+
+        Args:
+            emotion (str): Emotion to test
+            threshold (float): Exclusive lower bound
+
+        Returns:
+            List[int]: Matching rows in storage order
+        """
+        index = self.emotions.get(emotion)
+        if index is None:
+            return []
+        return sorted(row for _, row in index.iter_above(threshold))
+
+    def count_above(self, emotion: str, threshold: float) -> int:
+        """Count the memories where an emotion exceeds a threshold"""
+        index = self.emotions.get(emotion)
+        return 0 if index is None else index.count_above(threshold)
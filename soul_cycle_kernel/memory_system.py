@@ -2,23 +2,153 @@
 MemorySystem - Handles persistent storage and retrieval of emotional states
 """
 
-import json
+import atexit
 import os
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
+
+from .memory_index import MemoryIndex
+from .rollups import MemoryRollups, RetentionPolicy
+from .storage import (DURABILITY_LEVELS, STREAM_BATCH, JSONLinesBackend, SegmentedBackend,
+                      StorageBackend, filter_memories)
 
 class MemorySystem:
-    def __init__(self, memory_file: str = "soul_memory.json"):
+    def __init__(self, memory_file: str = "soul_memory.json",
+                 write_behind: bool = False,
+                 flush_every: int = 100,
+                 flush_interval: float = 1.0,
+                 durability: str = 'flush',
+                 columnar: bool = False,
+                 indexed: bool = True,
+                 backend: Optional[StorageBackend] = None,
+                 checkpoint_every: Optional[int] = None,
+                 rollups: bool = False,
+                 retention: Optional[RetentionPolicy] = None,
+                 lazy: bool = False):
         """
         Initialize the memory system
         
+        By default memories are persisted to an append-only JSON Lines
+        journal next to ``memory_file`` (see ``JSONLinesBackend``). Another
+        ``StorageBackend`` can be passed instead; when it supports queries
+        (such as ``SQLiteBackend``), memories are not loaded into the
+        process, ``memories`` stays empty and every query is pushed down to
+        the backend.
+
+        With ``write_behind`` enabled, new memories are buffered and written
+        by a background thread once ``flush_every`` records are pending,
+        every ``flush_interval`` seconds, or on ``flush()``/``close()``.
+
+        With ``columnar`` enabled, memories are held in a
+        ``ColumnarMemoryStore`` and queries run as vectorized NumPy
+        operations; ``memories`` is then a list-of-dicts compatibility view.
+
+        With ``indexed`` enabled (the default), behavior counters and sorted
+        per-emotion intensity indexes are maintained as memories are stored,
+        making pattern queries O(1) and threshold queries O(log n + k).
+
+        With ``checkpoint_every`` set, memories go to a ``SegmentedBackend``
+        (unless another checkpointing backend is passed) and a checkpoint
+        is taken before the first store after that many records, so a
+        restart only replays the records stored since the last checkpoint.
+        The owner's state is included in each checkpoint through
+        ``state_provider``.
+
+        With ``rollups`` enabled, per-minute, per-hour and per-cycle
+        aggregates (see ``MemoryRollups``) are updated as memories are
+        stored and saved to ``<memory_file>.rollups.json``; behavior
+        patterns and summaries are then answered from the rollups, so they
+        cover memories dropped by ``retention`` and read a few hundred
+        buckets instead of every memory. A ``RetentionPolicy`` thins or
+        drops raw memories past its horizon on ``apply_retention``, which
+        also runs every ``retention.every`` stored records.
+
+        With ``lazy`` enabled, memories are never loaded into the process,
+        whatever the backend: construction only prepares the store for
+        appends (for a journal, by checking its last bytes), recent memories
+        are read from the end of the store and every query streams it.
+        ``iter_memories`` streams matching memories one at a time.
+
         Args:
             memory_file (str): Path to the memory storage file
+            write_behind (bool): Buffer writes and flush them in the background
+            flush_every (int): Pending record count that triggers a flush
+            flush_interval (float): Maximum seconds between background flushes
+            durability (str): 'none' leaves batches in the process buffer,
+                'flush' hands them to the OS, 'fsync' forces them to disk
+            columnar (bool): Keep memories in NumPy columns
+            indexed (bool): Maintain incremental query indexes
+            backend (Optional[StorageBackend]): Persistence backend, a
+                ``JSONLinesBackend`` for ``memory_file`` if None
+            checkpoint_every (Optional[int]): Records between automatic
+                checkpoints, none if None
+            rollups (bool): Maintain time-bucketed rollups
+            retention (Optional[RetentionPolicy]): Raw memory retention,
+                everything is kept if None
+            lazy (bool): Stream memories from the backend instead of
+                loading them at startup
         """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"durability must be one of {', '.join(DURABILITY_LEVELS)}"
+            )
         self.memory_file = memory_file
+        if backend is None:
+            if checkpoint_every is not None:
+                backend = SegmentedBackend(memory_file, durability)
+            else:
+                backend = JSONLinesBackend(memory_file, durability)
+        self.backend = backend
+        self.checkpoint_every = checkpoint_every if backend.supports_checkpoints else None
+        self.state_provider: Optional[Callable[[], Dict[str, Any]]] = None
+        self.listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._since_checkpoint = len(backend.recover()[1])
+        self.resident = not (self.backend.supports_queries or lazy)
+        self.write_behind = write_behind
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.columnar = columnar and self.resident
         self.memories: List[Dict[str, Any]] = []
         self._load_memories()
+        # Raw memories stored, kept up to date once known; None until a
+        # non-resident backend is first counted
+        self._stored: Optional[int] = len(self.memories) if self.resident else None
+        if self.columnar:
+            from .columnar_store import ColumnarMemoryStore
+
+            self.memories = ColumnarMemoryStore.from_memories(self.memories).view()
+        self.index: Optional[MemoryIndex] = None
+        if indexed and self.resident:
+            self.index = MemoryIndex()
+            self.index.rebuild(self.memories)
+
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_error: Optional[BaseException] = None
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+
+        self.retention = retention
+        self._since_retention = 0
+        self.rollups: Optional[MemoryRollups] = None
+        if rollups:
+            self.rollups = MemoryRollups(os.path.splitext(memory_file)[0] + '.rollups.json')
+            self.rollups.load()
+            self.rollups.add(self._memories_after(self.rollups.last))
+            self.add_listener(self.rollups.add)
+
+        if write_behind:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                name=f"MemorySystem-flush-{os.path.basename(memory_file)}",
+                daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.close)
 
     def store_emotional_state(self, 
                             emotional_state: Dict[str, float],
@@ -31,16 +161,31 @@ class MemorySystem:
             emotional_state (Dict[str, float]): Current emotional state
             behavior (str): Current emergent behavior
             trigger (Optional[str]): What triggered this emotional state
+
+        Raises:
+            ValueError: If the memory system is closed
         """
-        memory = {
-            'timestamp': datetime.now().isoformat(),
-            'emotional_state': emotional_state,
-            'behavior': behavior,
-            'trigger': trigger
-        }
+        self._store([self._make_memory(emotional_state, behavior, trigger)])
+
+    def store_emotional_states(self,
+                               records: Iterable[Tuple[Dict[str, float], str, Optional[str]]]
+                               ) -> None:
+        """
+        Store several emotional states with a single backend write
         
-        self.memories.append(memory)
-        self._save_memories()
+        Args:
+            records (Iterable[Tuple[Dict[str, float], str, Optional[str]]]):
+                (emotional state, behavior, trigger) in chronological order
+
+        Raises:
+            ValueError: If the memory system is closed
+        """
+        memories = [
+            self._make_memory(state, behavior, trigger)
+            for state, behavior, trigger in records
+        ]
+        if memories:
+            self._store(memories)
 
     def get_recent_memories(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -52,54 +197,444 @@ class MemorySystem:
         Returns:
             List[Dict[str, Any]]: List of recent memories
         """
+        if not self.resident:
+            self._flush_pending()
+            return self.backend.query(limit=limit, newest_first=True)[::-1]
         return self.memories[-limit:]
 
-    def get_emotional_history(self, emotion: str) -> List[Dict[str, Any]]:
+    def get_emotional_history(self, emotion: str,
+                              threshold: float = 0.5) -> List[Dict[str, Any]]:
         """
         Get history for a specific emotion
         
         Args:
             emotion (str): The emotion to track
+            threshold (float): Only memories where the emotion exceeds this
             
         Returns:
             List[Dict[str, Any]]: History of the specified emotion
         """
+        if not self.resident:
+            self._flush_pending()
+            return self.backend.query(emotion=emotion, above=threshold)
+        if self.index is not None:
+            rows = self.index.rows_above(emotion, threshold)
+            return [self.memories[row] for row in rows]
+        if self.columnar:
+            store = self.memories.store
+            return store.get_memories(store.rows_above(emotion, threshold))
         return [
             memory for memory in self.memories
-            if memory['emotional_state'].get(emotion, 0) > 0.5
+            if memory['emotional_state'].get(emotion, 0) > threshold
         ]
 
-    def get_behavior_patterns(self) -> Dict[str, int]:
+    def get_behavior_patterns(self, since: Optional[datetime] = None,
+                              until: Optional[datetime] = None) -> Dict[str, int]:
         """
         Analyze behavior patterns in memories
         
+        Args:
+            since (Optional[datetime]): Inclusive lower time bound
+            until (Optional[datetime]): Exclusive upper time bound
+            
         Returns:
-            Dict[str, int]: Frequency of each behavior
+            Dict[str, int]: Frequency of each behavior; from the rollups,
+            to the minute, when they are enabled
         """
+        if self.rollups is not None:
+            return self.rollups.summarize(since, until)['behaviors']
+        if since is not None or until is not None:
+            patterns: Dict[str, int] = {}
+            for memory in self.query_memories(since, until):
+                patterns[memory['behavior']] = patterns.get(memory['behavior'], 0) + 1
+            return patterns
+        if not self.resident:
+            self._flush_pending()
+            return self.backend.behavior_counts()
+        if self.index is not None:
+            return dict(self.index.behavior_counts)
+        if self.columnar:
+            return self.memories.store.behavior_counts()
         patterns = {}
         for memory in self.memories:
             behavior = memory['behavior']
             patterns[behavior] = patterns.get(behavior, 0) + 1
         return patterns
 
+    def summarize_memories(self, since: Optional[datetime] = None,
+                           until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Aggregate the memories stored within a time window
+
+        Args:
+            since (Optional[datetime]): Inclusive lower bound
+            until (Optional[datetime]): Exclusive upper bound
+
+        Returns:
+            Dict[str, Any]: Memory count, per-emotion min/mean/max and
+            behavior counts; from the rollups, to the minute, when they
+            are enabled
+        """
+        if self.rollups is not None:
+            return self.rollups.summarize(since, until)
+        if not self.resident:
+            self._flush_pending()
+            return self.backend.summarize(since, until)
+        if self.columnar:
+            store = self.memories.store
+        else:
+            from .columnar_store import ColumnarMemoryStore
+
+            store = ColumnarMemoryStore.from_memories(self.memories)
+        return store.aggregate(since, until)
+
+    def query_memories(self, since: Optional[datetime] = None,
+                       until: Optional[datetime] = None,
+                       behavior: Optional[str] = None,
+                       emotion: Optional[str] = None,
+                       above: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Find memories by time range, behavior and emotion threshold
+
+        Args:
+            since (Optional[datetime]): Inclusive lower time bound
+            until (Optional[datetime]): Exclusive upper time bound
+            behavior (Optional[str]): Only memories with this behavior
+            emotion (Optional[str]): Emotion tested against ``above``
+            above (Optional[float]): Only memories where ``emotion`` exceeds this
+
+        Returns:
+            List[Dict[str, Any]]: Matching memories in storage order
+        """
+        if not self.resident:
+            self._flush_pending()
+            return self.backend.query(since, until, behavior, emotion, above)
+        candidates = self.memories
+        if emotion is not None and above is not None and self.index is not None:
+            candidates = [self.memories[row]
+                          for row in self.index.rows_above(emotion, above)]
+        return filter_memories(candidates, since, until, behavior, emotion, above)
+
+    def iter_memories(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      behavior: Optional[str] = None,
+                      min_intensity: Optional[float] = None,
+                      emotion: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream memories by time range, behavior and intensity
+
+        Memories are read incrementally from the backend (or the in-process
+        list), so a pass over a history larger than RAM holds one batch at
+        a time.
+
+        Args:
+            since (Optional[datetime]): Inclusive lower time bound
+            until (Optional[datetime]): Exclusive upper time bound
+            behavior (Optional[str]): Only memories with this behavior
+            min_intensity (Optional[float]): Only memories where ``emotion``,
+                or any emotion if None, is at least this intense
+            emotion (Optional[str]): Emotion tested against ``min_intensity``
+
+        Returns:
+            Iterator[Dict[str, Any]]: Matching memories in storage order
+        """
+        if self.resident:
+            memories = self._iter_resident(since, until, behavior)
+        else:
+            self._flush_pending()
+            memories = self.backend.iter_memories(since, until, behavior)
+        for memory in memories:
+            if min_intensity is not None:
+                state = memory['emotional_state']
+                if emotion is not None:
+                    intensity = state.get(emotion, 0)
+                else:
+                    intensity = max(state.values(), default=0)
+                if intensity < min_intensity:
+                    continue
+            yield memory
+
     def clear_memories(self) -> None:
         """Clear all stored memories"""
-        self.memories = []
-        self._save_memories()
+        with self._io_lock:
+            with self._lock:
+                self._pending = []
+            if self.columnar:
+                self.memories.store.clear()
+            else:
+                self.memories = []
+            if self.index is not None:
+                self.index.clear()
+            self.backend.rewrite([])
+            self._stored = 0
+            self._since_checkpoint = 0
+            if self.rollups is not None:
+                self.rollups.clear()
+                self.rollups.save()
+
+    def get_rollups(self, resolution: str = 'hour', since: Optional[datetime] = None,
+                    until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get rollup rows, see ``MemoryRollups.get_buckets``
+
+        Args:
+            resolution (str): 'minute', 'hour' or 'cycle'
+            since (Optional[datetime]): Only buckets with memories at or after this
+            until (Optional[datetime]): Only buckets with memories before this
+
+        Returns:
+            List[Dict[str, Any]]: Rollup rows, oldest first
+        """
+        if self.rollups is None:
+            raise ValueError("rollups are not enabled for this memory system")
+        return self.rollups.get_buckets(resolution, since, until)
+
+    def drop_memories(self, before: Optional[datetime] = None) -> int:
+        """
+        Drop raw memories stored before a moment, keeping the rollups
+
+        Args:
+            before (Optional[datetime]): Exclusive bound, every memory if None
+
+        Returns:
+            int: Number of memories dropped
+        """
+        self.flush()
+        total = self._count()
+        kept = [] if before is None else self.query_memories(since=before)
+        if self.rollups is not None:
+            self.rollups.save()
+        self._replace(kept)
+        return total - len(kept)
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Thin raw memories and rollups past the retention horizons
+
+        The rollups are saved before any raw memory is dropped, so they
+        never need dropped memories to be rebuilt.
+
+        Args:
+            now (Optional[datetime]): Current time, ``datetime.now()`` if None
+
+        Returns:
+            Dict[str, int]: Raw memories ``dropped`` and ``kept``, and
+            rollup ``buckets_pruned``
+        """
+        if self.retention is None:
+            raise ValueError("no retention policy is set for this memory system")
+        now = now or datetime.now()
+        horizon = now - self.retention.raw_horizon
+        self.flush()
+        old = self.query_memories(until=horizon)
+        pruned = 0
+        if self.rollups is not None:
+            pruned = self.rollups.prune(now, self.retention.rollup_horizons)
+            self.rollups.save()
+        thinned = self.retention.thin(old)
+        if len(thinned) < len(old):
+            self._replace(thinned + self.query_memories(since=horizon))
+        self._since_retention = 0
+        return {
+            'dropped': len(old) - len(thinned),
+            'kept': self._count(),
+            'buckets_pruned': pruned
+        }
+
+    def add_listener(self, listener: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """
+        Call ``listener`` with every batch of newly stored memories
+
+        Listeners run in the storing thread after the batch is accepted,
+        so they can maintain running aggregates without rescanning storage.
+
+        Args:
+            listener (Callable[[List[Dict[str, Any]]], None]): Receives
+                each batch of memories in storage order
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Stop calling a listener added with ``add_listener``"""
+        self.listeners.remove(listener)
+
+    @property
+    def supports_checkpoints(self) -> bool:
+        """Whether the backend can record checkpoints"""
+        return self.backend.supports_checkpoints
+
+    def checkpoint(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Flush buffered memories and record a checkpoint in the backend
+
+        Args:
+            state (Optional[Dict[str, Any]]): Owner state saved with the
+                checkpoint, ``state_provider()`` if None
+        """
+        if state is None and self.state_provider is not None:
+            state = self.state_provider()
+        self.flush()
+        with self._io_lock:
+            self.backend.checkpoint(state)
+            self._since_checkpoint = 0
+
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get the last checkpointed state and the memories stored after it
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]: Saved
+            state (None without a checkpoint) and the memories to replay
+        """
+        return self.backend.recover()
+
+    def flush(self) -> None:
+        """
+        Write all buffered memories to the backend
+
+        Raises:
+            Exception: The error of a failed background flush, if any
+        """
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                error, self._flush_error = self._flush_error, None
+            if batch:
+                self.backend.append(batch)
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush buffered memories, stop the background flusher and close the backend"""
+        if self._closed:
+            return
+        if self.rollups is not None:
+            self.rollups.save()
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+            atexit.unregister(self.close)
+        try:
+            self.flush()
+        finally:
+            with self._io_lock:
+                self.backend.close()
+
+    def __enter__(self) -> 'MemorySystem':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _flush_loop(self) -> None:
+        """Background loop flushing pending memories on count or interval"""
+        while True:
+            with self._lock:
+                if not self._closed and len(self._pending) < self.flush_every:
+                    self._wakeup.wait(self.flush_interval)
+                closed = self._closed
+            if closed:
+                return
+            with self._io_lock:
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                if not batch:
+                    continue
+                try:
+                    self.backend.append(batch)
+                except Exception as error:
+                    with self._lock:
+                        self._pending = batch + self._pending
+                        self._flush_error = error
+
+    @staticmethod
+    def _make_memory(emotional_state: Dict[str, float], behavior: str,
+                     trigger: Optional[str]) -> Dict[str, Any]:
+        """Build a timestamped memory record"""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'emotional_state': emotional_state,
+            'behavior': behavior,
+            'trigger': trigger
+        }
+
+    def _store(self, memories: List[Dict[str, Any]]) -> None:
+        """Add new memories to the in-process views and persist them"""
+        if self._closed:
+            raise ValueError("cannot store memories in a closed memory system")
+        if self.checkpoint_every and self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+        self._since_checkpoint += len(memories)
+        if (self.retention is not None and self.retention.every
+                and self._since_retention >= self.retention.every):
+            self.apply_retention()
+        self._since_retention += len(memories)
+        if self._stored is not None:
+            self._stored += len(memories)
+        if self.resident:
+            self.memories.extend(memories)
+        if self.index is not None:
+            for memory in memories:
+                self.index.add(memory)
+        if self.write_behind:
+            with self._lock:
+                self._pending.extend(memories)
+                if len(self._pending) >= self.flush_every:
+                    self._wakeup.notify()
+        else:
+            self.backend.append(memories)
+        for listener in self.listeners:
+            listener(memories)
+
+    def _count(self) -> int:
+        """Count the raw memories currently stored, scanning the backend at most once"""
+        if self._stored is None:
+            self._flush_pending()
+            self._stored = sum(self.backend.behavior_counts().values())
+        return self._stored
+
+    def _memories_after(self, timestamp: Optional[str]) -> List[Dict[str, Any]]:
+        """Get the memories stored after a timestamp, every memory if None"""
+        if timestamp is None:
+            return self.query_memories()
+        moment = datetime.fromisoformat(timestamp)
+        return [memory for memory in self.query_memories(since=moment)
+                if datetime.fromisoformat(memory['timestamp']) > moment]
+
+    def _replace(self, memories: List[Dict[str, Any]]) -> None:
+        """Replace the stored raw memories, keeping buffered new ones"""
+        with self._io_lock:
+            if self.resident:
+                if self.columnar:
+                    self.memories.store.clear()
+                    self.memories.store.extend(memories)
+                else:
+                    self.memories = list(memories)
+                if self.index is not None:
+                    self.index.rebuild(self.memories)
+            self.backend.rewrite(memories)
+            self._stored = len(memories)
+            self._since_checkpoint = len(memories)
+
+    def _iter_resident(self, since: Optional[datetime], until: Optional[datetime],
+                       behavior: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Stream the in-process memories stored so far, a batch at a time"""
+        memories = self.memories
+        for start in range(0, len(memories), STREAM_BATCH):
+            yield from filter_memories(memories[start:start + STREAM_BATCH],
+                                       since, until, behavior)
+
+    def _flush_pending(self) -> None:
+        """Flush buffered memories before a query reads from the backend"""
+        if self._pending:
+            self.flush()
 
     def _load_memories(self) -> None:
-        """Load memories from storage file"""
-        if os.path.exists(self.memory_file):
-            try:
-                with open(self.memory_file, 'r') as f:
-                    self.memories = json.load(f)
-            except json.JSONDecodeError:
-                self.memories = []
+        """Load memories from the backend when they are held in process"""
+        if self.resident:
+            self.memories = self.backend.load()
         else:
+            self.backend.prepare()
             self.memories = []
-
-    def _save_memories(self) -> None:
-        """Save memories to storage file"""
-        Path(self.memory_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memories, f, indent=2)
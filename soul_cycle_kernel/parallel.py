@@ -0,0 +1,183 @@
+"""
+ShardedSimulation - Advance a soul population across worker processes
+"""
+
+import os
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .emotion_engine import EmotionEngine
+from .behavior import BehaviorRule
+from .population import SoulPopulation
+
+# Arrays returned by every shard, concatenated along the soul axis
+RESULT_AXES = {
+    'states': 0,
+    'behaviors': 0,
+    'behavior_counts': 0,
+    'history_states': 1,
+    'history_behaviors': 1
+}
+
+def _advance_shard(states: np.ndarray, emotions: Sequence[str],
+                   decay_rates: np.ndarray, thresholds: Dict[str, float],
+                   rules: Sequence[BehaviorRule], ticks: int,
+                   record: bool) -> Dict[str, np.ndarray]:
+    """
+    Advance one shard of souls in a worker process
+
+    Args:
+        states (np.ndarray): Shard states, one row per soul
+        emotions (Sequence[str]): Emotion names in column order
+        decay_rates (np.ndarray): Decay rate per column
+        thresholds (Dict[str, float]): Behavior thresholds
+        rules (Sequence[BehaviorRule]): Behavior rules
+        ticks (int): Number of time steps
+        record (bool): Keep every step's states and behaviors
+
+    Returns:
+        Dict[str, np.ndarray]: Shard results keyed as in ``RESULT_AXES``
+    """
+    template = EmotionEngine(history_capacity=1, behavior_rules=rules)
+    template.current_state = dict.fromkeys(emotions, 0.0)
+    template.decay_rates = dict(zip(emotions, decay_rates.tolist()))
+    template.thresholds = dict(thresholds)
+
+    population = SoulPopulation(len(states), template)
+    population.states = np.array(states, dtype=np.float64)
+    counts = np.zeros((len(states), len(population.classifier.behaviors)), dtype=np.int64)
+    rows = np.arange(len(states))
+
+    history_states = np.zeros((ticks if record else 0,) + states.shape, dtype=np.float64)
+    history_behaviors = np.zeros((ticks if record else 0, len(states)), dtype=np.uint8)
+    behaviors = population.get_emergent_behaviors()
+    for tick in range(ticks):
+        population.decay_emotions()
+        behaviors = population.get_emergent_behaviors()
+        counts[rows, behaviors] += 1
+        if record:
+            history_states[tick] = population.states
+            history_behaviors[tick] = behaviors
+
+    return {
+        'states': population.states,
+        'behaviors': behaviors,
+        'behavior_counts': counts,
+        'history_states': history_states,
+        'history_behaviors': history_behaviors
+    }
+
+class ShardedSimulation:
+    def __init__(self, workers: Optional[int] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Initialize a runner that splits a population into per-process shards
+
+        Each shard is shipped to a worker as a contiguous float64 state
+        block plus the decay rates and thresholds, advanced with the same
+        vectorized arithmetic as ``SoulPopulation``, and returned as arrays.
+        Souls are independent, so the merged result is bit-identical to
+        advancing the whole population in one process.
+
+        The worker pool is created on first use and reused across runs;
+        call ``close`` (or use the runner as a context manager) to stop it.
+
+        Args:
+            workers (Optional[int]): Worker processes, CPU count if None;
+                0 runs every shard in the calling process
+            executor (Optional[Executor]): Existing executor to submit to
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def run(self, population: SoulPopulation, ticks: int,
+            shards: Optional[int] = None, record: bool = False) -> Dict[str, Any]:
+        """
+        Advance every soul by a number of time steps, updating ``population``
+
+        Args:
+            population (SoulPopulation): Souls to advance in place
+            ticks (int): Number of time steps
+            shards (Optional[int]): Number of shards, one per worker if None
+            record (bool): Also return every step's states and behaviors,
+                the memory segments a serial run would store
+
+        Returns:
+            Dict[str, Any]: Final ``states`` and ``behaviors`` codes,
+            per-soul ``behavior_counts`` over the run, total ``patterns``
+            by behavior name and, when recording, ``history_states``
+            (ticks x souls x emotions) and ``history_behaviors``
+        """
+        ticks = max(0, ticks)
+        bounds = self._shard_bounds(len(population), shards)
+        args = (population.emotions, population.decay_rates,
+                population.thresholds, population.behavior_rules, ticks, record)
+
+        if self.workers == 0 or len(bounds) <= 1:
+            parts = [_advance_shard(population.states[start:stop], *args)
+                     for start, stop in bounds]
+        else:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_advance_shard,
+                                np.ascontiguousarray(population.states[start:stop]),
+                                *args)
+                for start, stop in bounds
+            ]
+            parts = [future.result() for future in futures]
+
+        behaviors = population.classifier.behaviors
+        result = self._merge(parts, len(population.emotions), len(behaviors),
+                             ticks if record else 0)
+        population.states = result['states']
+        totals = result['behavior_counts'].sum(axis=0)
+        result['patterns'] = {
+            behaviors[code]: int(count) for code, count in enumerate(totals) if count
+        }
+        if not record:
+            del result['history_states'], result['history_behaviors']
+        return result
+
+    def close(self) -> None:
+        """Shut down the worker pool if this runner created it"""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> 'ShardedSimulation':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _get_executor(self) -> Executor:
+        """Get the executor, starting the worker pool if needed"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _shard_bounds(self, size: int, shards: Optional[int]) -> List[Tuple[int, int]]:
+        """Split ``size`` souls into near-equal contiguous row ranges"""
+        count = shards or max(1, self.workers)
+        count = max(1, min(count, size))
+        edges = np.linspace(0, size, count + 1).astype(np.int64).tolist()
+        return list(zip(edges[:-1], edges[1:]))
+
+    @staticmethod
+    def _merge(parts: List[Dict[str, np.ndarray]], emotions: int, behaviors: int,
+               ticks: int) -> Dict[str, np.ndarray]:
+        """Concatenate shard results in soul order"""
+        if not parts:
+            return {
+                'states': np.zeros((0, emotions)),
+                'behaviors': np.zeros(0, dtype=np.uint8),
+                'behavior_counts': np.zeros((0, behaviors), dtype=np.int64),
+                'history_states': np.zeros((ticks, 0, emotions)),
+                'history_behaviors': np.zeros((ticks, 0), dtype=np.uint8)
+            }
+        return {
+            name: np.concatenate([part[name] for part in parts], axis=axis)
+            for name, axis in RESULT_AXES.items()
+        }
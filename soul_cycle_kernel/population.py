@@ -0,0 +1,181 @@
+"""
+SoulPopulation - Vectorized emotional state for many souls at once
+"""
+
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .emotion_engine import EmotionEngine
+
+SoulSelector = Union[None, int, slice, Sequence[int], np.ndarray]
+
+class SoulPopulation:
+    def __init__(self, size: int, engine: Optional[EmotionEngine] = None):
+        """
+        Initialize a population of souls sharing one emotion model
+
+        Every soul's state lives in one row of an N x 7 float64 array, and
+        each operation applies the same arithmetic as ``EmotionEngine`` to
+        all selected rows at once, so results are bit-identical to running
+        N independent engines. Per-soul history is not recorded. Behaviors
+        are classified with the template's compiled ``BehaviorClassifier``,
+        so custom behavior rules carry over.
+
+        Args:
+            size (int): Number of souls in the population
+            engine (Optional[EmotionEngine]): Template providing emotions,
+                decay rates, thresholds, behavior rules and the initial state
+
+        Raises:
+            ValueError: If the template uses an interaction model
+        """
+        template = engine or EmotionEngine()
+        if template.interactions is not None:
+            raise ValueError("populations support independent decay only, not interactions")
+        self.emotions: List[str] = list(template.current_state)
+        self.emotion_index = {
+            emotion: column for column, emotion in enumerate(self.emotions)
+        }
+        self.decay_rates = np.array(
+            [template.decay_rates[emotion] for emotion in self.emotions],
+            dtype=np.float64
+        )
+        self.thresholds = dict(template.thresholds)
+        self.behavior_rules = template.behavior_rules
+        self.classifier = template.get_classifier()
+        self.states = np.tile(
+            np.array([template.current_state[e] for e in self.emotions],
+                     dtype=np.float64),
+            (size, 1)
+        )
+
+    @classmethod
+    def from_engines(cls, engines: Sequence[EmotionEngine]) -> 'SoulPopulation':
+        """
+        Build a population from the current state of existing engines
+
+        Args:
+            engines (Sequence[EmotionEngine]): Engines sharing one emotion model
+
+        Returns:
+            SoulPopulation: Population with one row per engine
+        """
+        population = cls(len(engines), engines[0] if engines else None)
+        for row, engine in enumerate(engines):
+            population.states[row] = [
+                engine.current_state[emotion] for emotion in population.emotions
+            ]
+        return population
+
+    def __len__(self) -> int:
+        return self.states.shape[0]
+
+    def update_emotion(self, emotion: str, intensity: Union[float, np.ndarray],
+                       souls: SoulSelector = None) -> None:
+        """
+        Update one emotion for the selected souls
+
+        Args:
+            emotion (str): The emotion to update; unknown emotions are ignored
+            intensity (Union[float, np.ndarray]): Intensity per selected soul
+            souls (SoulSelector): Rows to update, all souls if None
+        """
+        column = self.emotion_index.get(emotion)
+        if column is None:
+            return
+        rows = slice(None) if souls is None else souls
+        self.states[rows, column] = np.clip(
+            self.states[rows, column] + intensity,
+            0.0,
+            1.0
+        )
+
+    def update_emotions(self, souls: Sequence[int], emotions: Iterable[str],
+                        intensities: Sequence[float]) -> None:
+        """
+        Apply a batch of (soul, emotion, intensity) updates in order
+
+        Updates hitting the same soul are applied in successive rounds so
+        that clipping happens after each one, exactly as with sequential
+        ``EmotionEngine.update_emotion`` calls.
+
+        Args:
+            souls (Sequence[int]): Soul row of each update
+            emotions (Iterable[str]): Emotion of each update
+            intensities (Sequence[float]): Intensity of each update
+        """
+        columns = np.array(
+            [self.emotion_index.get(emotion, -1) for emotion in emotions],
+            dtype=np.int64
+        )
+        rows = np.asarray(souls, dtype=np.int64)
+        values = np.asarray(intensities, dtype=np.float64)
+        known = columns >= 0
+        rows, columns, values = rows[known], columns[known], values[known]
+        if rows.size == 0:
+            return
+
+        # Rank of each update among the updates of the same soul
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        starts = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+        group_start = np.repeat(starts, np.diff(np.r_[starts, rows.size]))
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(rows.size) - group_start
+
+        for rank in range(int(ranks.max()) + 1):
+            selected = ranks == rank
+            r, c = rows[selected], columns[selected]
+            self.states[r, c] = np.clip(self.states[r, c] + values[selected],
+                                        0.0, 1.0)
+
+    def decay_emotions(self, souls: SoulSelector = None) -> None:
+        """
+        Apply natural decay to all emotions of the selected souls
+
+        Args:
+            souls (SoulSelector): Rows to decay, all souls if None
+        """
+        rows = slice(None) if souls is None else souls
+        decayed = self.states[rows] - self.decay_rates
+        self.states[rows] = np.where(decayed > 0.0, decayed, 0.0)
+
+    def get_dominant_emotions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get every soul's dominant emotion
+
+        Ties resolve to the first emotion in engine order, like ``max``
+        over the engine's state dict.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Emotion columns and intensities
+        """
+        columns = np.argmax(self.states, axis=1)
+        intensities = self.states[np.arange(len(self)), columns]
+        return columns, intensities
+
+    def get_emergent_behaviors(self) -> np.ndarray:
+        """
+        Classify every soul's emergent behavior
+
+        Returns:
+            np.ndarray: uint8 codes indexing into ``classifier.behaviors``,
+            which is ``behavior.BEHAVIORS`` for the default rules
+        """
+        return self.classifier.classify_many(self.states)
+
+    def get_behavior_names(self) -> List[str]:
+        """Get every soul's emergent behavior as a string"""
+        return self.classifier.names(self.get_emergent_behaviors())
+
+    def get_emotional_state(self, soul: int) -> Dict[str, float]:
+        """
+        Get one soul's emotional state
+
+        Args:
+            soul (int): Soul row
+
+        Returns:
+            Dict[str, float]: Emotional state keyed by emotion
+        """
+        return dict(zip(self.emotions, self.states[soul].tolist()))
@@ -0,0 +1,280 @@
+"""
+SoulRegistry - Bounded working set of souls hydrated from per-soul storage
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .clock import SleepClock, VirtualClock
+from .memory_system import MemorySystem
+from .simulation_engine import SoulAI
+
+# Soul ids double as file names, so keep them to a safe alphabet
+SOUL_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+class SoulRegistry:
+    def __init__(self, data_dir: str = 'souls', capacity: int = 1024,
+                 clock_factory: Callable[[], SleepClock] = VirtualClock,
+                 memory_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a registry of souls keyed by id
+
+        Each soul owns ``<id>.json`` for its memories and ``<id>.state.json``
+        for its engine state. Souls are loaded on first access and kept in
+        an LRU working set of at most ``capacity`` souls; the least recently
+        used soul is flushed to disk and dropped when the set is full. Souls
+        checked out with ``use`` are pinned and never evicted or closed
+        mid-operation, so the working set may briefly exceed ``capacity``.
+
+        Loading and flushing happen outside the registry lock, so one
+        soul's disk I/O never stalls lookups of others. While a soul is
+        being loaded or evicted, ``get`` calls for it wait for that to
+        finish, so they never read files that are still being written.
+
+        Args:
+            data_dir (str): Directory holding the per-soul files
+            capacity (int): Maximum number of resident souls
+            clock_factory (Callable[[], SleepClock]): Builds each soul's clock
+            memory_options (Optional[Dict[str, Any]]): Extra ``MemorySystem``
+                arguments, e.g. ``{'write_behind': True}``; write-behind
+                runs one flusher thread per resident soul, so keep
+                ``capacity`` small enough for that many threads
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.data_dir = data_dir
+        self.capacity = capacity
+        self.clock_factory = clock_factory
+        self.memory_options = dict(memory_options or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._souls: 'OrderedDict[str, SoulAI]' = OrderedDict()
+        self._pins: Dict[str, int] = {}
+        # Souls being loaded or evicted, set once their files are settled
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.RLock()
+        # Notified whenever a soul's last pin is released
+        self._unpinned = threading.Condition(self._lock)
+        os.makedirs(data_dir, exist_ok=True)
+
+    def get(self, soul_id: str) -> SoulAI:
+        """
+        Get a soul, loading it from disk if it is not resident
+
+        Args:
+            soul_id (str): Soul identifier
+
+        Returns:
+            SoulAI: The resident soul
+        """
+        while True:
+            with self._lock:
+                soul = self._souls.get(soul_id)
+                if soul is not None:
+                    self.hits += 1
+                    self._souls.move_to_end(soul_id)
+                    return soul
+                pending = self._pending.get(soul_id)
+                if pending is None:
+                    self.misses += 1
+                    loaded = self._pending[soul_id] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            soul = self._hydrate(soul_id)
+        except Exception:
+            with self._lock:
+                del self._pending[soul_id]
+            loaded.set()
+            raise
+        with self._lock:
+            self._souls[soul_id] = soul
+            del self._pending[soul_id]
+            victims = self._take_overflow()
+        loaded.set()
+        self._retire(victims)
+        return soul
+
+    @contextmanager
+    def use(self, soul_id: str) -> Iterator[SoulAI]:
+        """
+        Check out a soul, pinning it in memory until the block exits
+
+        Args:
+            soul_id (str): Soul identifier
+
+        Returns:
+            Iterator[SoulAI]: Context manager yielding the soul
+        """
+        with self._lock:
+            self._pins[soul_id] = self._pins.get(soul_id, 0) + 1
+        try:
+            soul = self.get(soul_id)
+        except Exception:
+            with self._lock:
+                self._unpin(soul_id)
+            raise
+        try:
+            yield soul
+        finally:
+            with self._lock:
+                self._unpin(soul_id)
+                victims = self._take_overflow()
+            self._retire(victims)
+
+    def evict(self, soul_id: str) -> bool:
+        """
+        Flush a resident soul to disk and drop it from memory
+
+        Souls checked out with ``use`` are left alone.
+
+        Args:
+            soul_id (str): Soul identifier
+
+        Returns:
+            bool: Whether the soul was resident, unpinned and evicted
+        """
+        with self._lock:
+            if soul_id not in self._souls or soul_id in self._pins:
+                return False
+            self.evictions += 1
+            victims = [self._take(soul_id)]
+        self._retire(victims)
+        return True
+
+    def flush(self) -> None:
+        """Persist every resident soul without evicting it"""
+        with self._lock:
+            souls = list(self._souls.items())
+        for soul_id, soul in souls:
+            soul.memory_system.flush()
+            self._persist(soul_id, soul)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Persist and release every resident soul
+
+        Souls checked out with ``use`` are closed only once every holder
+        has released them, so ``close`` must not be called from inside a
+        ``use`` block.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait for pinned
+                souls to be released, forever if None
+
+        Raises:
+            RuntimeError: If souls are still pinned after ``timeout``
+        """
+        with self._lock:
+            if not self._unpinned.wait_for(lambda: not self._pins, timeout):
+                raise RuntimeError(
+                    f"souls still in use: {', '.join(sorted(self._pins))}"
+                )
+            victims = [self._take(soul_id) for soul_id in list(self._souls)]
+            pending = list(self._pending.values())
+        self._retire(victims)
+        for settled in pending:
+            settled.wait()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dict[str, float]: Hits, misses, evictions, resident souls,
+            capacity and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'resident': len(self._souls),
+                'capacity': self.capacity,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __contains__(self, soul_id: object) -> bool:
+        with self._lock:
+            return soul_id in self._souls
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._souls)
+
+    def __enter__(self) -> 'SoulRegistry':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _paths(self, soul_id: str) -> Tuple[str, str]:
+        """Get the memory and state file paths of a soul"""
+        if not isinstance(soul_id, str) or not SOUL_ID_PATTERN.match(soul_id):
+            raise ValueError("soul id must be 1-64 letters, digits, '_' or '-'")
+        base = os.path.join(self.data_dir, soul_id)
+        return base + '.json', base + '.state.json'
+
+    def _hydrate(self, soul_id: str) -> SoulAI:
+        """Build a soul from its files on disk"""
+        memory_file, state_file = self._paths(soul_id)
+        memory = MemorySystem(memory_file, **self.memory_options)
+        soul = SoulAI(clock=self.clock_factory(), memory_system=memory)
+        if os.path.exists(state_file):
+            with open(state_file, 'r') as f:
+                soul.restore_snapshot(json.load(f))
+        return soul
+
+    def _persist(self, soul_id: str, soul: SoulAI) -> None:
+        """Atomically write a soul's engine state"""
+        _, state_file = self._paths(soul_id)
+        temp_file = state_file + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(soul.get_snapshot(), f)
+        os.replace(temp_file, state_file)
+
+    def _unpin(self, soul_id: str) -> None:
+        """Release one pin on a soul"""
+        pins = self._pins[soul_id] - 1
+        if pins:
+            self._pins[soul_id] = pins
+        else:
+            del self._pins[soul_id]
+            self._unpinned.notify_all()
+
+    def _take(self, soul_id: str) -> Tuple[str, SoulAI, threading.Event]:
+        """Drop a resident soul and mark it pending until ``_retire`` runs, holding the lock"""
+        soul = self._souls.pop(soul_id)
+        evicted = self._pending[soul_id] = threading.Event()
+        return soul_id, soul, evicted
+
+    def _take_overflow(self) -> List[Tuple[str, SoulAI, threading.Event]]:
+        """Take the least recently used unpinned souls beyond capacity, holding the lock"""
+        overflow = len(self._souls) - self.capacity
+        if overflow <= 0:
+            return []
+        victims = list(islice(
+            (soul_id for soul_id in self._souls if soul_id not in self._pins),
+            overflow))
+        self.evictions += len(victims)
+        return [self._take(soul_id) for soul_id in victims]
+
+    def _retire(self, victims: List[Tuple[str, SoulAI, threading.Event]]) -> None:
+        """Persist and close taken souls, then release anyone waiting for them"""
+        for soul_id, soul, evicted in victims:
+            try:
+                self._persist(soul_id, soul)
+                soul.memory_system.close()
+            finally:
+                with self._lock:
+                    del self._pending[soul_id]
+                evicted.set()
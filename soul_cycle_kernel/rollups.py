@@ -0,0 +1,311 @@
+"""
+Rollups - Time-bucketed memory aggregates and raw-record retention
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .emotion_engine import EMOTIONS
+from .storage import ensure_parent_dir
+
+# Time resolutions -> bucket width; 'cycle' buckets are keyed by life instead
+RESOLUTIONS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1)
+}
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """
+    Get the start of the time bucket holding a timestamp
+
+    Args:
+        timestamp (datetime): Moment to place
+        resolution (str): 'minute' or 'hour'
+
+    Returns:
+        datetime: Start of the bucket
+    """
+    if resolution == 'minute':
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+class RetentionPolicy:
+    def __init__(self, raw_horizon: timedelta = timedelta(days=1),
+                 downsample: Optional[str] = 'minute',
+                 rollup_horizons: Optional[Dict[str, timedelta]] = None,
+                 every: Optional[int] = 10000):
+        """
+        Describe how long raw memories and fine rollups are kept
+
+        Raw memories older than ``raw_horizon`` are either thinned to the
+        last memory of each ``downsample`` bucket or, if ``downsample`` is
+        None, dropped. Rollup buckets older than their resolution's horizon
+        in ``rollup_horizons`` are dropped; coarser rollups still cover them.
+
+        Args:
+            raw_horizon (timedelta): Age beyond which raw memories are thinned
+            downsample (Optional[str]): 'minute' or 'hour' to keep one raw
+                memory per bucket, None to drop old raw memories
+            rollup_horizons (Optional[Dict[str, timedelta]]): Retention per
+                rollup resolution, seven days of minute buckets if None
+            every (Optional[int]): Stored records between automatic
+                retention passes, only explicit ``apply_retention`` if None
+        """
+        if downsample is not None and downsample not in RESOLUTIONS:
+            raise ValueError(f"downsample must be one of {', '.join(RESOLUTIONS)} or None")
+        self.raw_horizon = raw_horizon
+        self.downsample = downsample
+        self.rollup_horizons = ({'minute': timedelta(days=7)} if rollup_horizons is None
+                                else dict(rollup_horizons))
+        self.every = every
+
+    def thin(self, memories: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Downsample raw memories past the horizon
+
+        Args:
+            memories (Iterable[Dict[str, Any]]): Old memories in storage order
+
+        Returns:
+            List[Dict[str, Any]]: The last memory of each downsample bucket,
+            or nothing when old memories are dropped
+        """
+        if self.downsample is None:
+            return []
+        kept: Dict[datetime, Dict[str, Any]] = {}
+        for memory in memories:
+            start = bucket_start(datetime.fromisoformat(memory['timestamp']), self.downsample)
+            kept.pop(start, None)
+            kept[start] = memory
+        return list(kept.values())
+
+class MemoryRollups:
+    def __init__(self, path: Optional[str] = None, emotions: Sequence[str] = EMOTIONS):
+        """
+        Initialize per-minute, per-hour and per-cycle memory aggregates
+
+        Every stored memory updates its minute, hour and cycle bucket:
+        count, min/sum/max per emotion and behavior counts. Buckets are
+        kept in memory and saved to ``path`` as a JSON snapshot by
+        ``save``; memories stored after the snapshot's ``last`` timestamp
+        are replayed into the buckets on the next start.
+
+        Args:
+            path (Optional[str]): Snapshot file, never saved if None
+            emotions (Sequence[str]): Emotions aggregated
+        """
+        self.path = path
+        self.emotions = list(emotions)
+        self.cycle = 1
+        self.last: Optional[str] = None
+        self.buckets: Dict[str, Dict[Any, Dict[str, Any]]] = {
+            resolution: {} for resolution in list(RESOLUTIONS) + ['cycle']
+        }
+
+    def load(self) -> None:
+        """Load the saved snapshot, if any"""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            snapshot = json.load(f)
+        self.cycle = snapshot.get('cycle', 1)
+        self.last = snapshot.get('last')
+        for resolution, buckets in snapshot.get('buckets', {}).items():
+            self.buckets[resolution] = {bucket['key']: bucket for bucket in buckets}
+
+    def save(self) -> None:
+        """Atomically write the snapshot"""
+        if self.path is None:
+            return
+        ensure_parent_dir(self.path)
+        temp_file = self.path + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump({
+                'cycle': self.cycle,
+                'last': self.last,
+                'buckets': {resolution: list(buckets.values())
+                            for resolution, buckets in self.buckets.items()}
+            }, f)
+        os.replace(temp_file, self.path)
+
+    def start_cycle(self, cycle: int) -> None:
+        """Aggregate memories stored from now on into another cycle's bucket"""
+        self.cycle = cycle
+
+    def add(self, memories: List[Dict[str, Any]]) -> None:
+        """
+        Aggregate a batch of memories; usable as a ``MemorySystem`` listener
+
+        Args:
+            memories (List[Dict[str, Any]]): Memories in storage order
+        """
+        for memory in memories:
+            timestamp = datetime.fromisoformat(memory['timestamp'])
+            for resolution in RESOLUTIONS:
+                key = bucket_start(timestamp, resolution).isoformat()
+                self._update(self.buckets[resolution], key, memory)
+            self._update(self.buckets['cycle'], self.cycle, memory)
+        if memories:
+            self.last = memories[-1]['timestamp']
+
+    def _update(self, buckets: Dict[Any, Dict[str, Any]], key: Any,
+                memory: Dict[str, Any]) -> None:
+        """Fold one memory into a bucket, creating it if needed"""
+        bucket = buckets.get(key)
+        state = memory['emotional_state']
+        if bucket is None:
+            values = [float(state.get(e, 0.0)) for e in self.emotions]
+            buckets[key] = {
+                'key': key,
+                'first': memory['timestamp'],
+                'last': memory['timestamp'],
+                'count': 1,
+                'min': values,
+                'sum': list(values),
+                'max': list(values),
+                'behaviors': {memory['behavior']: 1}
+            }
+            return
+        bucket['last'] = memory['timestamp']
+        bucket['count'] += 1
+        low, total, high = bucket['min'], bucket['sum'], bucket['max']
+        for column, emotion in enumerate(self.emotions):
+            value = state.get(emotion, 0.0)
+            total[column] += value
+            if value < low[column]:
+                low[column] = value
+            if value > high[column]:
+                high[column] = value
+        behaviors = bucket['behaviors']
+        behaviors[memory['behavior']] = behaviors.get(memory['behavior'], 0) + 1
+
+    def clear(self) -> None:
+        """Drop every bucket"""
+        for buckets in self.buckets.values():
+            buckets.clear()
+        self.last = None
+
+    def prune(self, now: datetime, horizons: Dict[str, timedelta]) -> int:
+        """
+        Drop time buckets older than their resolution's horizon
+
+        Args:
+            now (datetime): Current time
+            horizons (Dict[str, timedelta]): Retention per resolution
+
+        Returns:
+            int: Number of buckets dropped
+        """
+        dropped = 0
+        for resolution, horizon in horizons.items():
+            cutoff = bucket_start(now - horizon, resolution).isoformat()
+            buckets = self.buckets[resolution]
+            for key in [key for key in buckets if key < cutoff]:
+                del buckets[key]
+                dropped += 1
+        return dropped
+
+    def get_buckets(self, resolution: str, since: Optional[datetime] = None,
+                    until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get rollup rows
+
+        Args:
+            resolution (str): 'minute', 'hour' or 'cycle'
+            since (Optional[datetime]): Only buckets with memories at or after this
+            until (Optional[datetime]): Only buckets with memories before this
+
+        Returns:
+            List[Dict[str, Any]]: Oldest first; each row has the bucket
+            ``key`` (start time, or cycle number), ``first`` and ``last``
+            timestamps, ``count``, per-emotion ``min``/``mean``/``max`` and
+            ``behaviors``
+        """
+        if resolution not in self.buckets:
+            raise ValueError(f"resolution must be one of {', '.join(self.buckets)}")
+        rows = []
+        for bucket in self.buckets[resolution].values():
+            if since is not None and datetime.fromisoformat(bucket['last']) < since:
+                continue
+            if until is not None and datetime.fromisoformat(bucket['first']) >= until:
+                continue
+            rows.append(self._row(bucket))
+        return rows
+
+    def _row(self, bucket: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a bucket with named emotions and means"""
+        count = bucket['count']
+        return {
+            'key': bucket['key'],
+            'first': bucket['first'],
+            'last': bucket['last'],
+            'count': count,
+            'min': dict(zip(self.emotions, bucket['min'])),
+            'mean': {e: total / count for e, total in zip(self.emotions, bucket['sum'])},
+            'max': dict(zip(self.emotions, bucket['max'])),
+            'behaviors': dict(bucket['behaviors'])
+        }
+
+    def _cover(self, since: Optional[datetime],
+               until: Optional[datetime]) -> List[Dict[str, Any]]:
+        """
+        Pick the fewest buckets covering a window
+
+        Whole hours inside the window use hour buckets and the partial
+        hours at its edges use minute buckets, so the window is resolved
+        to the minute: a bucket counts if its start lies in the window.
+        """
+        def inside(start: datetime, width: timedelta) -> bool:
+            return ((since is None or start >= since)
+                    and (until is None or start + width <= until))
+
+        chosen, covered = [], set()
+        for key, bucket in self.buckets['hour'].items():
+            if inside(datetime.fromisoformat(key), RESOLUTIONS['hour']):
+                chosen.append(bucket)
+                covered.add(key)
+        for key, bucket in self.buckets['minute'].items():
+            start = datetime.fromisoformat(key)
+            if bucket_start(start, 'hour').isoformat() in covered:
+                continue
+            if ((since is None or start >= bucket_start(since, 'minute'))
+                    and (until is None or start < until)):
+                chosen.append(bucket)
+        return chosen
+
+    def summarize(self, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Aggregate a time window from the rollups
+
+        Args:
+            since (Optional[datetime]): Inclusive lower bound, to the minute
+            until (Optional[datetime]): Exclusive upper bound, to the minute
+
+        Returns:
+            Dict[str, Any]: Memory count, per-emotion min/mean/max and
+            behavior counts, as ``MemorySystem.summarize_memories``
+        """
+        if since is None and until is None:
+            buckets = list(self.buckets['hour'].values())
+        else:
+            buckets = self._cover(since, until)
+        count = sum(bucket['count'] for bucket in buckets)
+        behaviors: Dict[str, int] = {}
+        low = [min(values) for values in zip(*(b['min'] for b in buckets))]
+        high = [max(values) for values in zip(*(b['max'] for b in buckets))]
+        totals = [sum(values) for values in zip(*(b['sum'] for b in buckets))]
+        for bucket in sorted(buckets, key=lambda b: b['first']):
+            for behavior, seen in bucket['behaviors'].items():
+                behaviors[behavior] = behaviors.get(behavior, 0) + seen
+        zeros = [0.0] * len(self.emotions)
+        return {
+            'count': count,
+            'behaviors': behaviors,
+            'min': dict(zip(self.emotions, low or zeros)),
+            'mean': dict(zip(self.emotions,
+                             [total / count for total in totals] if count else zeros)),
+            'max': dict(zip(self.emotions, high or zeros))
+        }
@@ -2,47 +2,58 @@
 SimulationEngine and SoulAI - Core simulation components for the AI soul
 """
 
-import time
 import logging
 from datetime import datetime
-from typing import Dict, Optional, List, Tuple
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 
+from .clock import SleepClock
 from .emotion_engine import EmotionEngine
 from .memory_system import MemorySystem
 
-# Configure logging
-logging.basicConfig(
-    filename='log.txt',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+logger = logging.getLogger(__name__)
 
 class SimulationEngine:
-    def __init__(self, tick_duration: float = 1.0):
+    def __init__(self, tick_duration: float = 1.0, clock: Optional[SleepClock] = None):
         """
         Initialize the simulation engine
         
         Args:
             tick_duration (float): Duration of each simulation tick in seconds
+            clock (Optional[SleepClock]): Tick scheduler; defaults to sleeping
+                a full tick duration after every tick. Use ``VirtualClock``
+                for batch runs and ``FixedRateClock`` for drift-free real time.
         """
         self.tick_duration = tick_duration
+        self.clock = clock or SleepClock(tick_duration)
         self.current_tick = 0
         self.running = False
 
     def start(self) -> None:
         """Start the simulation"""
         self.running = True
-        logging.info("Simulation started")
+        self.clock.start(self.tick_duration)
+        logger.info("Simulation started")
 
     def stop(self) -> None:
         """Stop the simulation"""
         self.running = False
-        logging.info("Simulation stopped")
+        logger.info("Simulation stopped")
 
     def tick(self) -> None:
         """Process one simulation tick"""
         self.current_tick += 1
-        time.sleep(self.tick_duration)
+        self.clock.wait_for_next_tick()
+
+    def advance(self, ticks: int) -> None:
+        """
+        Jump the tick counter forward without waiting
+
+        Args:
+            ticks (int): Number of ticks to skip
+        """
+        ticks = max(0, ticks)
+        self.current_tick += ticks
+        self.clock.skip(ticks)
 
     def is_running(self) -> bool:
         """Check if simulation is running"""
@@ -52,14 +63,33 @@ class SimulationEngine:
         """Get current simulation tick"""
         return self.current_tick
 
+    def get_clock_stats(self) -> Dict[str, float]:
+        """Get scheduling statistics from the clock"""
+        return self.clock.get_stats()
+
 class SoulAI:
-    def __init__(self):
-        """Initialize the AI soul components"""
+    def __init__(self, clock: Optional[SleepClock] = None,
+                 memory_system: Optional[MemorySystem] = None):
+        """
+        Initialize the AI soul components
+        
+        When the memory system supports checkpoints, the soul resumes from
+        the last checkpoint and the memories stored after it (see
+        ``checkpoint``) instead of starting from a neutral state.
+        
+        Args:
+            clock (Optional[SleepClock]): Tick scheduler for the simulation
+            memory_system (Optional[MemorySystem]): Memory store for this
+                soul, ``soul_memory.json`` in the working directory if None
+        """
         self.emotion_engine = EmotionEngine()
-        self.memory_system = MemorySystem()
-        self.simulation = SimulationEngine()
+        self.memory_system = memory_system if memory_system is not None else MemorySystem()
+        self.simulation = SimulationEngine(clock=clock)
+        if self.memory_system.supports_checkpoints:
+            self.memory_system.state_provider = self.get_snapshot
+            self._recover(*self.memory_system.recover())
         
-        logging.info("SoulAI initialized")
+        logger.info("SoulAI initialized")
 
     def process_input(self, emotion: str, intensity: float, 
                      trigger: Optional[str] = None) -> None:
@@ -82,11 +112,63 @@ class SoulAI:
         self.memory_system.store_emotional_state(state, behavior, trigger)
         
         # Log the event
-        logging.info(
-            f"Processed emotion: {emotion} (intensity: {intensity:.2f})"
-            f" - Behavior: {behavior}"
+        logger.info(
+            "Processed emotion: %s (intensity: %.2f) - Behavior: %s",
+            emotion, intensity, behavior
         )
 
+    def process_inputs(self, events: Iterable[Tuple[str, float, Optional[str]]]) -> List[str]:
+        """
+        Process a batch of emotional inputs in order
+        
+        Each event is applied with the same semantics as ``process_input``
+        and every intermediate state is stored, but the batch is persisted
+        with a single memory write and summarized in one log entry.
+        
+        Args:
+            events (Iterable[Tuple[str, float, Optional[str]]]): (emotion,
+                intensity, trigger) items, or a NumPy structured array with
+                'emotion', 'intensity' and optional 'trigger' fields
+            
+        Returns:
+            List[str]: Emergent behavior after each event
+        """
+        update = self.emotion_engine.update_emotion
+        get_state = self.emotion_engine.get_emotional_state
+        get_behavior = self.emotion_engine.get_emergent_behavior
+
+        records = []
+        for emotion, intensity, trigger in self._iter_events(events):
+            update(emotion, intensity)
+            records.append((get_state(), get_behavior(), trigger))
+
+        self.memory_system.store_emotional_states(records)
+
+        behaviors = [behavior for _, behavior, _ in records]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Processed %d emotions - Behavior: %s", len(records),
+                behaviors[-1] if behaviors else self.get_current_behavior()
+            )
+        return behaviors
+
+    @staticmethod
+    def _iter_events(events: Any) -> Iterable[Tuple[str, float, Optional[str]]]:
+        """Normalize a batch of events into (emotion, intensity, trigger) tuples"""
+        fields = getattr(getattr(events, 'dtype', None), 'names', None)
+        if not fields:
+            return events
+        emotions = [
+            emotion.decode() if isinstance(emotion, bytes) else emotion
+            for emotion in events['emotion'].tolist()
+        ]
+        intensities = events['intensity'].tolist()
+        if 'trigger' in fields:
+            triggers = [trigger or None for trigger in events['trigger'].tolist()]
+        else:
+            triggers = [None] * len(emotions)
+        return zip(emotions, intensities, triggers)
+
     def simulate_time_step(self) -> None:
         """Simulate one time step in the soul's evolution"""
         if not self.simulation.is_running():
@@ -106,11 +188,45 @@ class SoulAI:
         self.simulation.tick()
         
         # Log the time step
-        logging.info(
-            f"Time step {self.simulation.get_current_tick()} - "
-            f"Behavior: {behavior}"
+        logger.info(
+            "Time step %d - Behavior: %s",
+            self.simulation.get_current_tick(), behavior
         )
 
+    def advance(self, ticks: int) -> List[Tuple[int, str]]:
+        """
+        Fast-forward the soul's evolution by a number of time steps
+
+        Equivalent to calling ``simulate_time_step`` ``ticks`` times, except
+        that nothing sleeps and only behavior transitions are stored in
+        memory, so catching up an idle soul is instant. When the memory
+        system supports checkpoints, the final state and tick are
+        checkpointed, since the stored transitions alone cannot rebuild them.
+
+        Args:
+            ticks (int): Number of time steps to advance
+
+        Returns:
+            List[Tuple[int, str]]: (simulation tick, behavior) per transition
+        """
+        if not self.simulation.is_running() or ticks <= 0:
+            return []
+
+        start_tick = self.simulation.get_current_tick()
+        transitions = self.emotion_engine.advance(ticks)
+        for offset, state, behavior in transitions:
+            self.memory_system.store_emotional_state(state, behavior, "time_decay")
+        self.simulation.advance(ticks)
+        if self.memory_system.supports_checkpoints:
+            self.checkpoint()
+
+        logger.info(
+            "Advanced %d time steps to %d - Transitions: %d",
+            ticks, self.simulation.get_current_tick(), len(transitions)
+        )
+        return [(start_tick + offset, behavior)
+                for offset, _, behavior in transitions]
+
     def get_current_state(self) -> Dict[str, float]:
         """Get current emotional state"""
         return self.emotion_engine.get_emotional_state()
@@ -127,12 +243,68 @@ class SoulAI:
         """Get behavior pattern statistics"""
         return self.memory_system.get_behavior_patterns()
 
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the soul's in-process state, everything not kept in memory storage
+
+        Returns:
+            Dict[str, Any]: Emotional state, simulation tick and running flag
+        """
+        return {
+            'emotional_state': self.emotion_engine.get_emotional_state(),
+            'tick': self.simulation.get_current_tick(),
+            'running': self.simulation.is_running()
+        }
+
+    def restore_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Restore state saved with ``get_snapshot``
+
+        Args:
+            snapshot (Dict[str, Any]): Saved soul state
+        """
+        self.emotion_engine.load_state(snapshot.get('emotional_state', {}))
+        self.simulation.current_tick = int(snapshot.get('tick', 0))
+        if snapshot.get('running') and not self.simulation.is_running():
+            self.simulation.start()
+
+    def checkpoint(self) -> None:
+        """
+        Checkpoint the soul's state together with its memories
+
+        Requires a memory system whose backend supports checkpoints, such
+        as ``MemorySystem(checkpoint_every=...)``.
+        """
+        self.memory_system.checkpoint(self.get_snapshot())
+
+    def _recover(self, state: Optional[Dict[str, Any]],
+                 tail: List[Dict[str, Any]]) -> None:
+        """
+        Restore a checkpointed state and replay the memories stored after it
+
+        The last replayed memory holds the latest emotional state, and
+        each 'time_decay' memory is one simulated time step. ``advance``
+        checkpoints when it finishes, so the transitions it stores are
+        always covered by a checkpoint and never replayed as steps.
+
+        Args:
+            state (Optional[Dict[str, Any]]): Snapshot saved by the checkpoint
+            tail (List[Dict[str, Any]]): Memories stored after the checkpoint
+        """
+        snapshot = dict(state or {})
+        if tail:
+            snapshot['emotional_state'] = tail[-1]['emotional_state']
+            snapshot['tick'] = snapshot.get('tick', 0) + sum(
+                1 for memory in tail if memory.get('trigger') == 'time_decay')
+        if snapshot:
+            self.restore_snapshot(snapshot)
+
     def start_simulation(self) -> None:
         """Start the soul simulation"""
         self.simulation.start()
-        logging.info("Soul simulation started")
+        logger.info("Soul simulation started")
 
     def stop_simulation(self) -> None:
         """Stop the soul simulation"""
         self.simulation.stop()
-        logging.info("Soul simulation stopped")
+        logger.info("Soul simulation stopped")
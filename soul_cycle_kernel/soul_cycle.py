@@ -0,0 +1,301 @@
+"""
+SoulCycle - Life, death and rebirth of a soul with inherited memory echoes
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .emotion_engine import EMOTIONS, EmotionEngine
+from .simulation_engine import SoulAI
+from .storage import ensure_parent_dir
+
+logger = logging.getLogger(__name__)
+
+class EchoAggregator:
+    def __init__(self, emotions: Sequence[str] = EMOTIONS):
+        """
+        Initialize running aggregates over the memories of one life
+
+        Every stored memory updates per-emotion sums and peaks, behavior
+        counts and the time span in O(1), so the echo of a life can be
+        computed at death without reading its memories back.
+
+        Args:
+            emotions (Sequence[str]): Emotions aggregated
+        """
+        self.emotions = list(emotions)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything aggregated so far"""
+        self.count = 0
+        self.sums = dict.fromkeys(self.emotions, 0.0)
+        self.peaks = dict.fromkeys(self.emotions, 0.0)
+        self.behavior_counts: Dict[str, int] = {}
+        self.first: Optional[str] = None
+        self.last: Optional[str] = None
+
+    def add(self, memories: List[Dict[str, Any]]) -> None:
+        """
+        Aggregate a batch of memories; usable as a ``MemorySystem`` listener
+
+        Args:
+            memories (List[Dict[str, Any]]): Memories in storage order
+        """
+        sums, peaks, counts = self.sums, self.peaks, self.behavior_counts
+        for memory in memories:
+            for emotion, intensity in memory['emotional_state'].items():
+                if emotion in sums:
+                    sums[emotion] += intensity
+                    if intensity > peaks[emotion]:
+                        peaks[emotion] = intensity
+            counts[memory['behavior']] = counts.get(memory['behavior'], 0) + 1
+        if memories:
+            if self.first is None:
+                self.first = memories[0]['timestamp']
+            self.last = memories[-1]['timestamp']
+            self.count += len(memories)
+
+    def get_means(self) -> Dict[str, float]:
+        """Get the mean intensity of each emotion"""
+        if not self.count:
+            return dict.fromkeys(self.emotions, 0.0)
+        return {emotion: total / self.count for emotion, total in self.sums.items()}
+
+    def get_behavior_weights(self) -> Dict[str, float]:
+        """Get each behavior's share of the memories, most frequent first"""
+        ranked = sorted(self.behavior_counts.items(), key=lambda item: -item[1])
+        return {behavior: count / self.count for behavior, count in ranked}
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Summarize the aggregated memories
+
+        Returns:
+            Dict[str, Any]: Memory count, first and last timestamps,
+            per-emotion mean and peak, and behavior counts
+        """
+        return {
+            'memories': self.count,
+            'first': self.first,
+            'last': self.last,
+            'mean': self.get_means(),
+            'peak': dict(self.peaks),
+            'behaviors': dict(self.behavior_counts)
+        }
+
+class SoulCycle:
+    def __init__(self, soul: SoulAI, life_ticks: int = 1000,
+                 end_condition: Optional[Callable[[SoulAI], bool]] = None,
+                 echo_strength: float = 0.5,
+                 purge_absorbed: bool = True,
+                 summary_file: Optional[str] = None):
+        """
+        Initialize a controller ending and rebirthing a soul's lives
+
+        A life ends once it has lasted ``life_ticks`` simulation ticks or
+        ``end_condition`` returns True. At death the life's memory echo is
+        taken from running aggregates (see ``EchoAggregator``): the mean
+        intensity of each emotion scaled by ``echo_strength``, plus the
+        share of each behavior. The life's summary is appended to
+        ``summary_file`` and, with ``purge_absorbed``, the raw memories it
+        absorbed are dropped; the memory system's rollups, if enabled, are
+        kept and aggregate each life in its own cycle bucket. The soul is then reborn with a fresh
+        ``EmotionEngine`` seeded with the echo. Rebirth never reads the
+        previous life's memories, so its cost does not grow with the
+        length of that life.
+
+        Memories stored after the last summarized life when the controller
+        is created are counted as part of the current life; memories kept
+        from earlier lives (without ``purge_absorbed``) are not read. A soul that restarts without any
+        restored emotional state is seeded with the last life's echo.
+
+        Args:
+            soul (SoulAI): Soul to control
+            life_ticks (int): Ticks after which a life ends
+            end_condition (Optional[Callable[[SoulAI], bool]]): Ends the
+                life early when it returns True
+            echo_strength (float): Share of the mean intensities inherited
+            purge_absorbed (bool): Drop a life's memories once summarized
+            summary_file (Optional[str]): JSON Lines file of life summaries,
+                ``<memory file>.cycles.jsonl`` if None
+        """
+        self.soul = soul
+        self.life_ticks = max(1, life_ticks)
+        self.end_condition = end_condition
+        self.echo_strength = echo_strength
+        self.purge_absorbed = purge_absorbed
+        if summary_file is None:
+            summary_file = os.path.splitext(soul.memory_system.memory_file)[0] + '.cycles.jsonl'
+        self.summary_file = summary_file
+
+        summaries = self.get_summaries()
+        last = summaries[-1] if summaries else None
+        self.cycle = len(summaries) + 1
+        self.echo: Optional[Dict[str, Any]] = last['echo'] if last else None
+        tick = soul.simulation.get_current_tick()
+        self.life_start_tick = min(tick, last['end_tick']) if last else 0
+        if self.echo is not None and not any(soul.get_current_state().values()):
+            soul.emotion_engine.load_state(self.echo['emotional_state'])
+
+        if soul.memory_system.rollups is not None:
+            soul.memory_system.rollups.start_cycle(self.cycle)
+
+        self.aggregator = EchoAggregator(list(soul.get_current_state()))
+        absorbed = next((summary['last'] for summary in reversed(summaries)
+                         if summary['last'] is not None), None)
+        self.aggregator.add(self._memories_after(absorbed))
+        soul.memory_system.add_listener(self.aggregator.add)
+
+    def get_age(self) -> int:
+        """Get the number of ticks lived in the current life"""
+        return self.soul.simulation.get_current_tick() - self.life_start_tick
+
+    def should_end(self) -> Optional[str]:
+        """
+        Check whether the current life is over
+
+        Returns:
+            Optional[str]: 'age' or 'condition' if it is, None otherwise
+        """
+        if self.get_age() >= self.life_ticks:
+            return 'age'
+        if self.end_condition is not None and self.end_condition(self.soul):
+            return 'condition'
+        return None
+
+    def check(self) -> Optional[Dict[str, Any]]:
+        """
+        End the current life if it is over
+
+        Returns:
+            Optional[Dict[str, Any]]: Summary of the ended life, if any
+        """
+        reason = self.should_end()
+        return self.rebirth(reason) if reason else None
+
+    def step(self) -> Optional[Dict[str, Any]]:
+        """
+        Simulate one time step, then end the life if it is over
+
+        Returns:
+            Optional[Dict[str, Any]]: Summary of the ended life, if any
+        """
+        self.soul.simulate_time_step()
+        return self.check()
+
+    def run(self, ticks: int) -> List[Dict[str, Any]]:
+        """
+        Simulate a number of time steps across as many lives as they span
+
+        Args:
+            ticks (int): Number of time steps
+
+        Returns:
+            List[Dict[str, Any]]: Summaries of the lives that ended
+        """
+        summaries = []
+        for _ in range(max(0, ticks)):
+            summary = self.step()
+            if summary is not None:
+                summaries.append(summary)
+        return summaries
+
+    def rebirth(self, reason: str = 'manual') -> Dict[str, Any]:
+        """
+        End the current life and start the next one seeded with its echo
+
+        Args:
+            reason (str): Why the life ended, stored in its summary
+
+        Returns:
+            Dict[str, Any]: Summary of the ended life: cycle number,
+            reason, start and end ticks, the ``EchoAggregator`` summary and
+            the inherited ``echo`` (emotional state and behavior weights)
+        """
+        soul = self.soul
+        end_tick = soul.simulation.get_current_tick()
+        echo = {
+            'emotional_state': {
+                emotion: self.echo_strength * mean
+                for emotion, mean in self.aggregator.get_means().items()
+            },
+            'behaviors': self.aggregator.get_behavior_weights()
+        }
+        summary = {
+            'cycle': self.cycle,
+            'reason': reason,
+            'start_tick': self.life_start_tick,
+            'end_tick': end_tick,
+            'ticks': end_tick - self.life_start_tick,
+            **self.aggregator.get_summary(),
+            'echo': echo
+        }
+        self._append_summary(summary)
+
+        if self.purge_absorbed:
+            soul.memory_system.drop_memories()
+        soul.emotion_engine = self._seed_engine(soul.emotion_engine, echo['emotional_state'])
+
+        self.aggregator.reset()
+        self.echo = echo
+        self.cycle += 1
+        self.life_start_tick = end_tick
+        if soul.memory_system.rollups is not None:
+            soul.memory_system.rollups.start_cycle(self.cycle)
+        if soul.memory_system.supports_checkpoints:
+            soul.checkpoint()
+
+        logger.info(
+            "Cycle %d ended (%s) after %d ticks - Memories absorbed: %d",
+            summary['cycle'], reason, summary['ticks'], summary['memories']
+        )
+        return summary
+
+    def get_summaries(self) -> List[Dict[str, Any]]:
+        """Read the summaries of every ended life, oldest first"""
+        if not os.path.exists(self.summary_file):
+            return []
+        with open(self.summary_file, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def close(self) -> None:
+        """Stop aggregating the soul's memories"""
+        self.soul.memory_system.remove_listener(self.aggregator.add)
+
+    def __enter__(self) -> 'SoulCycle':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _append_summary(self, summary: Dict[str, Any]) -> None:
+        """Persist a life summary before its memories are purged"""
+        ensure_parent_dir(self.summary_file)
+        with open(self.summary_file, 'a') as f:
+            f.write(json.dumps(summary) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _memories_after(self, timestamp: Optional[str]) -> List[Dict[str, Any]]:
+        """Get the memories stored after a life's last memory, every memory if None"""
+        if timestamp is None:
+            return self.soul.memory_system.query_memories()
+        moment = datetime.fromisoformat(timestamp)
+        return [memory for memory in self.soul.memory_system.query_memories(since=moment)
+                if datetime.fromisoformat(memory['timestamp']) > moment]
+
+    @staticmethod
+    def _seed_engine(previous: EmotionEngine, state: Dict[str, float]) -> EmotionEngine:
+        """Create the next life's engine with the previous configuration and the echo"""
+        engine = EmotionEngine(history_capacity=previous.history.capacity,
+                               history_spill=previous.history.spill,
+                               interactions=previous.interactions,
+                               behavior_rules=previous.behavior_rules)
+        engine.decay_rates = dict(previous.decay_rates)
+        engine.thresholds = dict(previous.thresholds)
+        engine.load_state(state)
+        return engine
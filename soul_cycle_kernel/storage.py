@@ -0,0 +1,904 @@
+"""
+Storage backends - Pluggable persistence for the MemorySystem
+"""
+
+import itertools
+import json
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .emotion_engine import EMOTIONS
+from .encoding import datetime_to_micros, micros_to_datetime
+
+# Durability levels for backend writes, weakest first
+DURABILITY_LEVELS = ('none', 'flush', 'fsync')
+
+# Records parsed and filtered per step while streaming
+STREAM_BATCH = 1024
+
+# Bytes read per step while scanning a journal backwards from its end
+TAIL_BLOCK = 64 * 1024
+
+def ensure_parent_dir(path: str) -> None:
+    """Create the directory holding ``path`` if it does not exist"""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+def filter_memories(memories: Iterable[Dict[str, Any]],
+                    since: Optional[datetime] = None,
+                    until: Optional[datetime] = None,
+                    behavior: Optional[str] = None,
+                    emotion: Optional[str] = None,
+                    above: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Filter memory dicts in Python
+
+    Args:
+        memories (Iterable[Dict[str, Any]]): Memories to filter
+        since (Optional[datetime]): Inclusive lower time bound
+        until (Optional[datetime]): Exclusive upper time bound
+        behavior (Optional[str]): Only memories with this behavior
+        emotion (Optional[str]): Emotion tested against ``above``
+        above (Optional[float]): Only memories where ``emotion`` exceeds this
+
+    Returns:
+        List[Dict[str, Any]]: Matching memories in storage order
+    """
+    matches = []
+    for memory in memories:
+        if behavior is not None and memory['behavior'] != behavior:
+            continue
+        if emotion is not None and above is not None:
+            if not memory['emotional_state'].get(emotion, 0) > above:
+                continue
+        if since is not None or until is not None:
+            timestamp = datetime.fromisoformat(memory['timestamp'])
+            if since is not None and timestamp < since:
+                continue
+            if until is not None and timestamp >= until:
+                continue
+        matches.append(memory)
+    return matches
+
+class StorageBackend:
+    """
+    Interface for MemorySystem persistence
+
+    Backends that set ``supports_queries`` answer queries themselves, and
+    the MemorySystem then pushes queries down instead of holding every
+    memory in process. The default query implementations load everything
+    and filter in Python. Backends that set ``supports_checkpoints`` can
+    record restart points with ``checkpoint`` and report what was stored
+    after the last one with ``recover``. Backends that can stream records
+    override ``iter_memories`` and ``prepare``, so a lazily loaded
+    MemorySystem never holds the whole history.
+    """
+
+    supports_queries = False
+    supports_checkpoints = False
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load every stored memory in storage order"""
+        raise NotImplementedError
+
+    def append(self, memories: List[Dict[str, Any]]) -> None:
+        """Persist a batch of new memories"""
+        raise NotImplementedError
+
+    def rewrite(self, memories: List[Dict[str, Any]]) -> None:
+        """Replace the stored memories"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any open resources"""
+
+    def checkpoint(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """Record a restart point; only backends with ``supports_checkpoints``"""
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get the last checkpointed state and the memories stored after it"""
+        return None, []
+
+    def prepare(self) -> None:
+        """Make the store ready for queries and appends without loading it"""
+
+    def iter_memories(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      behavior: Optional[str] = None,
+                      emotion: Optional[str] = None,
+                      above: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored memories in storage order
+
+        Takes the same filters as ``query``. The default implementation
+        runs ``query`` and iterates its result.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Matching memories
+        """
+        return iter(self.query(since, until, behavior, emotion, above))
+
+    def query(self, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              behavior: Optional[str] = None,
+              emotion: Optional[str] = None,
+              above: Optional[float] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """
+        Find stored memories
+
+        Args:
+            since (Optional[datetime]): Inclusive lower time bound
+            until (Optional[datetime]): Exclusive upper time bound
+            behavior (Optional[str]): Only memories with this behavior
+            emotion (Optional[str]): Emotion tested against ``above``
+            above (Optional[float]): Only memories where ``emotion`` exceeds this
+            limit (Optional[int]): Maximum number of memories returned
+            newest_first (bool): Return the newest memories first
+
+        Returns:
+            List[Dict[str, Any]]: Matching memories
+        """
+        memories = filter_memories(self.load(), since, until, behavior, emotion, above)
+        if newest_first:
+            memories.reverse()
+        return memories if limit is None else memories[:limit]
+
+    def behavior_counts(self) -> Dict[str, int]:
+        """Count stored memories per behavior"""
+        counts: Dict[str, int] = {}
+        for memory in self.load():
+            counts[memory['behavior']] = counts.get(memory['behavior'], 0) + 1
+        return counts
+
+    def summarize(self, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+        """Aggregate the memories stored within a time window"""
+        from .columnar_store import ColumnarMemoryStore
+
+        window = list(self.iter_memories(since, until))
+        return ColumnarMemoryStore.from_memories(window).aggregate(since, until)
+
+class JSONLinesBackend(StorageBackend):
+    def __init__(self, memory_file: str = "soul_memory.json", durability: str = 'flush'):
+        """
+        Append-only JSON Lines journal, one memory per line
+
+        The journal lives next to ``memory_file`` (``soul_memory.json`` ->
+        ``soul_memory.jsonl``). A legacy ``memory_file`` holding a JSON
+        array is migrated into the journal the first time it is loaded.
+
+        Queries stream the journal line by line, and recent memories are
+        read backwards from its end, so ``prepare`` plus queries serve a
+        MemorySystem that never loads the whole journal.
+
+        Args:
+            memory_file (str): Path to the memory storage file
+            durability (str): 'none' leaves batches in the process buffer,
+                'flush' hands them to the OS, 'fsync' forces them to disk
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"durability must be one of {', '.join(DURABILITY_LEVELS)}"
+            )
+        self.memory_file = memory_file
+        self.journal_file = self._journal_path(memory_file)
+        self.durability = durability
+        self._journal = None
+
+    @staticmethod
+    def _journal_path(memory_file: str) -> str:
+        """Derive the JSON Lines journal path from the memory file path"""
+        root, suffix = os.path.splitext(memory_file)
+        if suffix == '.jsonl':
+            return memory_file
+        return root + '.jsonl'
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load memories by replaying the journal, migrating legacy files"""
+        if os.path.exists(self.journal_file):
+            return self._replay_journal()
+        if self.memory_file != self.journal_file and os.path.exists(self.memory_file):
+            memories = self._load_legacy_file()
+            self.rewrite(memories)
+            return memories
+        return []
+
+    def _load_legacy_file(self) -> List[Dict[str, Any]]:
+        """Read a pre-journal memory file holding a single JSON array"""
+        try:
+            with open(self.memory_file, 'r') as f:
+                memories = json.load(f)
+        except json.JSONDecodeError:
+            return []
+        return memories if isinstance(memories, list) else []
+
+    def prepare(self) -> None:
+        """Migrate a legacy file and drop a torn last record, reading only the end"""
+        if not os.path.exists(self.journal_file):
+            self.load()
+            return
+        with open(self.journal_file, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - TAIL_BLOCK)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                f.truncate(position)
+
+    def _replay_journal(self) -> List[Dict[str, Any]]:
+        """
+        Replay the journal into a list of memories
+
+        A trailing record without its newline is the remains of an
+        interrupted write; it is dropped and truncated away so that the
+        next append starts on a clean line.
+
+        Returns:
+            List[Dict[str, Any]]: Memories in the order they were stored
+        """
+        with open(self.journal_file, 'rb') as f:
+            data = f.read()
+
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(complete)
+
+        memories = []
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                memories.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return memories
+
+    def append(self, memories: List[Dict[str, Any]]) -> None:
+        """
+        Append records to the journal
+
+        Each record is a single line and a batch is written with one call,
+        so a crash mid-write loses at most the record being written.
+        """
+        if self._journal is None:
+            ensure_parent_dir(self.journal_file)
+            self._journal = open(self.journal_file, 'a')
+        self._journal.write(
+            ''.join(json.dumps(memory) + '\n' for memory in memories)
+        )
+        if self.durability != 'none':
+            self._journal.flush()
+            if self.durability == 'fsync':
+                os.fsync(self._journal.fileno())
+
+    def rewrite(self, memories: List[Dict[str, Any]]) -> None:
+        """Atomically replace the journal with the given memories"""
+        self.close()
+        ensure_parent_dir(self.journal_file)
+        temp_file = self.journal_file + '.tmp'
+        with open(temp_file, 'w') as f:
+            f.writelines(json.dumps(memory) + '\n' for memory in memories)
+            if self.durability == 'fsync':
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, self.journal_file)
+
+    def close(self) -> None:
+        """Close the open journal handle, if any"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _lines(self) -> Iterator[bytes]:
+        """Stream the complete lines of the journal"""
+        if self._journal is not None:
+            self._journal.flush()
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if line.endswith(b'\n'):
+                    yield line
+
+    @staticmethod
+    def _parse(lines: Iterable[bytes]) -> List[Dict[str, Any]]:
+        """Parse journal lines, skipping blank and corrupt ones"""
+        memories = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                memories.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return memories
+
+    def iter_memories(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      behavior: Optional[str] = None,
+                      emotion: Optional[str] = None,
+                      above: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the journal, holding one batch of records at a time"""
+        lines = self._lines()
+        while True:
+            batch = self._parse(itertools.islice(lines, STREAM_BATCH))
+            if not batch:
+                return
+            yield from filter_memories(batch, since, until, behavior, emotion, above)
+
+    def _tail(self, limit: int) -> List[Dict[str, Any]]:
+        """Read the last ``limit`` records, scanning backwards from the end"""
+        if self._journal is not None:
+            self._journal.flush()
+        if limit <= 0 or not os.path.exists(self.journal_file):
+            return []
+        with open(self.journal_file, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b''
+            while position > 0:
+                start = max(0, position - TAIL_BLOCK)
+                f.seek(start)
+                data = f.read(position - start) + data
+                position = start
+                if data.count(b'\n') > limit:
+                    break
+        lines = data[:data.rfind(b'\n') + 1].splitlines()
+        if position > 0:
+            lines = lines[1:]
+        memories: List[Dict[str, Any]] = []
+        for line in reversed(lines):
+            memories.extend(self._parse([line]))
+            if len(memories) == limit:
+                break
+        return memories[::-1]
+
+    def query(self, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              behavior: Optional[str] = None,
+              emotion: Optional[str] = None,
+              above: Optional[float] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Find stored memories by streaming the journal"""
+        unfiltered = (since is None and until is None and behavior is None
+                      and (emotion is None or above is None))
+        if unfiltered and newest_first and limit is not None:
+            return self._tail(limit)[::-1]
+        matches = self.iter_memories(since, until, behavior, emotion, above)
+        if newest_first:
+            found = list(matches)
+            found.reverse()
+            return found if limit is None else found[:limit]
+        return list(itertools.islice(matches, limit))
+
+    def behavior_counts(self) -> Dict[str, int]:
+        """Count stored memories per behavior in one streaming pass"""
+        counts: Dict[str, int] = {}
+        for memory in self.iter_memories():
+            counts[memory['behavior']] = counts.get(memory['behavior'], 0) + 1
+        return counts
+
+class SegmentedBackend(JSONLinesBackend):
+    supports_queries = True
+    supports_checkpoints = True
+
+    # Sealed segment files are named by the record range they hold
+    SEGMENT_NAME = re.compile(r'^(\d{12})-(\d{12})\.jsonl$')
+
+    def __init__(self, memory_file: str = "soul_memory.json", durability: str = 'flush',
+                 segment_size: int = 10000, cached_segments: int = 4):
+        """
+        JSON Lines journal compacted into sealed segments at checkpoints
+
+        Only the journal tail (records stored since the last checkpoint) is
+        read at startup. A checkpoint moves the tail into a sealed segment
+        under ``<memory_file>.segments/`` and atomically rewrites
+        ``<memory_file>.checkpoint.json``, which lists every segment with
+        its record range, time span, behavior counts and peak intensity per
+        emotion, plus the owner's state at that point. Recovery cost is
+        therefore bounded by the checkpoint interval, not the history size.
+
+        Sealed segments are immutable and hydrated on demand: behavior
+        counts come from the manifest, and queries skip segments whose time
+        span, behaviors or peak intensities cannot match. Small adjacent
+        segments are merged into segments of up to ``segment_size`` records.
+
+        Args:
+            memory_file (str): Path to the memory storage file
+            durability (str): 'none' leaves batches in the process buffer,
+                'flush' hands them to the OS, 'fsync' forces them to disk
+            segment_size (int): Largest number of records merged into one
+                segment by compaction
+            cached_segments (int): Hydrated segments kept in memory
+        """
+        super().__init__(memory_file, durability)
+        root = os.path.splitext(self.journal_file)[0]
+        self.segment_dir = root + '.segments'
+        self.checkpoint_file = root + '.checkpoint.json'
+        self.segment_size = max(1, segment_size)
+        self.cached_segments = max(1, cached_segments)
+        self.segments: List[Dict[str, Any]] = []
+        self.state: Optional[Dict[str, Any]] = None
+        self.sealed = 0
+        self.tail: List[Dict[str, Any]] = []
+        self._cache: 'OrderedDict[str, List[Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._recover()
+
+    def _recover(self) -> None:
+        """Read the checkpoint, finish interrupted checkpoints and load the tail"""
+        checkpointed = os.path.exists(self.checkpoint_file)
+        if checkpointed:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+            self.segments = checkpoint.get('segments', [])
+            self.state = checkpoint.get('state')
+            self.sealed = self.segments[-1]['stop'] if self.segments else 0
+
+        listed = {segment['file'] for segment in self.segments}
+        adopted: List[Dict[str, Any]] = []
+        names = os.listdir(self.segment_dir) if os.path.isdir(self.segment_dir) else []
+        for name in sorted(names):
+            if name in listed:
+                continue
+            path = os.path.join(self.segment_dir, name)
+            match = self.SEGMENT_NAME.match(name)
+            if match and int(match.group(1)) == self.sealed:
+                # Journal sealed just before a crash: its records are still the tail
+                adopted = self._read_segment(path)
+            os.remove(path)
+
+        if checkpointed:
+            # Any legacy file was migrated before the first checkpoint, and a
+            # checkpoint may have sealed the whole journal: never migrate again
+            self.tail = self._replay_journal() if os.path.exists(self.journal_file) else []
+        else:
+            self.tail = super().load()
+        if adopted:
+            self.tail = adopted + self.tail
+            super().rewrite(self.tail)
+
+    @staticmethod
+    def _read_segment(path: str) -> List[Dict[str, Any]]:
+        """Parse one JSON Lines segment file"""
+        with open(path, 'rb') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def _describe(memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize records for a segment manifest entry"""
+        behaviors: Dict[str, int] = {}
+        peaks: Dict[str, float] = {}
+        for memory in memories:
+            behaviors[memory['behavior']] = behaviors.get(memory['behavior'], 0) + 1
+            for emotion, intensity in memory['emotional_state'].items():
+                if intensity > peaks.get(emotion, -math.inf):
+                    peaks[emotion] = intensity
+        return {
+            'first': memories[0]['timestamp'],
+            'last': memories[-1]['timestamp'],
+            'behaviors': behaviors,
+            'peaks': peaks
+        }
+
+    def _segment(self, segment: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Hydrate a sealed segment, keeping recently used ones cached"""
+        name = segment['file']
+        memories = self._cache.get(name)
+        if memories is None:
+            memories = self._read_segment(os.path.join(self.segment_dir, name))
+            self._cache[name] = memories
+            while len(self._cache) > self.cached_segments:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(name)
+        return memories
+
+    def _write_checkpoint(self) -> None:
+        """Atomically replace the checkpoint manifest"""
+        ensure_parent_dir(self.checkpoint_file)
+        temp_file = self.checkpoint_file + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump({'version': 1, 'segments': self.segments, 'state': self.state}, f)
+            if self.durability == 'fsync':
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, self.checkpoint_file)
+
+    def checkpoint(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Seal the journal tail into a segment and record a checkpoint
+
+        The journal is renamed into the segment directory before the
+        manifest is written; if the process dies in between, the next open
+        moves the records back into the tail, so no record is lost or
+        duplicated.
+
+        Args:
+            state (Optional[Dict[str, Any]]): Owner state to restore after
+                the sealed records, e.g. ``SoulAI.get_snapshot()``
+        """
+        with self._lock:
+            if self.tail:
+                self.close()
+                stop = self.sealed + len(self.tail)
+                name = f'{self.sealed:012d}-{stop:012d}.jsonl'
+                os.makedirs(self.segment_dir, exist_ok=True)
+                os.replace(self.journal_file, os.path.join(self.segment_dir, name))
+                self.segments.append(dict(file=name, start=self.sealed, stop=stop,
+                                          **self._describe(self.tail)))
+                self.sealed = stop
+                self.tail = []
+            self.state = state
+            self._write_checkpoint()
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Merge runs of adjacent small segments up to ``segment_size`` records
+
+        Merged segments are written under new names and the manifest is
+        switched over before the old files are removed.
+
+        Returns:
+            int: Number of segment files removed
+        """
+        with self._lock:
+            runs: List[List[Dict[str, Any]]] = []
+            for segment in self.segments:
+                run = runs[-1] if runs else None
+                size = segment['stop'] - segment['start']
+                if run and run[-1]['stop'] - run[0]['start'] + size <= self.segment_size:
+                    run.append(segment)
+                else:
+                    runs.append([segment])
+            if all(len(run) == 1 for run in runs):
+                return 0
+
+            merged, obsolete = [], []
+            for run in runs:
+                if len(run) == 1:
+                    merged.append(run[0])
+                    continue
+                memories = [memory for segment in run for memory in self._segment(segment)]
+                name = f"{run[0]['start']:012d}-{run[-1]['stop']:012d}.jsonl"
+                temp_file = os.path.join(self.segment_dir, name + '.tmp')
+                with open(temp_file, 'w') as f:
+                    f.writelines(json.dumps(memory) + '\n' for memory in memories)
+                os.replace(temp_file, os.path.join(self.segment_dir, name))
+                merged.append(dict(file=name, start=run[0]['start'], stop=run[-1]['stop'],
+                                   **self._describe(memories)))
+                obsolete.extend(segment['file'] for segment in run)
+
+            self.segments = merged
+            self._write_checkpoint()
+            for name in obsolete:
+                self._cache.pop(name, None)
+                os.remove(os.path.join(self.segment_dir, name))
+            return len(obsolete)
+
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get what a restarted owner needs to catch up
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]: State
+            saved by the last checkpoint and the records stored after it
+        """
+        with self._lock:
+            return self.state, list(self.tail)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load every stored memory, hydrating all sealed segments"""
+        with self._lock:
+            memories = [memory for segment in self.segments
+                        for memory in self._segment(segment)]
+            return memories + self.tail
+
+    def append(self, memories: List[Dict[str, Any]]) -> None:
+        """Append records to the journal tail"""
+        with self._lock:
+            super().append(memories)
+            self.tail.extend(memories)
+
+    def rewrite(self, memories: List[Dict[str, Any]]) -> None:
+        """Replace every stored memory with a fresh journal and no segments"""
+        with self._lock:
+            obsolete = [segment['file'] for segment in self.segments]
+            super().rewrite(memories)
+            self.tail = list(memories)
+            self.segments = []
+            self.sealed = 0
+            self._cache.clear()
+            self._write_checkpoint()
+            for name in obsolete:
+                os.remove(os.path.join(self.segment_dir, name))
+
+    def prepare(self) -> None:
+        """Nothing to do: the journal tail was recovered on construction"""
+
+    def iter_memories(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      behavior: Optional[str] = None,
+                      emotion: Optional[str] = None,
+                      above: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Stream matching records one candidate segment at a time"""
+        with self._lock:
+            candidates = self._candidates(since, until, behavior, emotion, above)
+            tail = list(self.tail)
+        for segment in candidates:
+            with self._lock:
+                memories = self._segment(segment)
+            yield from filter_memories(memories, since, until, behavior, emotion, above)
+        yield from filter_memories(tail, since, until, behavior, emotion, above)
+
+    def _candidates(self, since: Optional[datetime], until: Optional[datetime],
+                    behavior: Optional[str], emotion: Optional[str],
+                    above: Optional[float]) -> List[Dict[str, Any]]:
+        """Get the sealed segments that may hold matching records"""
+        candidates = []
+        for segment in self.segments:
+            if since is not None and datetime.fromisoformat(segment['last']) < since:
+                continue
+            if until is not None and datetime.fromisoformat(segment['first']) >= until:
+                continue
+            if behavior is not None and behavior not in segment['behaviors']:
+                continue
+            if (emotion is not None and above is not None
+                    and not segment['peaks'].get(emotion, 0) > above):
+                continue
+            candidates.append(segment)
+        return candidates
+
+    def query(self, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              behavior: Optional[str] = None,
+              emotion: Optional[str] = None,
+              above: Optional[float] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Find stored memories, hydrating only segments that may match"""
+        with self._lock:
+            parts: List[Any] = self._candidates(since, until, behavior, emotion, above)
+            parts.append(None)
+            if newest_first:
+                parts.reverse()
+            matches: List[Dict[str, Any]] = []
+            for segment in parts:
+                memories = self.tail if segment is None else self._segment(segment)
+                found = filter_memories(memories, since, until, behavior, emotion, above)
+                if newest_first:
+                    found.reverse()
+                matches.extend(found)
+                if limit is not None and len(matches) >= limit:
+                    return matches[:limit]
+            return matches
+
+    def behavior_counts(self) -> Dict[str, int]:
+        """Count stored memories per behavior from the manifest and the tail"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for segment in self.segments:
+                for behavior, count in segment['behaviors'].items():
+                    counts[behavior] = counts.get(behavior, 0) + count
+            for memory in self.tail:
+                counts[memory['behavior']] = counts.get(memory['behavior'], 0) + 1
+            return counts
+
+    def summarize(self, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+        """Aggregate the memories within a time window from overlapping segments"""
+        from .columnar_store import ColumnarMemoryStore
+
+        with self._lock:
+            memories = [memory for segment in self._candidates(since, until, None, None, None)
+                        for memory in self._segment(segment)]
+            memories.extend(self.tail)
+        return ColumnarMemoryStore.from_memories(memories).aggregate(since, until)
+
+class SQLiteBackend(StorageBackend):
+    supports_queries = True
+
+    # Durability level -> PRAGMA synchronous setting
+    SYNCHRONOUS = {'none': 'OFF', 'flush': 'NORMAL', 'fsync': 'FULL'}
+
+    def __init__(self, database: str = "soul_memory.db", durability: str = 'flush',
+                 emotions: Sequence[str] = EMOTIONS):
+        """
+        SQLite database with one row per memory
+
+        The database runs in WAL mode, batches are inserted in a single
+        transaction, and timestamp, behavior and every emotion column are
+        indexed so that time-range and threshold queries run in SQL.
+
+        Args:
+            database (str): Path to the SQLite database file
+            durability (str): Mapped to PRAGMA synchronous OFF/NORMAL/FULL
+            emotions (Sequence[str]): Emotions stored as columns
+        """
+        import sqlite3
+
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"durability must be one of {', '.join(DURABILITY_LEVELS)}"
+            )
+        self.database = database
+        self.durability = durability
+        self.emotions = list(emotions)
+        self._emotion_columns = ', '.join(f'"{e}"' for e in self.emotions)
+        self._lock = threading.Lock()
+        ensure_parent_dir(database)
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create the memories table and its indexes"""
+        emotion_columns = ''.join(f', "{e}" REAL NOT NULL DEFAULT 0' for e in self.emotions)
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                f'PRAGMA synchronous={self.SYNCHRONOUS[self.durability]}')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS memories ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'timestamp INTEGER NOT NULL, '
+                'behavior TEXT NOT NULL, '
+                f'trigger TEXT{emotion_columns})'
+            )
+            for column in ['timestamp', 'behavior'] + self.emotions:
+                self._connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_memories_{column}" '
+                    f'ON memories ("{column}")'
+                )
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load every stored memory in storage order"""
+        return self.query()
+
+    def append(self, memories: List[Dict[str, Any]]) -> None:
+        """Insert a batch of memories in one transaction"""
+        placeholders = ', '.join('?' * (len(self.emotions) + 3))
+        rows = [
+            (datetime_to_micros(datetime.fromisoformat(memory['timestamp'])),
+             memory['behavior'], memory.get('trigger'),
+             *(memory['emotional_state'].get(e, 0.0) for e in self.emotions))
+            for memory in memories
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f'INSERT INTO memories (timestamp, behavior, trigger, {self._emotion_columns}) '
+                f'VALUES ({placeholders})',
+                rows
+            )
+
+    def rewrite(self, memories: List[Dict[str, Any]]) -> None:
+        """Replace every stored memory"""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM memories')
+        if memories:
+            self.append(memories)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+    def _where(self, since: Optional[datetime], until: Optional[datetime],
+               behavior: Optional[str], emotion: Optional[str],
+               above: Optional[float]):
+        """Build a WHERE clause and its parameters"""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(datetime_to_micros(since))
+        if until is not None:
+            clauses.append('timestamp < ?')
+            params.append(datetime_to_micros(until))
+        if behavior is not None:
+            clauses.append('behavior = ?')
+            params.append(behavior)
+        if emotion is not None and above is not None:
+            if emotion not in self.emotions:
+                clauses.append('0')
+            else:
+                clauses.append(f'"{emotion}" > ?')
+                params.append(above)
+        where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        return where, params
+
+    def query(self, since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              behavior: Optional[str] = None,
+              emotion: Optional[str] = None,
+              above: Optional[float] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Find stored memories with an indexed SQL query"""
+        where, params = self._where(since, until, behavior, emotion, above)
+        order = 'DESC' if newest_first else 'ASC'
+        sql = (f'SELECT timestamp, behavior, trigger, {self._emotion_columns} '
+               f'FROM memories{where} ORDER BY id {order}')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._memory(row) for row in rows]
+
+    def iter_memories(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      behavior: Optional[str] = None,
+                      emotion: Optional[str] = None,
+                      above: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Stream matching rows in pages of ``STREAM_BATCH`` by row id"""
+        where, params = self._where(since, until, behavior, emotion, above)
+        where = f'{where} AND id > ?' if where else ' WHERE id > ?'
+        sql = (f'SELECT id, timestamp, behavior, trigger, {self._emotion_columns} '
+               f'FROM memories{where} ORDER BY id LIMIT {STREAM_BATCH}')
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(sql, params + [last]).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            for row in rows:
+                yield self._memory(row[1:])
+
+    def _memory(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Build a memory dict from a (timestamp, behavior, trigger, *emotions) row"""
+        return {
+            'timestamp': micros_to_datetime(row[0]).isoformat(),
+            'emotional_state': dict(zip(self.emotions, row[3:])),
+            'behavior': row[1],
+            'trigger': row[2]
+        }
+
+    def behavior_counts(self) -> Dict[str, int]:
+        """Count stored memories per behavior in SQL"""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT behavior, COUNT(*) FROM memories '
+                'GROUP BY behavior ORDER BY MIN(id)'
+            ).fetchall()
+        return dict(rows)
+
+    def summarize(self, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+        """Aggregate the memories stored within a time window in SQL"""
+        where, params = self._where(since, until, None, None, None)
+        aggregates = ', '.join(
+            f'MIN("{e}"), AVG("{e}"), MAX("{e}")' for e in self.emotions)
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT COUNT(*), {aggregates} FROM memories{where}', params
+            ).fetchone()
+            behaviors = self._connection.execute(
+                f'SELECT behavior, COUNT(*) FROM memories{where} '
+                'GROUP BY behavior ORDER BY MIN(id)', params
+            ).fetchall()
+        summary: Dict[str, Any] = {'count': row[0], 'behaviors': dict(behaviors)}
+        for offset, statistic in enumerate(('min', 'mean', 'max')):
+            summary[statistic] = {
+                e: row[1 + 3 * column + offset] or 0.0
+                for column, e in enumerate(self.emotions)
+            }
+        return summary
@@ -0,0 +1,210 @@
+"""
+Structured logging - Opt-in background JSON Lines log writer for the kernel
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler
+from typing import Any, Dict, List, Optional
+
+# Parent logger of every kernel module
+KERNEL_LOGGER = 'soul_cycle_kernel'
+
+_encode = json.JSONEncoder(separators=(',', ':'), default=str).encode
+
+class JSONLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as one compact JSON object
+
+        ``ts`` is the creation time in seconds since the Unix epoch. The
+        event is the record's unformatted message template, so events can
+        be grouped without parsing messages. Values passed with
+        ``extra={'fields': {...}}`` are merged into the object.
+
+        Args:
+            record (logging.LogRecord): Record to format
+
+        Returns:
+            str: JSON object without a trailing newline
+        """
+        event: Dict[str, Any] = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.msg if isinstance(record.msg, str) else repr(record.msg),
+            'message': record.getMessage()
+        }
+        fields = getattr(record, 'fields', None)
+        if isinstance(fields, dict):
+            event.update(fields)
+        if record.exc_info:
+            event['exception'] = self.formatException(record.exc_info)
+        return _encode(event)
+
+class DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Enqueue records unformatted
+
+        ``QueueHandler`` formats each message in the logging thread; the
+        kernel only logs immutable arguments, so formatting is left to the
+        background listener and the hot path just enqueues the record.
+        """
+        return record
+
+class BufferedFileHandler(logging.FileHandler):
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record without flushing; ``LogWriter`` flushes per batch"""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+class LogWriter:
+    # Most records handled between two flushes
+    BATCH_SIZE = 1024
+
+    def __init__(self, records: 'queue.SimpleQueue', handler: logging.Handler):
+        """
+        Initialize a background thread draining queued records into a handler
+
+        Records are taken off the queue in batches and the handler is
+        flushed once per batch instead of once per record.
+
+        Args:
+            records (queue.SimpleQueue): Queue fed by ``DeferredQueueHandler``
+            handler (logging.Handler): Destination handler
+        """
+        self.records = records
+        self.handler = handler
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the writer thread"""
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='soul-log-writer')
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write every queued record and stop the writer thread"""
+        if self._thread is not None:
+            self.records.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Handle batches of records until the stop sentinel arrives"""
+        while True:
+            batch: List[Optional[logging.LogRecord]] = [self.records.get()]
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(self.records.get_nowait())
+            except queue.Empty:
+                pass
+            for record in batch:
+                if record is None:
+                    self.handler.flush()
+                    return
+                if record.levelno >= self.handler.level:
+                    self.handler.handle(record)
+            self.handler.flush()
+
+_handler: Optional[DeferredQueueHandler] = None
+_writer: Optional[LogWriter] = None
+_owned_target: Optional[logging.Handler] = None
+# Kernel logger level and ``logging`` flags to put back on disable
+_saved: Dict[str, Any] = {}
+
+# Process-wide ``logging`` attributes switched off by ``lean_records``
+_LEAN_FLAGS = ('_srcfile', 'logThreads', 'logProcesses', 'logMultiprocessing')
+
+def enable_logging(filename: str = 'log.txt', level: int = logging.INFO,
+                   handler: Optional[logging.Handler] = None,
+                   lean_records: bool = False) -> LogWriter:
+    """
+    Route kernel log records to a background JSON Lines writer
+
+    Kernel modules only create loggers and never configure logging, so
+    nothing is written unless an application opts in here (or configures
+    the ``soul_cycle_kernel`` logger itself). Records are queued without
+    formatting and written in batches by a background thread, keeping
+    formatting and file I/O off the simulation path. Calling this again
+    replaces the previous pipeline; ``disable_logging`` restores the
+    kernel logger's previous level, and runs at interpreter exit so
+    queued records are written even if the application never calls it.
+
+    ``lean_records`` opts into turning off the process-wide ``logging``
+    flags for caller, thread and process lookup, as recommended in the
+    logging HOWTO's optimization notes; this halves the cost of creating
+    each record but leaves those attributes empty for every logger until
+    ``disable_logging`` restores them.
+
+    Args:
+        filename (str): JSON Lines file to append to
+        level (int): Minimum level recorded
+        handler (Optional[logging.Handler]): Destination handler to use
+            instead of a file; it gets a ``JSONLinesFormatter`` if it has
+            no formatter
+        lean_records (bool): Skip caller, thread and process lookups
+            when creating records
+
+    Returns:
+        LogWriter: The running background writer
+    """
+    global _handler, _writer, _owned_target
+    disable_logging()
+
+    target = handler
+    if target is None:
+        target = _owned_target = BufferedFileHandler(filename, encoding='utf-8')
+    if target.formatter is None:
+        target.setFormatter(JSONLinesFormatter())
+
+    logger = logging.getLogger(KERNEL_LOGGER)
+    _saved['level'] = logger.level
+    if lean_records:
+        _saved['flags'] = {name: getattr(logging, name) for name in _LEAN_FLAGS}
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+    records: 'queue.SimpleQueue[Optional[logging.LogRecord]]' = queue.SimpleQueue()
+    _handler = DeferredQueueHandler(records)
+    _writer = LogWriter(records, target)
+
+    logger.setLevel(level)
+    logger.addHandler(_handler)
+    _writer.start()
+    # The writer is a daemon thread: drain it at exit, registered only once
+    atexit.unregister(disable_logging)
+    atexit.register(disable_logging)
+    return _writer
+
+def disable_logging() -> None:
+    """
+    Stop the background writer, flushing queued records, and detach it
+
+    The kernel logger's level and any ``logging`` flags changed by
+    ``enable_logging`` are restored; other handlers are left alone.
+    """
+    global _handler, _writer, _owned_target
+    if _handler is None:
+        return
+    logger = logging.getLogger(KERNEL_LOGGER)
+    logger.removeHandler(_handler)
+    logger.setLevel(_saved.pop('level', logging.NOTSET))
+    for name, value in _saved.pop('flags', {}).items():
+        setattr(logging, name, value)
+    _writer.stop()
+    if _owned_target is not None:
+        _owned_target.close()
+    _handler = None
+    _writer = None
+    _owned_target = None
@@ -3,7 +3,7 @@ Test run demonstration of the AI Soul Core capabilities
 """
 
 import time
-from soul_cycle_kernel import SoulAI
+from soul_cycle_kernel import SoulAI, enable_logging
 from rich.console import Console
 
 console = Console()
@@ -53,4 +53,5 @@ def run_demo():
     console.print("\n[bold green]Demonstration completed![/bold green]")
 
 if __name__ == "__main__":
+    enable_logging('log.txt')
     run_demo()
@@ -0,0 +1,112 @@
+import random
+import unittest
+
+import numpy as np
+
+from soul_cycle_kernel.behavior import BEHAVIORS, BehaviorClassifier
+from soul_cycle_kernel.emotion_engine import EMOTIONS, EmotionEngine
+from soul_cycle_kernel.parallel import ShardedSimulation
+from soul_cycle_kernel.population import SoulPopulation
+
+THRESHOLDS = {'low': 0.3, 'medium': 0.6, 'high': 0.8}
+
+# Joy in two intensity bands plus one fear rule
+MOODS = (
+    ('joy', 0.9, 'ecstatic'),
+    ('joy', 'medium', 'cheerful'),
+    ('fear', 'high', 'panicked')
+)
+
+def if_chain(state):
+    """The hard-coded classification the default rules replace"""
+    emotion, intensity = max(state.items(), key=lambda x: x[1])
+    if intensity < 0.3:
+        return "neutral"
+    rules = {'curiosity': (0.6, "exploratory"), 'love': (0.8, "deeply connected"),
+             'fear': (0.6, "withdrawn"), 'joy': (0.8, "exuberant"),
+             'sadness': (0.6, "reflective"), 'anger': (0.6, "agitated"),
+             'hope': (0.6, "optimistic")}
+    threshold, behavior = rules[emotion]
+    return behavior if intensity > threshold else "stable"
+
+class TestBehaviorClassifier(unittest.TestCase):
+    def setUp(self):
+        """Set up random states, including exact threshold values and ties"""
+        rng = random.Random(11)
+        values = [0.0, 0.3, 0.6, 0.8, 0.9, 1.0]
+        self.states = [
+            {emotion: rng.choice(values) if rng.random() < 0.3 else rng.random()
+             for emotion in EMOTIONS}
+            for _ in range(2000)
+        ]
+        self.matrix = np.array([[state[e] for e in EMOTIONS] for state in self.states])
+
+    def test_default_rules_match_if_chain(self):
+        """The compiled default rules classify like the original if/elif chain"""
+        classifier = BehaviorClassifier(EMOTIONS, THRESHOLDS)
+        self.assertEqual(classifier.behaviors, BEHAVIORS)
+        expected = [if_chain(state) for state in self.states]
+        self.assertEqual([classifier.classify(state) for state in self.states], expected)
+        self.assertEqual(classifier.names(classifier.classify_many(self.matrix)), expected)
+        self.assertEqual(BEHAVIORS[classifier.classify_many(self.matrix[3])], expected[3])
+
+    def test_custom_vocabulary(self):
+        """Custom rules with intensity bands classify alike one by one and in batch"""
+        classifier = BehaviorClassifier(EMOTIONS, THRESHOLDS, MOODS, fallback='calm')
+        self.assertEqual(classifier.behaviors,
+                         ('neutral', 'calm', 'ecstatic', 'cheerful', 'panicked'))
+        state = dict.fromkeys(EMOTIONS, 0.0)
+        for joy, behavior in ((0.2, 'neutral'), (0.5, 'calm'), (0.7, 'cheerful'),
+                              (0.95, 'ecstatic')):
+            state['joy'] = joy
+            self.assertEqual(classifier.classify(state), behavior)
+        scalar = [classifier.classify(state) for state in self.states]
+        self.assertEqual(classifier.names(classifier.classify_many(self.matrix)), scalar)
+        with self.assertRaises(ValueError):
+            BehaviorClassifier(EMOTIONS, THRESHOLDS, [('envy', 'high', 'bitter')])
+        with self.assertRaises(ValueError):
+            BehaviorClassifier(EMOTIONS, THRESHOLDS, [('joy', 'extreme', 'giddy')])
+
+    def test_engine_caches_until_the_state_changes(self):
+        """The engine classifies once per state change and notices threshold edits"""
+        engine = EmotionEngine()
+        calls = []
+        classify = engine.get_classifier().classify
+        engine.get_classifier().classify = lambda state: calls.append(1) or classify(state)
+        engine.update_emotion('joy', 0.9)
+        for _ in range(3):
+            self.assertEqual(engine.get_emergent_behavior(), "exuberant")
+        self.assertEqual(len(calls), 1)
+        engine.decay_emotions()
+        self.assertEqual(engine.get_emergent_behavior(), "stable")
+        self.assertEqual(len(calls), 2)
+
+        engine.thresholds = {'low': 0.3, 'medium': 0.6, 'high': 0.75}
+        self.assertEqual(engine.get_emergent_behavior(), "exuberant")
+        engine.thresholds['high'] = 0.85
+        self.assertEqual(engine.get_emergent_behavior(), "stable")
+        engine.thresholds['high'] = 0.75
+        engine.set_behavior_rules(MOODS)
+        self.assertEqual(engine.get_emergent_behavior(), "cheerful")
+
+    def test_population_uses_custom_rules(self):
+        """Populations and shards classify with the template's rules"""
+        template = EmotionEngine(behavior_rules=MOODS)
+        engines = []
+        for state in self.states[:50]:
+            engine = EmotionEngine(behavior_rules=MOODS)
+            engine.load_state(state)
+            engines.append(engine)
+        population = SoulPopulation.from_engines(engines)
+        self.assertEqual(population.get_behavior_names(),
+                         [engine.get_emergent_behavior() for engine in engines])
+
+        population = SoulPopulation(4, template)
+        population.update_emotion('joy', 1.0, souls=[0, 1])
+        population.update_emotion('fear', 1.0, souls=[2, 3])
+        with ShardedSimulation(workers=0) as simulation:
+            result = simulation.run(population, 3, shards=2)
+        self.assertEqual(result['patterns'], {'cheerful': 6, 'panicked': 2, 'stable': 4})
+
+if __name__ == '__main__':
+    unittest.main()
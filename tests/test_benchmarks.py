@@ -0,0 +1,47 @@
+import unittest
+
+from benchmarks.suite import BenchmarkSuite, compare, measure
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_measure(self):
+        """Latency percentiles, throughput and peak memory are reported"""
+        result = measure(lambda: [0] * 1000, 50)
+        self.assertEqual(result['iterations'], 50)
+        self.assertLessEqual(result['p50_us'], result['p99_us'])
+        self.assertLessEqual(result['p99_us'], result['max_us'])
+        self.assertGreater(result['ops_per_sec'], 0)
+        self.assertGreater(result['peak_kib'], 0)
+
+    def test_run_covers_hot_paths(self):
+        """A tiny run measures every hot path for each parameter"""
+        report = BenchmarkSuite(memory_sizes=[5, 10], history_lengths=[8],
+                                iterations=10).run()
+        results = report['results']
+        self.assertIn('engine.update_emotion[history=8]', results)
+        self.assertIn('engine.decay_emotions[history=8]', results)
+        for size in (5, 10):
+            for case in ('soul.process_input', 'soul.simulate_time_step',
+                         'memory.load', 'memory.store',
+                         'memory.get_emotional_history'):
+                self.assertIn(f'{case}[memories={size}]', results)
+        self.assertIn('cli.detect_emotion', results)
+        self.assertEqual(report['meta']['memory_sizes'], [5, 10])
+
+    def test_compare_flags_regressions(self):
+        """Only metrics that grew beyond the threshold are reported"""
+        baseline = {'results': {
+            'a': {'p50_us': 10.0, 'peak_kib': 4.0},
+            'b': {'p50_us': 10.0, 'peak_kib': 4.0}
+        }}
+        current = {'results': {
+            'a': {'p50_us': 11.0, 'peak_kib': 4.0},
+            'b': {'p50_us': 13.0, 'peak_kib': 2.0},
+            'new': {'p50_us': 99.0, 'peak_kib': 99.0}
+        }}
+        regressions = compare(current, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('b p50_us'))
+        self.assertEqual(compare(current, baseline, threshold=0.5), [])
+
+if __name__ == '__main__':
+    unittest.main()
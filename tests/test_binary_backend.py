@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from soul_cycle_kernel.binary_backend import (HEADER_SIZE, BinaryBackend, record_dtype,
+                                              widen_intensities)
+from soul_cycle_kernel.memory_system import MemorySystem
+
+class TestBinaryBackend(unittest.TestCase):
+    def setUp(self):
+        """Set up a memory system on a temporary binary file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory_file = os.path.join(self.tmpdir.name, 'soul.json')
+        self.memory = self.open_memory()
+        self.start = datetime(2024, 1, 1)
+        self.memory.backend.append([
+            {
+                'timestamp': (self.start + timedelta(minutes=step)).isoformat(),
+                'emotional_state': {'joy': step / 10, 'fear': 0.3},
+                'behavior': 'exuberant' if step % 2 else 'stable',
+                'trigger': f'event {step % 3}' if step % 4 else None
+            }
+            for step in range(10)
+        ])
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def open_memory(self) -> MemorySystem:
+        return MemorySystem(self.memory_file, backend=BinaryBackend(self.memory_file))
+
+    def test_record_layout(self):
+        """Records are 41 packed bytes read back through a memory map"""
+        self.assertEqual(record_dtype().itemsize, 41)
+        backend = self.memory.backend
+        self.assertEqual(os.path.getsize(backend.data_file), HEADER_SIZE + 10 * 41)
+        self.assertIsInstance(backend._records(), np.memmap)
+
+    def test_round_trip(self):
+        """Values read back as stored, including across a reopen"""
+        self.memory.close()
+        self.memory = self.open_memory()
+        memories = self.memory.get_recent_memories(3)
+        self.assertEqual([m['emotional_state']['joy'] for m in memories], [0.7, 0.8, 0.9])
+        self.assertEqual(memories[0]['timestamp'],
+                         (self.start + timedelta(minutes=7)).isoformat())
+        self.assertEqual([m['trigger'] for m in memories], ['event 1', None, 'event 0'])
+        self.assertEqual(memories[0]['emotional_state']['sadness'], 0.0)
+
+    def test_queries(self):
+        """History, patterns, windows and summaries are answered from the records"""
+        history = self.memory.get_emotional_history('joy', 0.7)
+        self.assertEqual([m['emotional_state']['joy'] for m in history], [0.8, 0.9])
+        self.assertEqual(self.memory.get_emotional_history('fear', 0.3), [])
+        self.assertEqual(self.memory.get_behavior_patterns(), {'stable': 5, 'exuberant': 5})
+        window = self.memory.query_memories(
+            since=self.start + timedelta(minutes=2),
+            until=self.start + timedelta(minutes=6), behavior='stable')
+        self.assertEqual([m['emotional_state']['joy'] for m in window], [0.2, 0.4])
+        summary = self.memory.summarize_memories(since=self.start + timedelta(minutes=5))
+        self.assertEqual(summary['count'], 5)
+        self.assertAlmostEqual(summary['mean']['joy'], 0.7, places=6)
+
+    def test_store_and_clear(self):
+        """MemorySystem stores go through the binary backend"""
+        self.memory.store_emotional_state({'hope': 0.6}, 'optimistic', 'sunrise')
+        latest = self.memory.get_recent_memories(1)[0]
+        self.assertEqual((latest['behavior'], latest['trigger']), ('optimistic', 'sunrise'))
+        self.memory.clear_memories()
+        self.assertEqual(self.memory.get_recent_memories(), [])
+
+    def test_truncated_record_is_dropped(self):
+        """A partial trailing record from an interrupted write is cut off"""
+        data_file = self.memory.backend.data_file
+        self.memory.close()
+        with open(data_file, 'ab') as f:
+            f.write(b'\x01\x02\x03')
+        self.memory = self.open_memory()
+        self.assertEqual(len(self.memory.backend), 10)
+        self.assertEqual(os.path.getsize(data_file), HEADER_SIZE + 10 * 41)
+
+    def test_torn_string_entry_is_dropped(self):
+        """A partial trailing string table entry is cut off before new ids are assigned"""
+        strings_file = self.memory.backend.strings_file
+        self.memory.close()
+        with open(strings_file, 'ab') as f:
+            f.write(b'["trigger", "half wri')
+        self.memory = self.open_memory()
+        self.memory.store_emotional_state({'hope': 0.6}, 'optimistic', 'sunrise')
+        self.memory.close()
+        self.memory = self.open_memory()
+        latest = self.memory.get_recent_memories(2)
+        self.assertEqual([(m['behavior'], m['trigger']) for m in latest],
+                         [('exuberant', 'event 0'), ('optimistic', 'sunrise')])
+        with open(strings_file, 'rb') as f:
+            self.assertTrue(f.read().endswith(b'["trigger", "sunrise"]\n'))
+
+    def test_widen_intensities(self):
+        """Widened intensities match the shortest float32 decimals"""
+        values = np.random.default_rng(5).random(10000, dtype=np.float32)
+        values[:4] = [0.3, 0.0, 1.0, 1e-12]
+        expected = [float(str(value)) for value in values]
+        self.assertEqual(widen_intensities(values).tolist(), expected)
+
+    def test_converts_json_journal(self):
+        """An existing JSON Lines journal is converted on first open"""
+        path = os.path.join(self.tmpdir.name, 'old.json')
+        with MemorySystem(path) as journal:
+            journal.store_emotional_state({'love': 0.9}, 'deeply connected', 'hug')
+        with MemorySystem(path, backend=BinaryBackend(path)) as binary:
+            self.assertEqual(binary.get_behavior_patterns(), {'deeply connected': 1})
+            self.assertEqual(binary.get_recent_memories()[0]['emotional_state']['love'], 0.9)
+
+if __name__ == '__main__':
+    unittest.main()
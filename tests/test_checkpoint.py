@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from soul_cycle_kernel.clock import VirtualClock
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.simulation_engine import SoulAI
+from soul_cycle_kernel.storage import SegmentedBackend
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary memory file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory_file = os.path.join(self.tmpdir.name, 'soul.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_soul(self, **options) -> SoulAI:
+        memory = MemorySystem(self.memory_file, checkpoint_every=10, **options)
+        return SoulAI(clock=VirtualClock(), memory_system=memory)
+
+    def run_soul(self, soul: SoulAI) -> None:
+        """Feed the soul a mix of inputs and time steps"""
+        soul.start_simulation()
+        for step in range(25):
+            soul.process_input(['joy', 'fear', 'love'][step % 3], 0.3, f'event {step}')
+            soul.simulate_time_step()
+
+    def test_restart_restores_state(self):
+        """A restarted soul resumes its emotions and tick instead of starting at zero"""
+        soul = self.make_soul()
+        self.run_soul(soul)
+        state, tick = soul.get_current_state(), soul.simulation.get_current_tick()
+        soul.memory_system.close()
+
+        restarted = self.make_soul()
+        self.assertEqual(restarted.get_current_state(), state)
+        self.assertEqual(restarted.simulation.get_current_tick(), tick)
+        self.assertTrue(restarted.simulation.is_running())
+
+    def test_restart_after_advance(self):
+        """A soul restarted after a fast-forward resumes its final state and tick"""
+        soul = self.make_soul()
+        soul.start_simulation()
+        soul.process_input('joy', 0.5)
+        soul.advance(100)
+        state, tick = soul.get_current_state(), soul.simulation.get_current_tick()
+        self.assertEqual((state['joy'], tick), (0.0, 100))
+        soul.memory_system.close()
+
+        restarted = self.make_soul()
+        self.assertEqual(restarted.get_current_state(), state)
+        self.assertEqual(restarted.simulation.get_current_tick(), tick)
+
+        restarted.simulate_time_step()
+        restarted.memory_system.close()
+        self.assertEqual(self.make_soul().simulation.get_current_tick(), tick + 1)
+
+    def test_restart_reads_only_the_tail(self):
+        """Recovery replays records since the checkpoint and leaves segments sealed"""
+        soul = self.make_soul()
+        self.run_soul(soul)
+        soul.memory_system.close()
+
+        memory = MemorySystem(self.memory_file, checkpoint_every=10)
+        backend = memory.backend
+        self.assertEqual(len(backend.tail), 50 - backend.sealed)
+        self.assertLessEqual(len(backend.tail), 10)
+        self.assertEqual(memory.memories, [])
+        self.assertEqual(sum(memory.get_behavior_patterns().values()), 50)
+        self.assertEqual(len(backend._cache), 0)
+        memory.close()
+
+    def test_queries_match_unsegmented_storage(self):
+        """Queries over sealed segments and the tail match a plain journal"""
+        soul = self.make_soul()
+        self.run_soul(soul)
+        segmented = soul.memory_system
+        plain = MemorySystem(os.path.join(self.tmpdir.name, 'plain.json'))
+        plain.store_emotional_states(
+            (m['emotional_state'], m['behavior'], m['trigger'])
+            for m in segmented.backend.load()
+        )
+
+        self.assertEqual(segmented.get_behavior_patterns(), plain.get_behavior_patterns())
+        for emotion in ('joy', 'fear', 'love'):
+            self.assertEqual(
+                [m['trigger'] for m in segmented.get_emotional_history(emotion, 0.2)],
+                [m['trigger'] for m in plain.get_emotional_history(emotion, 0.2)]
+            )
+        self.assertEqual(
+            [m['trigger'] for m in segmented.get_recent_memories(12)],
+            [m['trigger'] for m in plain.get_recent_memories(12)]
+        )
+        future = datetime.now() + timedelta(days=1)
+        self.assertEqual(segmented.query_memories(since=future), [])
+        self.assertEqual(segmented.summarize_memories()['count'], 50)
+        segmented.close()
+        plain.close()
+
+    def test_compaction_merges_segments(self):
+        """Checkpoint segments are merged up to the segment size"""
+        backend = SegmentedBackend(self.memory_file, segment_size=25)
+        memory = MemorySystem(self.memory_file, checkpoint_every=5, backend=backend)
+        for step in range(60):
+            memory.store_emotional_state({'joy': step / 60}, 'stable', str(step))
+        memory.checkpoint()
+
+        self.assertEqual([(s['start'], s['stop']) for s in backend.segments],
+                         [(0, 25), (25, 50), (50, 60)])
+        self.assertEqual(sorted(os.listdir(backend.segment_dir)),
+                         [s['file'] for s in backend.segments])
+        self.assertEqual([m['trigger'] for m in backend.load()],
+                         [str(step) for step in range(60)])
+        memory.close()
+
+    def test_interrupted_checkpoint_keeps_records(self):
+        """A journal sealed without a manifest update is moved back into the tail"""
+        memory = MemorySystem(self.memory_file, checkpoint_every=100)
+        for step in range(3):
+            memory.store_emotional_state({'joy': 0.1}, 'stable', str(step))
+        memory.checkpoint()
+        for step in range(3, 6):
+            memory.store_emotional_state({'joy': 0.1}, 'stable', str(step))
+        backend = memory.backend
+        memory.close()
+        os.replace(backend.journal_file,
+                   os.path.join(backend.segment_dir, '000000000003-000000000006.jsonl'))
+
+        recovered = MemorySystem(self.memory_file, checkpoint_every=100)
+        self.assertEqual([m['trigger'] for m in recovered.backend.tail], ['3', '4', '5'])
+        self.assertEqual(len(recovered.backend.load()), 6)
+        recovered.close()
+
+    def test_reopen_after_migrating_legacy_file(self):
+        """A migrated legacy file is not migrated again over sealed segments"""
+        legacy = {'timestamp': datetime(2024, 1, 1).isoformat(),
+                  'emotional_state': {'joy': 0.5}, 'behavior': 'stable', 'trigger': 'legacy'}
+        with open(self.memory_file, 'w') as f:
+            json.dump([legacy], f)
+        memory = MemorySystem(self.memory_file, checkpoint_every=2)
+        for step in range(5):
+            memory.store_emotional_state({'joy': 0.1}, 'stable', str(step))
+        memory.checkpoint()
+        memory.close()
+
+        reopened = MemorySystem(self.memory_file, checkpoint_every=2)
+        self.assertEqual([m['trigger'] for m in reopened.backend.load()],
+                         ['legacy', '0', '1', '2', '3', '4'])
+        self.assertEqual(sorted(os.listdir(reopened.backend.segment_dir)),
+                         [s['file'] for s in reopened.backend.segments])
+        reopened.close()
+
+    def test_clear_memories(self):
+        """Clearing drops sealed segments as well as the tail"""
+        soul = self.make_soul()
+        self.run_soul(soul)
+        soul.memory_system.clear_memories()
+        self.assertEqual(soul.get_behavior_patterns(), {})
+        self.assertEqual(os.listdir(soul.memory_system.backend.segment_dir), [])
+        soul.memory_system.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,50 @@
+import random
 import unittest
 from interface.cli_interface import CLIInterface
+from interface.keyword_matcher import KeywordMatcher
+
+def substring_detect(emotion_map, text):
+    """The original rule: the first emotion, in map order, with a keyword in the text"""
+    text = text.lower()
+    for emotion, keywords in emotion_map.items():
+        for keyword in keywords:
+            if keyword in text:
+                return emotion
+    return "neutral"
+
+def substring_count(emotion_map, text):
+    """Occurrences of every keyword in the text, overlapping ones included"""
+    text = text.lower()
+    return {
+        emotion: sum(
+            sum(text.startswith(keyword, start) for start in range(len(text)))
+            for keyword in keywords
+        )
+        for emotion, keywords in emotion_map.items()
+    }
+
+# (text, description of what the case exercises)
+MATCHER_CASES = [
+    ("", "empty text"),
+    ("The sky is blue", "no keyword"),
+    ("I feel HOPELESS", "upper case"),
+    ("Hopeless, yet hopeful", "keyword inside a longer keyword of another emotion"),
+    ("I'm not madder than usual", "keyword inside a longer word"),
+    ("Showing up downtown", "keywords without word boundaries"),
+    ("what if it's impossible", "multi-word keyword and a nested one"),
+    ("is it possible? can i?", "multi-word keywords sharing words"),
+    ("lovelove", "repeated overlapping keyword"),
+    ("curious and happy", "lower-priority emotion first in the text"),
+    ("worried, afraid and scared", "several keywords of one emotion"),
+    ("howhy", "keywords overlapping each other"),
+]
+
+# Keywords that are prefixes and suffixes of each other across emotions
+NESTED_MAP = {
+    "a": ["abc", "x"],
+    "b": ["ab", "bcd"],
+    "c": ["b", "cd"],
+}
 
 class TestCLIInterface(unittest.TestCase):
     def setUp(self):
@@ -23,6 +68,45 @@ class TestCLIInterface(unittest.TestCase):
         # Test neutral case
         self.assertEqual(self.cli.detect_emotion("The sky is blue"), "neutral")
         
+    def test_batch_detection_matches_single_detection(self):
+        """Test that batch detection agrees with per-message detection"""
+        texts = self.cli.test_inputs + ["The sky is blue", "HOPELESS but hopeful"]
+        self.assertEqual(
+            self.cli.detect_emotions_batch(texts),
+            [self.cli.detect_emotion(text) for text in texts]
+        )
+
+    def test_matcher_matches_substring_rule(self):
+        """The compiled matcher agrees with the original substring rule"""
+        emotion_map = self.cli.emotion_map
+        matcher = KeywordMatcher(emotion_map)
+        for text, case in MATCHER_CASES:
+            with self.subTest(case=case, text=text):
+                self.assertEqual(self.cli.detect_emotion(text),
+                                 substring_detect(emotion_map, text))
+                self.assertEqual(matcher.count(text.lower()),
+                                 substring_count(emotion_map, text))
+
+    def test_nested_keywords_match_substring_rule(self):
+        """Keywords nested in each other are credited as with substring tests"""
+        matcher = KeywordMatcher(NESTED_MAP)
+        rng = random.Random(3)
+        texts = ["".join(rng.choice("abcdx ") for _ in range(rng.randint(0, 12)))
+                 for _ in range(500)]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(matcher.detect(text), substring_detect(NESTED_MAP, text))
+                self.assertEqual(matcher.count(text), substring_count(NESTED_MAP, text))
+        self.assertEqual(KeywordMatcher({}).detect("anything"), "neutral")
+
+    def test_emotion_counts(self):
+        """Test per-emotion keyword hit counts, including nested keywords"""
+        counts = self.cli.count_emotions("I hope I'm not hopeless. How?")
+        self.assertEqual(counts["hope"], 2)
+        self.assertEqual(counts["sadness"], 1)
+        self.assertEqual(counts["curiosity"], 1)
+        self.assertEqual(counts["joy"], 0)
+
     def test_responses(self):
         """Test that appropriate responses are returned for emotions"""
         self.assertIn("endure", self.cli.responses["sadness"])
@@ -0,0 +1,69 @@
+import time
+import unittest
+
+from soul_cycle_kernel.clock import FixedRateClock, VirtualClock
+from soul_cycle_kernel.simulation_engine import SimulationEngine
+
+class FakeTime:
+    """Manually driven time source"""
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestClocks(unittest.TestCase):
+    def test_virtual_clock_advances_instantly(self):
+        """Virtual ticks move virtual time without sleeping"""
+        clock = VirtualClock()
+        simulation = SimulationEngine(tick_duration=1.0, clock=clock)
+        simulation.start()
+        for _ in range(1000):
+            simulation.tick()
+        simulation.advance(500)
+        self.assertEqual(simulation.get_current_tick(), 1500)
+        self.assertEqual(clock.now(), 1500.0)
+
+    def test_default_clock_uses_engine_tick_duration(self):
+        """The default clock sleeps the engine's tick duration even before start"""
+        simulation = SimulationEngine(tick_duration=0.01)
+        self.assertEqual(simulation.clock.tick_duration, 0.01)
+        began = time.monotonic()
+        simulation.tick()
+        self.assertLess(time.monotonic() - began, 0.5)
+
+    def test_fixed_rate_clock_compensates_for_processing_time(self):
+        """Sleeps shrink by the time spent processing each tick"""
+        fake = FakeTime()
+        clock = FixedRateClock(time_source=fake, sleep=fake.sleep)
+        simulation = SimulationEngine(tick_duration=1.0, clock=clock)
+        simulation.start()
+        for _ in range(5):
+            fake.now += 0.25
+            simulation.tick()
+        self.assertEqual(fake.sleeps, [0.75] * 5)
+        self.assertEqual(fake.now, 105.0)
+        self.assertEqual(simulation.get_clock_stats()['overruns'], 0)
+
+    def test_fixed_rate_clock_skips_missed_deadlines(self):
+        """An overrunning tick realigns to the schedule and is reported"""
+        fake = FakeTime()
+        clock = FixedRateClock(time_source=fake, sleep=fake.sleep)
+        clock.start(1.0)
+        fake.now += 3.5
+        clock.wait_for_next_tick()
+        clock.wait_for_next_tick()
+
+        stats = clock.get_stats()
+        self.assertEqual(stats['overruns'], 1)
+        self.assertEqual(stats['skipped_ticks'], 2)
+        self.assertEqual(stats['max_lag'], 2.5)
+        self.assertEqual(fake.now, 104.0)
+
+if __name__ == '__main__':
+    unittest.main()
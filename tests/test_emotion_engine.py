@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+
+from soul_cycle_kernel.emotion_engine import EmotionEngine
+from soul_cycle_kernel.history_buffer import HistorySpillWriter
+
+class TestEmotionEngine(unittest.TestCase):
+    def setUp(self):
+        """Set up two engines with the same starting state"""
+        self.fast = EmotionEngine()
+        self.slow = EmotionEngine()
+        for engine in (self.fast, self.slow):
+            engine.update_emotion('joy', 0.95)
+            engine.update_emotion('love', 0.9)
+            engine.update_emotion('fear', 0.65)
+
+    def test_advance_matches_repeated_decay(self):
+        """Fast-forwarding gives the same state as ticking one at a time"""
+        behaviors = [self.slow.get_emergent_behavior()]
+        for _ in range(200):
+            self.slow.decay_emotions()
+            behaviors.append(self.slow.get_emergent_behavior())
+
+        transitions = self.fast.advance(200)
+
+        self.assertEqual(self.fast.get_emotional_state(), self.slow.get_emotional_state())
+        expected = [
+            (tick, behaviors[tick]) for tick in range(1, len(behaviors))
+            if behaviors[tick] != behaviors[tick - 1]
+        ]
+        self.assertEqual([(tick, behavior) for tick, _, behavior in transitions], expected)
+
+    def test_advance_steps_every_tick_of_unsettled_state(self):
+        """A negative decay rate never settles, so every tick is stepped"""
+        for engine in (self.fast, self.slow):
+            engine.decay_rates['joy'] = -0.01
+        for _ in range(50):
+            self.slow.decay_emotions()
+        self.fast.advance(50)
+        self.assertEqual(self.fast.get_emotional_state(), self.slow.get_emotional_state())
+
+    def test_advance_records_only_transitions(self):
+        """Only behavior transitions are added to the history"""
+        recorded = len(self.fast.history)
+        transitions = self.fast.advance(10 ** 9)
+        self.assertEqual(len(self.fast.history), recorded + len(transitions))
+        self.assertEqual(self.fast.get_emergent_behavior(), "neutral")
+
+    def test_history_is_bounded(self):
+        """History keeps only the most recent states once full"""
+        engine = EmotionEngine(history_capacity=8)
+        for step in range(20):
+            engine.update_emotion('joy', 0.01 * step)
+        self.assertEqual(len(engine.history), 8)
+        self.assertEqual(engine.history.total_recorded, 20)
+
+        timestamp, state = engine.history[-1]
+        self.assertAlmostEqual(state['joy'], engine.current_state['joy'], places=6)
+        timestamps, intensities = engine.history.last(3)
+        self.assertEqual(intensities.shape, (3, 7))
+        self.assertEqual(len(engine.history.window(since=timestamp)[0]), 1)
+
+    def test_history_spills_evicted_states(self):
+        """Evicted states are handed to the spill hook instead of dropped"""
+        with tempfile.TemporaryDirectory() as directory:
+            spill = HistorySpillWriter(directory)
+            timestamps, intensities = spill.load()
+            self.assertEqual((timestamps.shape, intensities.shape), ((0,), (0, 7)))
+            engine = EmotionEngine(history_capacity=8, history_spill=spill)
+            for _ in range(20):
+                engine.update_emotion('fear', 0.05)
+
+            spilled, _ = spill.load()
+            self.assertEqual(len(spilled) + len(engine.history), 20)
+            kept, _ = engine.history.as_arrays()
+            self.assertTrue((spilled[-1] <= kept[0]))
+
+if __name__ == '__main__':
+    unittest.main()
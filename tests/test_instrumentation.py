@@ -0,0 +1,113 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from interface.cli_interface import CLIInterface
+from soul_cycle_kernel.clock import VirtualClock
+from soul_cycle_kernel.instrumentation import (LatencyHistogram, disable_instrumentation,
+                                               enable_instrumentation, get_instrumentation)
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.simulation_engine import SoulAI
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        """Set up a soul backed by a temporary memory file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.soul = SoulAI(clock=VirtualClock(),
+                           memory_system=MemorySystem(os.path.join(self.tmpdir.name, 'soul.json')))
+
+    def tearDown(self):
+        disable_instrumentation()
+        self.soul.memory_system.close()
+        self.tmpdir.cleanup()
+
+    def test_disabled_runs_plain_methods(self):
+        """Nothing is wrapped or recorded unless instrumentation is enabled"""
+        plain = SoulAI.process_input
+        enable_instrumentation()
+        self.assertIsNot(SoulAI.process_input, plain)
+        disable_instrumentation()
+        self.assertIs(SoulAI.process_input, plain)
+        self.assertIsNone(get_instrumentation())
+        self.soul.process_input('joy', 0.5)
+
+    def test_wrappers_survive_disable(self):
+        """A wrapper still running when instrumentation is disabled records nothing"""
+        enable_instrumentation()
+        wrapped = SoulAI.process_input
+        disable_instrumentation()
+        wrapped(self.soul, 'joy', 0.5)
+        self.assertEqual(len(self.soul.memory_system.memories), 1)
+
+    def test_stages_are_timed(self):
+        """Each hot-path stage gets its own histogram"""
+        instrumentation = enable_instrumentation()
+        self.soul.process_input('joy', 0.5, 'sunrise')
+        self.soul.start_simulation()
+        self.soul.simulate_time_step()
+        self.soul.memory_system.flush()
+
+        stages = instrumentation.get_stats()['stages']
+        for stage in ('process_input.update_emotion', 'process_input.get_behavior',
+                      'process_input.memory_write', 'process_input.other',
+                      'process_input.total', 'process_input.log', 'time_step.log',
+                      'time_step.decay', 'time_step.tick_wait',
+                      'time_step.total', 'memory.flush'):
+            self.assertEqual(stages[stage]['count'], 1, stage)
+        self.assertEqual(stages['memory.store']['count'], 2)
+        self.assertEqual(instrumentation.get_stats()['counters']['memory.records_stored'], 2)
+        self.assertEqual(len(self.soul.memory_system.memories), 2)
+
+        self.soul.process_inputs([('fear', 0.9, None), ('hope', 0.4, 'rain')])
+        self.soul.advance(50)
+        stages = instrumentation.get_stats()['stages']
+        self.assertEqual(stages['process_inputs.update_emotion']['count'], 2)
+        self.assertEqual(stages['process_inputs.total']['count'], 1)
+        for stage in ('advance.decay', 'advance.tick_wait', 'advance.total'):
+            self.assertEqual(stages[stage]['count'], 1, stage)
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.get_stats()['stages'], {})
+
+    def test_histogram_percentiles(self):
+        """Percentiles land within the bucket resolution"""
+        histogram = LatencyHistogram()
+        for ns in range(1, 10001):
+            histogram.record(ns * 1000)
+        stats = histogram.get_stats()
+        self.assertEqual(stats['count'], 10000)
+        self.assertAlmostEqual(stats['p50_us'], 5000, delta=5000 / 16)
+        self.assertAlmostEqual(stats['p99_us'], 9900, delta=9900 / 16)
+        self.assertEqual(stats['max_us'], 10000)
+
+    def test_snapshot_export(self):
+        """Disabling writes a final snapshot file"""
+        snapshot = os.path.join(self.tmpdir.name, 'stats.json')
+        enable_instrumentation(snapshot, interval=60)
+        self.soul.process_input('fear', 0.3)
+        disable_instrumentation()
+        with open(snapshot) as f:
+            stats = json.load(f)
+        self.assertEqual(stats['stages']['process_input.total']['count'], 1)
+
+    def test_stats_command(self):
+        """The CLI toggles instrumentation and prints the stage table"""
+        cli = CLIInterface(soul=self.soul)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.onecmd('stats')
+            cli.onecmd('stats on')
+            cli.onecmd('feel joy 0.5')
+            cli.onecmd('stats')
+            cli.onecmd('stats off')
+        text = output.getvalue()
+        self.assertIn("Instrumentation is off", text)
+        self.assertIn("process_input.memory_write", text)
+        self.assertIn("memory.records_stored: 1", text)
+        self.assertIsNone(get_instrumentation())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from soul_cycle_kernel.emotion_engine import EmotionEngine
+from soul_cycle_kernel.interactions import EmotionInteractions
+from soul_cycle_kernel.population import SoulPopulation
+
+# Joy lifts hope, love lifts joy; every row sums to at most one
+CONTRACTIVE = {'hope': {'joy': 0.05}, 'joy': {'love': 0.02}, 'curiosity': {'joy': 0.04}}
+
+# Fear suppresses joy and anger feeds fear, so clipping can apply
+CLIPPING = {'joy': {'fear': -0.3}, 'fear': {'anger': 0.4}}
+
+class TestEmotionInteractions(unittest.TestCase):
+    def make_engine(self, coupling) -> EmotionEngine:
+        engine = EmotionEngine(interactions=EmotionInteractions(coupling))
+        engine.update_emotion('joy', 0.95)
+        engine.update_emotion('love', 0.9)
+        engine.update_emotion('fear', 0.65)
+        engine.update_emotion('anger', 0.5)
+        return engine
+
+    def test_model(self):
+        """The matrix combines decay and coupling, and powers match NumPy's"""
+        model = EmotionInteractions(CONTRACTIVE)
+        self.assertTrue(model.contractive)
+        self.assertAlmostEqual(model.matrix[6, 6], 0.95)
+        self.assertEqual(model.matrix[6, 0], 0.05)
+        np.testing.assert_allclose(model.power(37), np.linalg.matrix_power(model.matrix, 37))
+        np.testing.assert_array_equal(model.power(0), np.eye(7))
+        self.assertFalse(EmotionInteractions(CLIPPING).contractive)
+        with self.assertRaises(ValueError):
+            EmotionInteractions({'joy': {'envy': 0.1}})
+
+    def test_jumps_match_single_ticks(self):
+        """Jumps of any length give the same bits as single ticks"""
+        for coupling in (CONTRACTIVE, CLIPPING):
+            slow, fast = self.make_engine(coupling), self.make_engine(coupling)
+            for jump in (1, 3, 17, 64, 5):
+                for _ in range(jump):
+                    slow.decay_emotions()
+                fast.advance(jump)
+                self.assertEqual(fast.get_emotional_state(), slow.get_emotional_state())
+            slow.update_emotion('hope', 0.3)
+            fast.update_emotion('hope', 0.3)
+            for _ in range(40):
+                slow.decay_emotions()
+            fast.advance(40)
+            self.assertEqual(fast.get_emotional_state(), slow.get_emotional_state())
+
+    def test_transitions_match_single_ticks(self):
+        """advance reports the behavior changes seen when ticking one at a time"""
+        for coupling in (CONTRACTIVE, CLIPPING):
+            slow, fast = self.make_engine(coupling), self.make_engine(coupling)
+            behaviors = [slow.get_emergent_behavior()]
+            for _ in range(300):
+                slow.decay_emotions()
+                behaviors.append(slow.get_emergent_behavior())
+            expected = [(tick, behaviors[tick]) for tick in range(1, len(behaviors))
+                        if behaviors[tick] != behaviors[tick - 1]]
+            transitions = fast.advance(300)
+            self.assertEqual([(tick, behavior) for tick, _, behavior in transitions], expected)
+            self.assertEqual(fast.get_emotional_state(), slow.get_emotional_state())
+
+    def test_long_jump_is_bounded(self):
+        """A contractive model settles to neutral and jumps the rest at once"""
+        engine = self.make_engine(CONTRACTIVE)
+        engine.advance(10 ** 12)
+        self.assertEqual(engine.get_emergent_behavior(), "neutral")
+        self.assertLess(max(engine.get_emotional_state().values()), 1e-12)
+
+    def test_default_and_population(self):
+        """Independent decay stays the default; populations reject interactions"""
+        engine = EmotionEngine()
+        engine.update_emotion('joy', 0.5)
+        engine.decay_emotions()
+        self.assertIsNone(engine.interactions)
+        self.assertAlmostEqual(engine.current_state['joy'], 0.4)
+        with self.assertRaises(ValueError):
+            SoulPopulation(4, self.make_engine(CONTRACTIVE))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from soul_cycle_kernel.emotion_engine import EMOTIONS
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.storage import SQLiteBackend
+
+class TestMemorySystem(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary memory file for each test"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory_file = os.path.join(self.tmpdir.name, "soul_memory.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_journal_round_trip(self):
+        """Stored memories are appended to the journal and replayed on load"""
+        memory = MemorySystem(self.memory_file)
+        memory.store_emotional_state({'joy': 0.7}, "stable", "sunrise")
+        memory.store_emotional_state({'fear': 0.9}, "withdrawn")
+
+        with open(memory.backend.journal_file) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        reloaded = MemorySystem(self.memory_file)
+        self.assertEqual(reloaded.memories, memory.memories)
+        self.assertEqual(reloaded.get_behavior_patterns(), {"stable": 1, "withdrawn": 1})
+
+    def test_legacy_file_is_migrated(self):
+        """A legacy JSON array file is read through the migration path"""
+        legacy = [{
+            'timestamp': '2024-01-01T00:00:00',
+            'emotional_state': {'love': 0.9},
+            'behavior': "deeply connected",
+            'trigger': None
+        }]
+        with open(self.memory_file, 'w') as f:
+            json.dump(legacy, f, indent=2)
+
+        memory = MemorySystem(self.memory_file)
+        self.assertEqual(memory.memories, legacy)
+        self.assertTrue(os.path.exists(memory.backend.journal_file))
+
+        memory.store_emotional_state({'love': 0.5}, "stable")
+        self.assertEqual(len(MemorySystem(self.memory_file).memories), 2)
+
+    def test_torn_write_loses_only_last_record(self):
+        """A partially written trailing record is dropped on replay"""
+        memory = MemorySystem(self.memory_file)
+        memory.store_emotional_state({'joy': 0.2}, "neutral")
+        with open(memory.backend.journal_file, 'a') as f:
+            f.write('{"timestamp": "2024-01-01T00:00:00", "emot')
+
+        reloaded = MemorySystem(self.memory_file)
+        self.assertEqual(len(reloaded.memories), 1)
+
+        reloaded.store_emotional_state({'joy': 0.4}, "stable")
+        self.assertEqual(len(MemorySystem(self.memory_file).memories), 2)
+
+    def test_clear_memories(self):
+        """Clearing memories empties the journal"""
+        memory = MemorySystem(self.memory_file)
+        memory.store_emotional_state({'joy': 0.2}, "neutral")
+        memory.clear_memories()
+        self.assertEqual(MemorySystem(self.memory_file).memories, [])
+
+    def test_write_behind_buffers_until_flush(self):
+        """Buffered memories are readable before they reach the journal"""
+        memory = MemorySystem(self.memory_file, write_behind=True,
+                              flush_every=1000, flush_interval=60)
+        memory.store_emotional_state({'hope': 0.6}, "stable", "dawn")
+
+        self.assertEqual(memory.get_recent_memories(1)[0]['trigger'], "dawn")
+        self.assertEqual(MemorySystem(self.memory_file).memories, [])
+
+        memory.flush()
+        self.assertEqual(len(MemorySystem(self.memory_file).memories), 1)
+        memory.close()
+
+    def test_write_behind_flushes_on_record_count(self):
+        """The background flusher writes once enough records are pending"""
+        memory = MemorySystem(self.memory_file, write_behind=True,
+                              flush_every=3, flush_interval=60,
+                              durability='fsync')
+        for _ in range(3):
+            memory.store_emotional_state({'joy': 0.1}, "neutral")
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if len(MemorySystem(self.memory_file).memories) == 3:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(MemorySystem(self.memory_file).memories), 3)
+        memory.close()
+
+    def test_close_flushes_pending_memories(self):
+        """Closing the memory system writes out every buffered record"""
+        with MemorySystem(self.memory_file, write_behind=True,
+                          flush_every=1000, flush_interval=60,
+                          durability='none') as memory:
+            memory.store_emotional_state({'anger': 0.8}, "agitated")
+        self.assertEqual(len(MemorySystem(self.memory_file).memories), 1)
+
+    def test_store_after_close_raises(self):
+        """A closed memory system refuses new memories instead of reopening storage"""
+        for options in ({}, {'write_behind': True}):
+            memory = MemorySystem(self.memory_file, **options)
+            memory.close()
+            with self.assertRaises(ValueError):
+                memory.store_emotional_state({'joy': 0.5}, "stable")
+            with self.assertRaises(ValueError):
+                memory.store_emotional_states([({'joy': 0.5}, "stable", None)])
+        self.assertEqual(MemorySystem(self.memory_file).memories, [])
+
+    def test_columnar_queries_match_list_queries(self):
+        """The columnar store answers queries like the list of dicts"""
+        memory = MemorySystem(self.memory_file)
+        for step in range(30):
+            state = dict.fromkeys(EMOTIONS, 0.0)
+            state.update(joy=step / 30, fear=1 - step / 30)
+            memory.store_emotional_state(
+                state,
+                "withdrawn" if step < 10 else "stable",
+                None if step % 3 else f"event {step}"
+            )
+
+        columnar = MemorySystem(self.memory_file, columnar=True)
+        self.assertEqual(columnar.memories, memory.memories)
+        self.assertEqual(columnar.get_recent_memories(3), memory.get_recent_memories(3))
+        self.assertEqual(columnar.get_emotional_history('joy'),
+                         memory.get_emotional_history('joy'))
+        self.assertEqual(columnar.get_behavior_patterns(), memory.get_behavior_patterns())
+
+        columnar.store_emotional_state(dict(state, joy=1.0), "exuberant")
+        summary = columnar.summarize_memories(until=datetime.max)
+        self.assertEqual(summary['count'], 31)
+        self.assertEqual(summary['max']['joy'], 1.0)
+        self.assertEqual(summary['behaviors']['exuberant'], 1)
+
+    def test_indexes_match_full_scans(self):
+        """Incremental indexes agree with scanning every memory"""
+        indexed = MemorySystem(self.memory_file)
+        for step in range(200):
+            state = dict.fromkeys(EMOTIONS, 0.0)
+            state.update(fear=(step * 37 % 100) / 100, hope=0.5)
+            indexed.store_emotional_state(state, ("withdrawn", "stable")[step % 2])
+
+        reloaded = MemorySystem(self.memory_file)
+        scanned = MemorySystem(self.memory_file, indexed=False)
+        for threshold in (0.0, 0.25, 0.5, 0.99):
+            expected = scanned.get_emotional_history('fear', threshold)
+            self.assertEqual(indexed.get_emotional_history('fear', threshold), expected)
+            self.assertEqual(reloaded.get_emotional_history('fear', threshold), expected)
+            self.assertEqual(indexed.index.count_above('fear', threshold), len(expected))
+        self.assertEqual(indexed.get_emotional_history('hope'), [])
+        self.assertEqual(indexed.get_behavior_patterns(), scanned.get_behavior_patterns())
+
+        indexed.clear_memories()
+        self.assertEqual(indexed.get_behavior_patterns(), {})
+        self.assertEqual(indexed.get_emotional_history('fear', 0.0), [])
+
+    def test_sqlite_backend_pushes_queries_down(self):
+        """The SQLite backend answers queries like the default journal"""
+        database = os.path.join(self.tmpdir.name, "soul_memory.db")
+        journal = MemorySystem(self.memory_file)
+        sqlite = MemorySystem(backend=SQLiteBackend(database), write_behind=True,
+                              flush_every=1000, flush_interval=60)
+        for step in range(40):
+            state = dict.fromkeys(EMOTIONS, 0.0)
+            state.update(fear=(step * 13 % 40) / 40, joy=step / 40)
+            behavior = "withdrawn" if state['fear'] > 0.6 else "stable"
+            journal.store_emotional_state(state, behavior, f"event {step}")
+            sqlite.store_emotional_state(state, behavior, f"event {step}")
+
+        def contents(memories):
+            return [(m['emotional_state'], m['behavior'], m['trigger']) for m in memories]
+
+        self.assertEqual(sqlite.memories, [])
+        self.assertEqual(contents(sqlite.get_recent_memories(4)),
+                         contents(journal.get_recent_memories(4)))
+        self.assertEqual(contents(sqlite.get_emotional_history('fear', 0.6)),
+                         contents(journal.get_emotional_history('fear', 0.6)))
+        self.assertEqual(sqlite.get_behavior_patterns(), journal.get_behavior_patterns())
+
+        middle = datetime.fromisoformat(journal.memories[20]['timestamp'])
+        window = dict(since=middle, until=middle + timedelta(days=1))
+        self.assertEqual(contents(sqlite.query_memories(emotion='fear', above=0.6, **window)),
+                         contents(journal.query_memories(emotion='fear', above=0.6, **window)))
+        expected = journal.summarize_memories(**window)
+        summary = sqlite.summarize_memories(**window)
+        self.assertEqual(summary['count'], expected['count'])
+        self.assertEqual(summary['behaviors'], expected['behaviors'])
+        self.assertAlmostEqual(summary['mean']['joy'], expected['mean']['joy'])
+        sqlite.close()
+
+        reopened = MemorySystem(backend=SQLiteBackend(database))
+        self.assertEqual(len(reopened.query_memories()), 40)
+        reopened.clear_memories()
+        self.assertEqual(reopened.get_behavior_patterns(), {})
+        reopened.close()
+
+    def test_lazy_mode_streams_the_journal(self):
+        """A lazy memory system answers queries without loading the journal"""
+        eager = MemorySystem(self.memory_file)
+        for step in range(3000):
+            state = {'joy': (step % 10) / 10, 'fear': 0.9 if step % 7 == 0 else 0.1}
+            eager.store_emotional_state(state, "withdrawn" if step % 7 == 0 else "stable",
+                                        f"event {step}")
+        eager.close()
+        with open(eager.backend.journal_file, 'a') as f:
+            f.write('{"timestamp": "2024-01-01T00:00:00", "emot')
+
+        lazy = MemorySystem(self.memory_file, lazy=True)
+        self.assertFalse(lazy.resident)
+        self.assertEqual(lazy.memories, [])
+        self.assertEqual(lazy.get_recent_memories(3), eager.memories[-3:])
+        self.assertEqual(lazy.get_behavior_patterns(), eager.get_behavior_patterns())
+        self.assertEqual(lazy.get_emotional_history('fear', 0.5),
+                         eager.get_emotional_history('fear', 0.5))
+
+        lazy.store_emotional_state({'joy': 1.0}, "radiant", "last")
+        self.assertEqual(lazy.get_recent_memories(1)[0]['trigger'], "last")
+        self.assertEqual(len(MemorySystem(self.memory_file).memories), 3001)
+        lazy.close()
+
+    def test_iter_memories_filters(self):
+        """iter_memories streams the same matches from memory and from the backend"""
+        eager = MemorySystem(self.memory_file)
+        for step in range(50):
+            eager.store_emotional_state({'joy': step / 50, 'fear': 0.2},
+                                        "stable" if step % 2 else "withdrawn")
+        lazy = MemorySystem(self.memory_file, lazy=True)
+        since = datetime.fromisoformat(eager.memories[10]['timestamp'])
+
+        for memory in (eager, lazy):
+            streamed = memory.iter_memories(since=since, behavior="stable",
+                                            min_intensity=0.5, emotion='joy')
+            self.assertEqual(next(streamed), eager.memories[25])
+            self.assertEqual([m['emotional_state']['joy'] for m in streamed],
+                             [step / 50 for step in range(27, 50, 2)])
+            self.assertEqual(len(list(memory.iter_memories(min_intensity=0.2))), 50)
+            self.assertEqual(len(list(memory.iter_memories(min_intensity=0.9))), 5)
+        eager.close()
+        lazy.close()
+
+if __name__ == '__main__':
+    unittest.main()
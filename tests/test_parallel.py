@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from soul_cycle_kernel.behavior import BEHAVIORS
+from soul_cycle_kernel.emotion_engine import EmotionEngine
+from soul_cycle_kernel.parallel import ShardedSimulation
+from soul_cycle_kernel.population import SoulPopulation
+
+class TestShardedSimulation(unittest.TestCase):
+    def setUp(self):
+        """Set up a population with random starting states"""
+        rng = np.random.default_rng(11)
+        self.population = SoulPopulation(37)
+        self.population.states = rng.uniform(0.0, 1.0, self.population.states.shape)
+        self.ticks = 12
+
+    def serial_run(self):
+        """Advance a copy of the population one step at a time"""
+        population = SoulPopulation(len(self.population))
+        population.states = self.population.states.copy()
+        states, behaviors = [], []
+        for _ in range(self.ticks):
+            population.decay_emotions()
+            states.append(population.states.copy())
+            behaviors.append(population.get_emergent_behaviors())
+        return np.array(states), np.array(behaviors)
+
+    def test_process_pool_matches_serial_run(self):
+        """Sharded results are identical to advancing the whole population"""
+        expected_states, expected_behaviors = self.serial_run()
+        with ShardedSimulation(workers=2) as runner:
+            result = runner.run(self.population, self.ticks, shards=5, record=True)
+
+        np.testing.assert_array_equal(result['history_states'], expected_states)
+        np.testing.assert_array_equal(result['history_behaviors'], expected_behaviors)
+        np.testing.assert_array_equal(self.population.states, expected_states[-1])
+        np.testing.assert_array_equal(result['behaviors'], expected_behaviors[-1])
+
+        counts = np.bincount(expected_behaviors.ravel(), minlength=len(BEHAVIORS))
+        self.assertEqual(result['patterns'], {
+            BEHAVIORS[code]: int(count) for code, count in enumerate(counts) if count
+        })
+        np.testing.assert_array_equal(result['behavior_counts'].sum(axis=1),
+                                      np.full(len(self.population), self.ticks))
+
+    def test_matches_emotion_engines(self):
+        """Each soul ends where an EmotionEngine stepped alone would"""
+        engines = []
+        for row in range(len(self.population)):
+            engine = EmotionEngine()
+            engine.load_state(self.population.get_emotional_state(row))
+            engines.append(engine)
+
+        result = ShardedSimulation(workers=0).run(self.population, self.ticks, shards=4)
+        for row, engine in enumerate(engines):
+            for _ in range(self.ticks):
+                engine.decay_emotions()
+            self.assertEqual(self.population.get_emotional_state(row),
+                             engine.get_emotional_state())
+            self.assertEqual(BEHAVIORS[result['behaviors'][row]],
+                             engine.get_emergent_behavior())
+        self.assertNotIn('history_states', result)
+
+    def test_empty_population(self):
+        """An empty population runs without any shards doing work"""
+        result = ShardedSimulation(workers=0).run(SoulPopulation(0), 5)
+        self.assertEqual(result['states'].shape, (0, 7))
+        self.assertEqual(result['patterns'], {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from soul_cycle_kernel.emotion_engine import EmotionEngine
+from soul_cycle_kernel.population import SoulPopulation
+
+class TestSoulPopulation(unittest.TestCase):
+    def setUp(self):
+        """Set up a population alongside independent engines"""
+        self.rng = random.Random(7)
+        self.engines = [EmotionEngine() for _ in range(50)]
+        self.population = SoulPopulation(len(self.engines))
+        self.emotions = list(self.engines[0].current_state)
+
+    def assertMatchesEngines(self):
+        behaviors = self.population.get_behavior_names()
+        for row, engine in enumerate(self.engines):
+            self.assertEqual(self.population.get_emotional_state(row),
+                             engine.get_emotional_state())
+            self.assertEqual(behaviors[row], engine.get_emergent_behavior())
+
+    def test_batched_updates_and_decay_match_engines(self):
+        """Batched operations give the same results as separate engines"""
+        for _ in range(40):
+            souls = [self.rng.randrange(len(self.engines)) for _ in range(80)]
+            emotions = [self.rng.choice(self.emotions + ['boredom']) for _ in souls]
+            intensities = [self.rng.uniform(-0.3, 0.9) for _ in souls]
+            for soul, emotion, intensity in zip(souls, emotions, intensities):
+                self.engines[soul].update_emotion(emotion, intensity)
+            self.population.update_emotions(souls, emotions, intensities)
+            self.assertMatchesEngines()
+
+            for engine in self.engines:
+                engine.decay_emotions()
+            self.population.decay_emotions()
+            self.assertMatchesEngines()
+
+    def test_update_emotion_for_selected_souls(self):
+        """A single emotion update only touches the selected souls"""
+        self.population.update_emotion('love', 0.95, souls=[0, 2])
+        self.engines[0].update_emotion('love', 0.95)
+        self.engines[2].update_emotion('love', 0.95)
+        self.assertMatchesEngines()
+        self.assertEqual(self.population.get_behavior_names()[0], "deeply connected")
+        self.assertEqual(self.population.get_behavior_names()[1], "neutral")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from soul_cycle_kernel.registry import SoulRegistry
+
+class TestSoulRegistry(unittest.TestCase):
+    def setUp(self):
+        """Set up a registry over a temporary directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.registry = SoulRegistry(self.tmpdir.name, capacity=2)
+
+    def tearDown(self):
+        self.registry.close()
+        self.tmpdir.cleanup()
+
+    def test_souls_are_isolated(self):
+        """Each soul has its own state and memory file"""
+        alice = self.registry.get('alice')
+        bob = self.registry.get('bob')
+        alice.process_input('joy', 0.5)
+        bob.process_input('fear', 0.7)
+
+        self.assertEqual(alice.get_current_state()['fear'], 0.0)
+        self.assertEqual(len(alice.memory_system.memories), 1)
+        self.assertEqual(len(bob.memory_system.memories), 1)
+        self.assertIsNot(alice.memory_system, bob.memory_system)
+
+    def test_lru_eviction_and_counters(self):
+        """The least recently used soul is evicted once capacity is exceeded"""
+        self.registry.get('a')
+        self.registry.get('b')
+        self.registry.get('a')
+        self.registry.get('c')
+
+        self.assertIn('a', self.registry)
+        self.assertNotIn('b', self.registry)
+        self.assertEqual(len(self.registry), 2)
+        stats = self.registry.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 3, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.25)
+
+    def test_evicted_soul_is_rehydrated(self):
+        """Evicting and reloading a soul restores its state and memories"""
+        soul = self.registry.get('alice')
+        soul.start_simulation()
+        soul.process_input('love', 0.9, 'reunion')
+        soul.simulate_time_step()
+        state = soul.get_current_state()
+
+        self.assertTrue(self.registry.evict('alice'))
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, 'alice.state.json')))
+
+        restored = self.registry.get('alice')
+        self.assertIsNot(restored, soul)
+        self.assertEqual(restored.get_current_state(), state)
+        self.assertEqual(restored.simulation.get_current_tick(), 1)
+        self.assertTrue(restored.simulation.is_running())
+        self.assertEqual(restored.memory_system.memories, soul.memory_system.memories)
+
+    def test_pinned_souls_are_not_evicted(self):
+        """Souls checked out with use stay resident until released"""
+        with self.registry.use('a') as pinned:
+            self.registry.get('b')
+            self.registry.get('c')
+            self.assertIn('a', self.registry)
+            pinned.process_input('hope', 0.4)
+        self.assertLessEqual(len(self.registry), 2)
+
+    def test_pinned_souls_are_not_evicted_or_closed(self):
+        """evict skips pinned souls and close waits for them to be released"""
+        released = threading.Event()
+
+        def hold():
+            with self.registry.use('a') as pinned:
+                self.assertFalse(self.registry.evict('a'))
+                with self.assertRaises(RuntimeError):
+                    self.registry.close(timeout=0.05)
+                released.set()
+                time.sleep(0.1)
+                pinned.process_input('hope', 0.4)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        self.assertTrue(released.wait(5))
+        self.registry.close()
+        holder.join()
+        self.assertNotIn('a', self.registry)
+        self.assertEqual(len(self.registry.get('a').memory_system.memories), 1)
+
+    def test_get_waits_for_concurrent_eviction(self):
+        """A soul requested while it is being evicted is reloaded with its latest state"""
+        persisting = threading.Event()
+        persist = self.registry._persist
+
+        def slow_persist(soul_id, soul):
+            persisting.set()
+            time.sleep(0.1)
+            persist(soul_id, soul)
+
+        self.registry._persist = slow_persist
+        soul = self.registry.get('alice')
+        soul.process_input('anger', 0.8, 'insult')
+        evicting = threading.Thread(target=self.registry.evict, args=('alice',))
+        evicting.start()
+        self.assertTrue(persisting.wait(5))
+        self.assertIsNotNone(self.registry.get_stats())
+        restored = self.registry.get('alice')
+        evicting.join()
+
+        self.assertIsNot(restored, soul)
+        self.assertEqual(restored.get_current_state(), soul.get_current_state())
+        self.assertEqual(len(restored.memory_system.memories), 1)
+
+    def test_invalid_soul_id(self):
+        """Soul ids that are unsafe as file names are rejected"""
+        with self.assertRaises(ValueError):
+            self.registry.get('../escape')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from soul_cycle_kernel.clock import VirtualClock
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.rollups import MemoryRollups, RetentionPolicy
+from soul_cycle_kernel.simulation_engine import SoulAI
+from soul_cycle_kernel.soul_cycle import SoulCycle
+
+START = datetime(2024, 1, 1, 12, 0)
+
+def memory(seconds: int, joy: float, behavior: str = 'stable') -> dict:
+    return {
+        'timestamp': (START + timedelta(seconds=seconds)).isoformat(),
+        'emotional_state': {'joy': joy, 'fear': 0.0},
+        'behavior': behavior,
+        'trigger': 'time_decay'
+    }
+
+class TestRollups(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary memory file and a day of memories, one every 30 seconds"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory_file = os.path.join(self.tmpdir.name, 'soul.json')
+        self.memories = [
+            memory(seconds, (seconds % 600) / 600, 'stable' if seconds % 90 else 'content')
+            for seconds in range(0, 86400, 30)
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_buckets(self):
+        """Buckets hold the count, min/mean/max and behaviors of their memories"""
+        rollups = MemoryRollups(emotions=['joy', 'fear'])
+        rollups.add(self.memories[:240])
+        rows = rollups.get_buckets('hour')
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['key'], START.isoformat())
+        self.assertEqual(rows[0]['count'], 120)
+        self.assertEqual(rows[0]['min']['joy'], 0.0)
+        self.assertAlmostEqual(rows[0]['max']['joy'], 570 / 600)
+        self.assertEqual(rows[0]['behaviors'], {'content': 40, 'stable': 80})
+        self.assertEqual(len(rollups.get_buckets('minute')), 120)
+        self.assertEqual(rollups.get_buckets('cycle')[0]['count'], 240)
+        with self.assertRaises(ValueError):
+            rollups.get_buckets('week')
+
+    def test_summarize_matches_raw(self):
+        """Windowed summaries from the rollups match the raw memories to the minute"""
+        rollups = MemoryRollups(emotions=['joy', 'fear'])
+        rollups.add(self.memories)
+        since, until = START + timedelta(minutes=45), START + timedelta(hours=5, minutes=10)
+        window = [m for m in self.memories
+                  if since <= datetime.fromisoformat(m['timestamp']) < until]
+        summary = rollups.summarize(since, until)
+        self.assertEqual(summary['count'], len(window))
+        self.assertAlmostEqual(summary['mean']['joy'],
+                               sum(m['emotional_state']['joy'] for m in window) / len(window))
+        self.assertEqual(sum(summary['behaviors'].values()), len(window))
+        self.assertEqual(rollups.summarize()['count'], len(self.memories))
+
+    def test_snapshot_and_replay(self):
+        """Memories stored after the last snapshot are replayed on restart"""
+        memory_system = MemorySystem(self.memory_file, rollups=True)
+        memory_system._store(self.memories[:100])
+        memory_system.close()
+        memory_system = MemorySystem(self.memory_file, rollups=True)
+        memory_system.rollups.save = lambda: None
+        memory_system._store(self.memories[100:200])
+        memory_system.close()
+
+        memory_system = MemorySystem(self.memory_file, rollups=True)
+        self.assertEqual(memory_system.summarize_memories()['count'], 200)
+        self.assertEqual(memory_system.get_behavior_patterns(),
+                         {'content': 67, 'stable': 133})
+        memory_system.close()
+
+    def test_retention(self):
+        """Old raw memories are thinned to one per minute while the rollups keep them"""
+        policy = RetentionPolicy(raw_horizon=timedelta(hours=1), every=None,
+                                 rollup_horizons={'minute': timedelta(hours=2)})
+        memory_system = MemorySystem(self.memory_file, rollups=True, retention=policy)
+        memory_system._store(self.memories)
+        stats = memory_system.apply_retention(now=START + timedelta(days=1))
+        self.assertEqual(stats['kept'], 1380 + 120)
+        self.assertEqual(stats['dropped'], len(self.memories) - stats['kept'])
+        self.assertEqual(len(memory_system.memories), stats['kept'])
+        self.assertEqual(len(memory_system.get_rollups('minute')), 120)
+        self.assertEqual(sum(memory_system.get_behavior_patterns().values()),
+                         len(self.memories))
+        memory_system.close()
+
+        memory_system = MemorySystem(self.memory_file, rollups=True)
+        self.assertEqual(len(memory_system.memories), stats['kept'])
+        self.assertEqual(memory_system.summarize_memories()['count'], len(self.memories))
+        memory_system.close()
+
+    def test_automatic_retention_drops(self):
+        """Retention runs every ``every`` records and can drop old memories outright"""
+        policy = RetentionPolicy(raw_horizon=timedelta(hours=1), downsample=None, every=100)
+        memory_system = MemorySystem(self.memory_file, retention=policy)
+        memory_system._store([memory(0, 0.5)] * 100)
+        memory_system.store_emotional_state({'joy': 0.1, 'fear': 0.0}, 'stable')
+        self.assertEqual(len(memory_system.memories), 1)
+        self.assertEqual(memory_system.get_behavior_patterns(since=START), {'stable': 1})
+        memory_system.close()
+
+    def test_soul_cycle_buckets(self):
+        """Each life gets its own cycle bucket, surviving the purge of its memories"""
+        soul = SoulAI(clock=VirtualClock(),
+                      memory_system=MemorySystem(self.memory_file, rollups=True))
+        soul.start_simulation()
+        cycle = SoulCycle(soul, life_ticks=5)
+        cycle.run(12)
+        rows = soul.memory_system.get_rollups('cycle')
+        self.assertEqual([row['key'] for row in rows], [1, 2, 3])
+        self.assertEqual([row['count'] for row in rows], [5, 5, 2])
+        self.assertEqual(len(soul.memory_system.memories), 2)
+        cycle.close()
+        soul.memory_system.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from soul_cycle_kernel.clock import VirtualClock
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.simulation_engine import SoulAI
+
+class TestSoulAI(unittest.TestCase):
+    def setUp(self):
+        """Set up souls backed by temporary memory files"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.events = [
+            ("joy", 0.5, "sunrise"),
+            ("fear", 0.9, None),
+            ("boredom", 0.3, "unknown emotion"),
+            ("joy", 0.6, "reunion"),
+            ("anger", -0.2, None)
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_soul(self, name: str) -> SoulAI:
+        return SoulAI(clock=VirtualClock(),
+                      memory_system=MemorySystem(os.path.join(self.tmpdir.name, name)))
+
+    def test_process_inputs_matches_process_input(self):
+        """A batch gives the same states and memories as single inputs"""
+        single = self.make_soul("single.json")
+        for emotion, intensity, trigger in self.events:
+            single.process_input(emotion, intensity, trigger)
+
+        batched = self.make_soul("batched.json")
+        behaviors = batched.process_inputs(self.events)
+
+        self.assertEqual(batched.get_current_state(), single.get_current_state())
+        self.assertEqual(behaviors, [m['behavior'] for m in single.memory_system.memories])
+        strip = lambda memories: [(m['emotional_state'], m['behavior'], m['trigger'])
+                                  for m in memories]
+        self.assertEqual(strip(batched.memory_system.memories),
+                         strip(single.memory_system.memories))
+
+    def test_process_inputs_accepts_structured_arrays(self):
+        """A NumPy structured array is accepted as a batch"""
+        batch = np.array(
+            [(e, i, t or "") for e, i, t in self.events],
+            dtype=[('emotion', 'U16'), ('intensity', 'f8'), ('trigger', 'U32')]
+        )
+        soul = self.make_soul("array.json")
+        soul.process_inputs(batch)
+        self.assertEqual(len(soul.memory_system.memories), len(self.events))
+        self.assertEqual(soul.memory_system.memories[0]['trigger'], "sunrise")
+        self.assertIsNone(soul.memory_system.memories[1]['trigger'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+
+from soul_cycle_kernel.clock import VirtualClock
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.simulation_engine import SoulAI
+from soul_cycle_kernel.soul_cycle import EchoAggregator, SoulCycle
+
+class TestSoulCycle(unittest.TestCase):
+    def setUp(self):
+        """Set up a running soul backed by a temporary memory file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory_file = os.path.join(self.tmpdir.name, 'soul.json')
+        self.soul = self.make_soul()
+
+    def tearDown(self):
+        self.soul.memory_system.close()
+        self.tmpdir.cleanup()
+
+    def make_soul(self, **options) -> SoulAI:
+        soul = SoulAI(clock=VirtualClock(),
+                      memory_system=MemorySystem(self.memory_file, **options))
+        soul.start_simulation()
+        return soul
+
+    def test_aggregator(self):
+        """Running aggregates match the memories fed to them"""
+        aggregator = EchoAggregator(['joy', 'fear'])
+        aggregator.add([
+            {'timestamp': 't1', 'emotional_state': {'joy': 0.2, 'fear': 0.6}, 'behavior': 'withdrawn'},
+            {'timestamp': 't2', 'emotional_state': {'joy': 0.4, 'fear': 0.0}, 'behavior': 'stable'},
+            {'timestamp': 't3', 'emotional_state': {'joy': 0.6, 'fear': 0.0}, 'behavior': 'stable'}
+        ])
+        summary = aggregator.get_summary()
+        self.assertEqual((summary['memories'], summary['first'], summary['last']), (3, 't1', 't3'))
+        self.assertAlmostEqual(summary['mean']['joy'], 0.4)
+        self.assertEqual(summary['peak'], {'joy': 0.6, 'fear': 0.6})
+        self.assertEqual(list(aggregator.get_behavior_weights()), ['stable', 'withdrawn'])
+
+    def test_life_ends_after_its_ticks(self):
+        """A life ends after life_ticks and the next one inherits the echo"""
+        cycle = SoulCycle(self.soul, life_ticks=5, echo_strength=0.5)
+        self.soul.process_input('joy', 0.8)
+        summaries = cycle.run(12)
+
+        self.assertEqual([s['cycle'] for s in summaries], [1, 2])
+        first = summaries[0]
+        self.assertEqual((first['reason'], first['ticks'], first['memories']), ('age', 5, 6))
+        expected = 0.5 * first['mean']['joy']
+        self.assertAlmostEqual(first['echo']['emotional_state']['joy'], expected)
+        self.assertEqual(cycle.cycle, 3)
+        self.assertEqual(cycle.get_age(), 2)
+        self.assertEqual(len(cycle.get_summaries()), 2)
+
+    def test_rebirth_seeds_engine_and_purges_memories(self):
+        """Absorbed memories are replaced by the summary and the echo seeds the engine"""
+        cycle = SoulCycle(self.soul, life_ticks=100)
+        self.soul.emotion_engine.decay_rates['joy'] = 0.0
+        self.soul.process_input('joy', 0.6)
+        self.soul.process_input('fear', 0.2)
+        summary = cycle.rebirth()
+
+        self.assertEqual(summary['reason'], 'manual')
+        self.assertEqual(summary['memories'], 2)
+        self.assertEqual(self.soul.get_behavior_patterns(), {})
+        self.assertAlmostEqual(self.soul.get_current_state()['joy'], 0.5 * 0.6)
+        self.assertAlmostEqual(self.soul.get_current_state()['fear'], 0.5 * 0.1)
+        self.assertEqual(self.soul.emotion_engine.decay_rates['joy'], 0.0)
+
+    def test_end_condition(self):
+        """A trigger condition ends a life early"""
+        cycle = SoulCycle(self.soul, life_ticks=100,
+                          end_condition=lambda soul: soul.get_current_state()['anger'] > 0.5)
+        self.assertIsNone(cycle.check())
+        self.soul.process_input('anger', 0.9)
+        self.assertEqual(cycle.check()['reason'], 'condition')
+
+    def test_resume_after_restart(self):
+        """A restarted controller continues the cycle count and its current life"""
+        cycle = SoulCycle(self.soul, life_ticks=4)
+        cycle.run(6)
+        cycle.close()
+        self.soul.memory_system.close()
+
+        self.soul = self.make_soul(checkpoint_every=100)
+        self.assertEqual(len(self.soul.memory_system.recover()[1]), 2)
+        resumed = SoulCycle(self.soul, life_ticks=4)
+        self.assertEqual(resumed.cycle, 2)
+        self.assertEqual(resumed.aggregator.count, 2)
+        self.assertIsNotNone(resumed.echo)
+
+    def test_restart_seeds_engine_with_echo(self):
+        """A soul restarted after a rebirth starts from the inherited echo"""
+        cycle = SoulCycle(self.soul, life_ticks=100)
+        self.soul.process_input('love', 0.8)
+        summary = cycle.rebirth()
+        cycle.close()
+        self.soul.memory_system.close()
+
+        self.soul = self.make_soul(lazy=True)
+        resumed = SoulCycle(self.soul, life_ticks=100)
+        self.assertEqual(self.soul.get_current_state(), summary['echo']['emotional_state'])
+        self.assertEqual(self.soul.get_current_behavior(), "stable")
+        self.soul.process_input('joy', 0.5)
+        self.assertEqual(self.soul.memory_system.drop_memories(), 1)
+        self.assertEqual(self.soul.memory_system.drop_memories(), 0)
+        resumed.close()
+
+    def test_restart_skips_kept_memories_of_ended_lives(self):
+        """Without purging, a restart counts only memories after the last summarized life"""
+        cycle = SoulCycle(self.soul, life_ticks=100, purge_absorbed=False)
+        self.soul.process_input('joy', 0.6)
+        self.soul.process_input('fear', 0.2)
+        cycle.rebirth()
+        self.soul.process_input('love', 0.4)
+        cycle.close()
+        self.soul.memory_system.close()
+
+        self.soul = self.make_soul()
+        self.assertEqual(len(self.soul.memory_system.query_memories()), 3)
+        resumed = SoulCycle(self.soul, life_ticks=100, purge_absorbed=False)
+        self.assertEqual(resumed.aggregator.count, 1)
+        self.assertEqual(resumed.aggregator.behavior_counts, {'stable': 1})
+        self.assertEqual(resumed.rebirth()['memories'], 1)
+        resumed.close()
+
+if __name__ == '__main__':
+    unittest.main()
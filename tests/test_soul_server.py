@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from interface.soul_server import SoulServer
+
+class TestSoulServer(unittest.TestCase):
+    def setUp(self):
+        """Set up a data directory for the server's souls"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmpdir.name, 'souls')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_server(self, client, **kwargs):
+        """Run a client coroutine against a server on a free port"""
+        async def scenario():
+            server = SoulServer(port=0, data_dir=self.data_dir, **kwargs)
+            await server.start()
+            try:
+                return await client(server)
+            finally:
+                await server.stop()
+        return asyncio.run(scenario())
+
+    @staticmethod
+    async def request(reader, writer, **request):
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    def test_feel_and_state(self):
+        """Requests update and report the bound soul"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            bound = await self.request(reader, writer, id=1, op='bind', soul='alice')
+            felt = await self.request(reader, writer, id=2, op='feel',
+                                      emotion='joy', intensity=0.9, trigger='sunrise')
+            state = await self.request(reader, writer, id=3, op='state')
+            history = await self.request(reader, writer, id=4, op='history', emotion='joy')
+            writer.close()
+            await writer.wait_closed()
+            return bound, felt, state, history
+
+        bound, felt, state, history = self.run_server(client)
+        self.assertEqual(bound, {'ok': True, 'result': {'soul': 'alice'}, 'id': 1})
+        self.assertEqual(felt['id'], 2)
+        self.assertEqual(felt['result']['emotion'], 'joy')
+        self.assertAlmostEqual(state['result']['state']['joy'], 0.9)
+        self.assertEqual(history['result']['history'][0]['trigger'], 'sunrise')
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, 'alice.jsonl')))
+
+    def test_errors_are_reported(self):
+        """Bad requests get an error response and the connection survives"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            responses = [
+                await self.request(reader, writer, id=1, op='bind', soul='../escape'),
+                await self.request(reader, writer, id=2, op='dance'),
+                await self.request(reader, writer, id=3, op='feel', emotion='joy'),
+                await self.request(reader, writer, id=4, op='metrics')
+            ]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+
+        bind, unknown, missing, metrics = self.run_server(client)
+        self.assertFalse(bind['ok'])
+        self.assertFalse(unknown['ok'])
+        self.assertFalse(missing['ok'])
+        self.assertTrue(metrics['ok'])
+        self.assertEqual(metrics['result']['latency']['count'], 3)
+
+    def test_request_limits(self):
+        """Oversized or failing requests are answered and the connection survives"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(b'{"id": 1, "op": "simulate", "steps": 1e400}\n')
+            await writer.drain()
+            responses = [
+                json.loads(await reader.readline()),
+                await self.request(reader, writer, id=2, op='simulate', steps=101),
+                await self.request(reader, writer, id=3, op='feel', emotion='joy',
+                                   intensity=0.9),
+                await self.request(reader, writer, id=4, op='history', emotion='joy',
+                                   limit=0),
+                await self.request(reader, writer, id=5, op='history', emotion='joy',
+                                   limit=5),
+                await self.request(reader, writer, id=6, op='simulate', steps=100)
+            ]
+            locks = len(server.soul_locks)
+            server.registry.get = lambda soul_id: 1 / 0
+            responses.append(await self.request(reader, writer, id=7, op='state'))
+            responses.append(await self.request(reader, writer, id=8, op='metrics'))
+            writer.close()
+            await writer.wait_closed()
+            return responses, locks
+
+        responses, locks = self.run_server(client, max_steps=100)
+        huge, too_many, felt, empty, recent, simulated, failed, metrics = responses
+        self.assertFalse(huge['ok'])
+        self.assertFalse(too_many['ok'])
+        self.assertTrue(felt['ok'])
+        self.assertEqual(empty['result']['history'], [])
+        self.assertEqual(len(recent['result']['history']), 1)
+        self.assertEqual(simulated['result']['tick'], 100)
+        self.assertEqual(failed, {'ok': False, 'error': 'internal error: ZeroDivisionError',
+                                  'id': 7})
+        self.assertTrue(metrics['result']['soul'].startswith('anon-'))
+        self.assertEqual(locks, 0)
+
+    def test_anonymous_souls_are_fresh(self):
+        """Anonymous connections never inherit a soul persisted by an earlier server"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            await self.request(reader, writer, op='feel', emotion='fear', intensity=0.9)
+            state = await self.request(reader, writer, op='state')
+            writer.close()
+            await writer.wait_closed()
+            return state['result']['state']
+
+        self.assertAlmostEqual(self.run_server(client)['fear'], 0.9)
+        self.assertAlmostEqual(self.run_server(client)['fear'], 0.9)
+
+    def test_concurrent_clients(self):
+        """Many clients are served concurrently, each with its own soul"""
+        async def one_client(server, number):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            await self.request(reader, writer, op='bind', soul=f'soul-{number}')
+            # Pipeline several requests before reading any response
+            for _ in range(5):
+                writer.write(json.dumps({'op': 'feel', 'text': 'i am so happy'}).encode() + b'\n')
+            await writer.drain()
+            for _ in range(5):
+                json.loads(await reader.readline())
+            state = await self.request(reader, writer, op='state')
+            writer.close()
+            await writer.wait_closed()
+            return state
+
+        async def client(server):
+            states = await asyncio.gather(*(one_client(server, n) for n in range(20)))
+            return states, server.get_metrics()
+
+        states, metrics = self.run_server(client, max_pending=2, max_inflight=4,
+                                          capacity=8)
+        self.assertEqual(len(states), 20)
+        for state in states:
+            self.assertTrue(state['ok'])
+            self.assertGreater(state['result']['state']['joy'], 0.0)
+        self.assertGreaterEqual(metrics['registry']['misses'], 20)
+        self.assertLessEqual(metrics['registry']['resident'], 8)
+        self.assertEqual(metrics['requests'], 20 * 7)
+
+    def test_connection_limit(self):
+        """Connections beyond the limit are refused with an error"""
+        async def client(server):
+            first = await asyncio.open_connection('127.0.0.1', server.port)
+            await self.request(*first, op='metrics')
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            refused = json.loads(await reader.readline())
+            for stream in (first[1], writer):
+                stream.close()
+            return refused
+
+        refused = self.run_server(client, max_connections=1)
+        self.assertEqual(refused, {'ok': False, 'error': 'server busy'})
+
+if __name__ == '__main__':
+    unittest.main()
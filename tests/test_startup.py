@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestStartup(unittest.TestCase):
+    def run_python(self, code: str) -> str:
+        """Run code in a fresh interpreter inside a temporary directory"""
+        with tempfile.TemporaryDirectory() as cwd:
+            return subprocess.run([sys.executable, '-c', code], cwd=cwd,
+                                  env=dict(os.environ, PYTHONPATH=ROOT),
+                                  capture_output=True, text=True, check=True).stdout
+
+    def test_soul_path_avoids_heavy_imports(self):
+        """Feeding a soul never loads NumPy, and rich waits for the first output"""
+        output = self.run_python(
+            "import sys\n"
+            "from soul_cycle_kernel import SoulAI\n"
+            "from interface.cli_interface import CLIInterface\n"
+            "cli = CLIInterface()\n"
+            "cli.soul.process_input('joy', 0.5)\n"
+            "print('numpy' in sys.modules, 'rich' in sys.modules)\n"
+            "cli.onecmd('feel joy 0.5')\n"
+            "print('numpy' in sys.modules, 'rich' in sys.modules)\n"
+        )
+        self.assertEqual(output.split()[:2], ['False', 'False'])
+        self.assertEqual(output.split()[-2:], ['False', 'True'])
+
+    def test_soul_is_created_on_first_use(self):
+        """Constructing the CLI neither creates a soul nor touches its memory file"""
+        output = self.run_python(
+            "import os\n"
+            "from interface.cli_interface import CLIInterface\n"
+            "cli = CLIInterface()\n"
+            "print(cli._soul is None, os.path.exists('soul_memory.jsonl'))\n"
+        )
+        self.assertEqual(output.split(), ['True', 'False'])
+
+    def test_lazy_exports(self):
+        """Every public name resolves through the lazy package attributes"""
+        import soul_cycle_kernel
+
+        for name in soul_cycle_kernel.__all__:
+            self.assertTrue(hasattr(soul_cycle_kernel, name), name)
+        with self.assertRaises(AttributeError):
+            soul_cycle_kernel.NotAComponent
+
+if __name__ == '__main__':
+    unittest.main()
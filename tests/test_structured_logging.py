@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from soul_cycle_kernel.clock import VirtualClock
+from soul_cycle_kernel.memory_system import MemorySystem
+from soul_cycle_kernel.simulation_engine import SoulAI
+from soul_cycle_kernel.structured_logging import (JSONLinesFormatter, disable_logging,
+                                                  enable_logging)
+
+class TestStructuredLogging(unittest.TestCase):
+    def setUp(self):
+        """Set up a soul backed by a temporary memory file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmpdir.name, 'log.jsonl')
+        self.soul = SoulAI(clock=VirtualClock(),
+                           memory_system=MemorySystem(os.path.join(self.tmpdir.name, 'soul.json')))
+
+    def tearDown(self):
+        disable_logging()
+        self.tmpdir.cleanup()
+
+    def test_import_has_no_side_effects(self):
+        """Importing the kernel neither configures logging nor creates log files"""
+        code = ("import logging, soul_cycle_kernel, os; "
+                "print(len(logging.getLogger().handlers), os.path.exists('log.txt'))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', code], cwd=self.tmpdir.name,
+                                env=dict(os.environ, PYTHONPATH=root),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ['0', 'False'])
+
+    def test_enabled_pipeline_writes_json_lines(self):
+        """Opting in writes one JSON event per kernel log call"""
+        enable_logging(self.log_file)
+        self.soul.start_simulation()
+        self.soul.process_input('joy', 0.5, 'sunrise')
+        self.soul.simulate_time_step()
+        disable_logging()
+
+        with open(self.log_file) as f:
+            events = [json.loads(line) for line in f]
+        messages = [event['message'] for event in events]
+        self.assertIn("Processed emotion: joy (intensity: 0.50) - Behavior: stable", messages)
+        self.assertIn("Time step 1 - Behavior: stable", messages)
+        self.assertTrue(all(event['logger'] == 'soul_cycle_kernel.simulation_engine'
+                            for event in events))
+        self.assertIn("Time step %d - Behavior: %s", [event['event'] for event in events])
+
+    def test_exit_flushes_queued_records(self):
+        """Records still queued at interpreter exit are written without disable_logging"""
+        code = ("import logging; "
+                "from soul_cycle_kernel.structured_logging import enable_logging; "
+                f"enable_logging({self.log_file!r}); "
+                "log = logging.getLogger('soul_cycle_kernel.test'); "
+                "[log.info('event %d', step) for step in range(1000)]")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, '-c', code], cwd=self.tmpdir.name,
+                       env=dict(os.environ, PYTHONPATH=root), check=True)
+
+        with open(self.log_file) as f:
+            self.assertEqual(len(f.readlines()), 1000)
+
+    def test_disable_restores_logging(self):
+        """Disabling puts back the kernel logger level, handlers and logging flags"""
+        logger = logging.getLogger('soul_cycle_kernel')
+        own = logging.NullHandler()
+        logger.addHandler(own)
+        handlers = list(logger.handlers)
+        logger.setLevel(logging.WARNING)
+        flags = (logging._srcfile, logging.logThreads, logging.logProcesses,
+                 logging.logMultiprocessing)
+        try:
+            enable_logging(self.log_file, level=logging.DEBUG)
+            self.assertEqual(logging.logThreads, flags[1])
+            enable_logging(self.log_file, lean_records=True)
+            self.assertIsNone(logging._srcfile)
+            self.assertFalse(logging.logThreads)
+            disable_logging()
+            self.assertEqual(logger.level, logging.WARNING)
+            self.assertEqual(logger.handlers, handlers)
+            self.assertEqual((logging._srcfile, logging.logThreads, logging.logProcesses,
+                              logging.logMultiprocessing), flags)
+        finally:
+            logger.removeHandler(own)
+            logger.setLevel(logging.NOTSET)
+
+    def test_formatting_is_deferred(self):
+        """Arguments are not formatted when logging is off"""
+        class Exploding:
+            def __str__(self):
+                raise AssertionError("formatted while logging is disabled")
+
+        self.soul.process_input('joy', 0.5, 'sunrise')
+        logging.getLogger('soul_cycle_kernel.simulation_engine').info(
+            "%s", Exploding())
+
+    def test_formatter_merges_fields(self):
+        """Extra fields are merged into the JSON event"""
+        record = logging.LogRecord('soul_cycle_kernel', logging.INFO, __file__, 1,
+                                   "tick %d", (3,), None)
+        record.fields = {'soul': 'alice'}
+        event = json.loads(JSONLinesFormatter().format(record))
+        self.assertEqual(event['message'], "tick 3")
+        self.assertEqual(event['soul'], 'alice')
+        self.assertEqual(event['level'], 'INFO')
+
+if __name__ == '__main__':
+    unittest.main()